@@ -0,0 +1,57 @@
+"""
+Microbenchmark of the `TRELLO_DECODE_MODE` decode modes.
+
+Decodes a JSON array of cards, as returned by `/lists/{id}/cards`, into
+`TrelloCard` models with each mode. Every mode includes parsing the raw bytes
+with the standard `json.loads`, as `response.json()` does. `adapter-fastjson`
+parses them with `fastjson` (orjson when installed) instead, and `raw`
+validates the raw bytes directly, as `GET(..., raw=True)` callers do.
+
+Usage:
+    python -m benchmarks.bench_decode [--cards 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.bench_render import make_cards
+from server.models import TrelloCard
+from server.utils import fastjson
+from server.utils.decode import DECODE_MODES, decode_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    raw = json.dumps([card.model_dump() for card in make_cards(args.cards)]).encode()
+    modes = {
+        mode: (lambda mode=mode: decode_list(TrelloCard, json.loads(raw), mode))
+        for mode in DECODE_MODES
+    }
+    modes["adapter-fastjson"] = lambda: decode_list(
+        TrelloCard, fastjson.loads(raw), "adapter"
+    )
+    modes["raw"] = lambda: decode_list(TrelloCard, raw, "adapter")
+
+    print(
+        f"{args.cards} cards ({len(raw)} bytes), {args.repeat} repetitions, "
+        f"fastjson backend: {fastjson.backend()}"
+    )
+    print(f"{'mode':<18}{'ms':>10}{'vs validate':>14}")
+    baseline = None
+    for name, fn in modes.items():
+        fn()
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        seconds = (time.perf_counter() - started) / args.repeat
+        baseline = baseline or seconds
+        print(f"{name:<18}{seconds * 1000:>10.2f}{seconds / baseline:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of the tool output formats.
+
+Measures the size of the rendered output and the time to produce it for a
+list of cards, for FastMCP's default serialization ("json") and for each
+`TRELLO_OUTPUT_FORMAT` renderer.
+
+Usage:
+    python -m benchmarks.bench_render [--cards 1000] [--repeat 20]
+"""
+
+import argparse
+import random
+import time
+
+from mcp.server.fastmcp.server import _convert_to_content
+
+from server.models import TrelloCard, TrelloLabel
+from server.utils.render import render
+
+WORDS = (
+    "alpha beta gamma delta login bug signup payment invoice deploy api error".split()
+)
+
+
+def make_cards(count: int) -> list[TrelloCard]:
+    random.seed(0)
+    labels = [
+        TrelloLabel(id=f"label{i:020d}", name=name, color=color)
+        for i, (name, color) in enumerate([("bug", "red"), ("feature", "green")])
+    ]
+    return [
+        TrelloCard(
+            id=f"{i:024x}",
+            name=" ".join(random.choices(WORDS, k=5)),
+            desc=" ".join(random.choices(WORDS, k=20)) if i % 3 == 0 else None,
+            idList=f"{i % 5:024x}",
+            idBoard="b" * 24,
+            url=f"https://trello.com/c/{i:08x}",
+            pos=float(i * 16384),
+            labels=labels[: i % 3],
+        )
+        for i in range(count)
+    ]
+
+
+def fastmcp_json(result) -> str:
+    """Serializes a result the way FastMCP does for unrendered tool results."""
+    return "".join(content.text for content in _convert_to_content(result))
+
+
+def measure(fn, repeat: int) -> tuple[int, float]:
+    size = len(fn().encode())
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return size, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cards = make_cards(args.cards)
+    formats = {
+        "json": lambda: fastmcp_json(cards),
+        "minimal": lambda: render(cards, "minimal"),
+        "compact": lambda: render(cards, "compact"),
+    }
+    print(f"{args.cards} cards, {args.repeat} repetitions")
+    print(f"{'format':<10}{'bytes':>12}{'vs json':>10}{'ms':>10}")
+    baseline = None
+    for name, fn in formats.items():
+        size, seconds = measure(fn, args.repeat)
+        baseline = baseline or size
+        print(f"{name:<10}{size:>12}{size / baseline:>10.2f}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark of the cold start of the server in Claude app mode.
+
+Claude app mode spawns a server process over stdio for every session, so
+its startup time is paid before the first tool call. The benchmark measures,
+each in fresh processes:
+
+- the cumulative time of `import main` reported by `python -X importtime`,
+  with the slowest modules imported,
+- the time from spawning `main.py` over stdio to its response to the MCP
+  `initialize` request.
+
+It fails if the median import time exceeds the budget, if importing `main`
+loads modules only the HTTP transports need, or if it builds the Trello
+client before the first tool call.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 800] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median cumulative import time of `main` allowed, in milliseconds.
+IMPORT_BUDGET_MS = 800.0
+
+# Modules of this server only the HTTP transports use. (uvicorn and starlette
+# are imported by the MCP SDK itself.)
+HTTP_ONLY_MODULES = ("server.mirror.webhooks", "server.utils.sse_relay")
+
+# Prints which HTTP-only modules were imported and whether the client was built.
+_CHECK = (
+    "import json, sys, main, server.trello; "
+    "print(json.dumps({'modules': [m for m in %r if m in sys.modules], "
+    "'built': server.trello._state is not None}))"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Dummy credentials: nothing here talks to Trello.
+    env.setdefault("TRELLO_API_KEY", "bench")
+    env.setdefault("TRELLO_TOKEN", "bench")
+    env["PYTHONPATH"] = ROOT
+    env["MCP_TRANSPORT"] = "stdio"
+    return env
+
+
+def measure_import() -> Tuple[float, List[Tuple[float, str]]]:
+    """Imports `main` in a fresh process under `-X importtime`.
+
+    Returns:
+        Tuple[float, List[Tuple[float, str]]]: The cumulative import time of
+        `main` in milliseconds, and the self time in milliseconds of every
+        imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((int(self_us) / 1000, name.strip()))
+        if name.strip() == "main":
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+
+def check_lazy() -> Dict[str, object]:
+    """Returns the HTTP-only modules `import main` loads and whether it built the client."""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHECK % (HTTP_ONLY_MODULES,)],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure_initialize() -> float:
+    """Returns the milliseconds from spawning the stdio server to its `initialize` response."""
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "bench_startup", "version": "0"},
+        },
+    }
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=ROOT,
+        env=_env(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        process.stdin.write(json.dumps(request) + "\n")
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = (time.perf_counter() - started) * 1000
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        return elapsed
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules shown")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    totals = [total for total, _ in imports]
+    initializes = [measure_initialize() for _ in range(args.runs)]
+    lazy = check_lazy()
+
+    median = statistics.median(totals)
+    print(
+        f"import main: median {median:.1f} ms, "
+        f"min {min(totals):.1f} ms, max {max(totals):.1f} ms "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    print(
+        f"stdio initialize: median {statistics.median(initializes):.1f} ms, "
+        f"min {min(initializes):.1f} ms, max {max(initializes):.1f} ms"
+    )
+    print("slowest modules (self time, last run):")
+    for self_ms, name in sorted(imports[-1][1], reverse=True)[: args.top]:
+        print(f"  {self_ms:8.1f} ms  {name}")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"import time {median:.1f} ms exceeds {args.budget_ms:.0f} ms")
+    if lazy["modules"]:
+        failures.append(f"imported HTTP-only modules: {', '.join(lazy['modules'])}")
+    if lazy["built"]:
+        failures.append("built the Trello client at import")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Benchmark of every registered tool against a fake Trello API.
+
+Registers the tools of `server/tools/tools.register_tools` on a FastMCP
+server whose Trello client talks to an in-process `FakeTrello`, then for each
+tool measures:
+
+- the Trello requests made by one call with a cold response cache,
+- the throughput and p50/p99 latency of many calls issued concurrently,
+- the average number of Trello requests per call under that load.
+
+The synthetic data and arguments are seeded, so request counts repeat for the
+same options. They can be saved with `--save` and checked against later runs
+with the same options with `--baseline`, which fails if any tool makes more
+requests than before.
+
+With `--breakdown`, calls are traced in memory and the average time per call
+is split into Trello requests (including retries), decoding into models,
+rendering, and the rest.
+
+Usage:
+    python -m benchmarks.bench_tools [--cards 50] [--latency-ms 20] [--calls 50]
+        [--concurrency 10] [--tools get_card,get_cards] [--save FILE] [--baseline FILE]
+        [--breakdown]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# The benchmark talks to a fake API: use dummy credentials, and keep the real
+# rate limits and a configured mirror out of the measurements unless set explicitly.
+os.environ.setdefault("TRELLO_API_KEY", "bench")
+os.environ.setdefault("TRELLO_TOKEN", "bench")
+os.environ.setdefault("TRELLO_RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("TRELLO_MIRROR_BOARDS", "")
+
+from mcp.server.fastmcp import FastMCP
+
+from benchmarks.fake_trello import FakeTrello
+from server.tools.tools import register_tools
+from server.trello import client, search_index
+from server.utils import tracing
+
+Scenario = Callable[[FakeTrello, random.Random], Dict[str, Any]]
+
+
+def _board(fake: FakeTrello, rng: random.Random) -> str:
+    return next(iter(fake.boards))
+
+
+def _list(fake: FakeTrello, rng: random.Random) -> str:
+    return rng.choice(
+        [item["id"] for item in fake.lists.values() if not item["closed"]]
+    )
+
+
+def _cards(fake: FakeTrello, rng: random.Random, count: int) -> List[str]:
+    return rng.sample(list(fake.cards), count)
+
+
+def _checklist(fake: FakeTrello, rng: random.Random) -> str:
+    return rng.choice(
+        [key for key, value in fake.checklists.items() if value["checkItems"]]
+    )
+
+
+def _checkitems(fake: FakeTrello, rng: random.Random, count: int) -> List[dict]:
+    items = [
+        item
+        for checklist in fake.checklists.values()
+        for item in checklist["checkItems"]
+    ]
+    return [
+        {
+            "checklist_id": item["idChecklist"],
+            "checkitem_id": item["id"],
+            "checked": True,
+        }
+        for item in rng.sample(items, count)
+    ]
+
+
+def _new_checkitem(fake: FakeTrello, rng: random.Random) -> Dict[str, Any]:
+    checklist_id = _checklist(fake, rng)
+    item = fake.add_checkitem(checklist_id)
+    return {"checklist_id": checklist_id, "checkitem_id": item["id"]}
+
+
+# Arguments for one call of each tool. Destructive tools get an entity created
+# directly in the fake for every call, which does not count as a request.
+SCENARIOS: Dict[str, Scenario] = {
+    "get_board": lambda fake, rng: {"board_id": _board(fake, rng)},
+    "get_boards": lambda fake, rng: {},
+    "get_board_labels": lambda fake, rng: {"board_id": _board(fake, rng)},
+    "get_board_snapshot": lambda fake, rng: {"board_id": _board(fake, rng)},
+    "get_list": lambda fake, rng: {"list_id": _list(fake, rng)},
+    "get_lists": lambda fake, rng: {"board_id": _board(fake, rng)},
+    "create_list": lambda fake, rng: {"board_id": _board(fake, rng), "name": "Bench"},
+    "update_list": lambda fake, rng: {"list_id": _list(fake, rng), "name": "Renamed"},
+    "delete_list": lambda fake, rng: {
+        "list_id": fake.add_list(_board(fake, rng))["id"]
+    },
+    "get_card": lambda fake, rng: {"card_id": _cards(fake, rng, 1)[0]},
+    "get_cards": lambda fake, rng: {"list_id": _list(fake, rng)},
+    "get_board_cards": lambda fake, rng: {"board_id": _board(fake, rng)},
+    "get_cards_by_ids": lambda fake, rng: {"card_ids": _cards(fake, rng, 10)},
+    "create_card": lambda fake, rng: {
+        "payload": {"name": "Bench card", "idList": _list(fake, rng)}
+    },
+    "update_card": lambda fake, rng: {
+        "card_id": _cards(fake, rng, 1)[0],
+        "payload": {"name": "Renamed card"},
+    },
+    "delete_card": lambda fake, rng: {"card_id": fake.add_card(_list(fake, rng))["id"]},
+    "create_cards": lambda fake, rng: {
+        "payloads": [
+            {"name": f"Bench card {i}", "idList": _list(fake, rng)} for i in range(5)
+        ]
+    },
+    "update_cards": lambda fake, rng: {
+        "updates": [
+            {"card_id": card_id, "payload": {"desc": "Updated"}}
+            for card_id in _cards(fake, rng, 5)
+        ]
+    },
+    "move_cards": lambda fake, rng: {
+        "card_ids": _cards(fake, rng, 5),
+        "list_id": _list(fake, rng),
+    },
+    "search_cards": lambda fake, rng: {
+        "board_id": _board(fake, rng),
+        "query": rng.choice(["login bug", "payment", "deploy api", "rev"]),
+    },
+    "get_checklist": lambda fake, rng: {"checklist_id": _checklist(fake, rng)},
+    "get_card_checklists": lambda fake, rng: {"card_id": _cards(fake, rng, 1)[0]},
+    "create_checklist": lambda fake, rng: {
+        "card_id": _cards(fake, rng, 1)[0],
+        "name": "Bench",
+    },
+    "update_checklist": lambda fake, rng: {
+        "checklist_id": _checklist(fake, rng),
+        "name": "Renamed",
+    },
+    "delete_checklist": lambda fake, rng: {
+        "checklist_id": fake.add_checklist(_cards(fake, rng, 1)[0])["id"]
+    },
+    "add_checkitem": lambda fake, rng: {
+        "checklist_id": _checklist(fake, rng),
+        "name": "Bench item",
+    },
+    "update_checkitem": lambda fake, rng: {**_checkitems(fake, rng, 1)[0]},
+    "update_checkitems": lambda fake, rng: {"items": _checkitems(fake, rng, 5)},
+    "delete_checkitem": _new_checkitem,
+    "get_cache_stats": lambda fake, rng: {},
+    "clear_cache": lambda fake, rng: {},
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def reset_caches():
+    """Empties the response cache and search index, as for a fresh server."""
+    if client.cache:
+        client.cache.clear()
+    search_index.clear()
+
+
+async def call(mcp: FastMCP, name: str, arguments: Dict[str, Any]) -> bool:
+    """Calls a tool, returning whether it succeeded."""
+    try:
+        await mcp.call_tool(name, arguments)
+        return True
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"{name} failed: {e}")
+        return False
+
+
+async def bench_tool(
+    mcp: FastMCP,
+    fake: FakeTrello,
+    name: str,
+    calls: int,
+    concurrency: int,
+    rng: random.Random,
+) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+
+    reset_caches()
+    before = fake.total_requests
+    ok = await call(mcp, name, scenario(fake, rng))
+    cold_requests = fake.total_requests - before
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0 if ok else 1
+
+    async def timed(arguments: Dict[str, Any]):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            if not await call(mcp, name, arguments):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    arguments = [scenario(fake, rng) for _ in range(calls)]
+    before = fake.total_requests
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(args) for args in arguments))
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "errors": errors,
+        "cold_requests": cold_requests,
+        "requests_per_call": round((fake.total_requests - before) / calls, 2),
+        "calls_per_second": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> List[str]:
+    """Returns the tools that make more Trello requests than in the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ("cold_requests", "requests_per_call"):
+            if result[key] > baseline[name][key]:
+                regressions.append(
+                    f"{name}: {key} {baseline[name][key]} -> {result[key]}"
+                )
+    return regressions
+
+
+def _covered(intervals: List[tuple]) -> float:
+    """Returns the time covered by possibly overlapping (start, end) intervals."""
+    covered, reached = 0.0, float("-inf")
+    for start, end in sorted(intervals):
+        if end > reached:
+            covered += end - max(start, reached)
+            reached = end
+    return covered
+
+
+def breakdown(tracer: tracing.MemoryTracer, name: str) -> Dict[str, float]:
+    """Splits the traced calls of a tool into where their time went, in ms per call.
+
+    Concurrent spans of one call, e.g. the requests of a bulk tool, count once.
+    "other" is the rest of the call, including waiting for requests shared with
+    other calls through coalescing or batching.
+    """
+    calls = {
+        span.trace_id: span for span in tracer.spans if span.name == f"tool {name}"
+    }
+    intervals: Dict[tuple, List[tuple]] = {}
+    for span in tracer.spans:
+        if span.trace_id not in calls:
+            continue
+        if "url.template" in span.attributes:
+            part = "trello"
+        elif span.name.startswith("decode"):
+            part = "decode"
+        elif span.name == "render":
+            part = "render"
+        else:
+            continue
+        intervals.setdefault((span.trace_id, part), []).append((span.start, span.end))
+    parts = {"trello": 0.0, "decode": 0.0, "render": 0.0}
+    per_call: Dict[int, List[tuple]] = {}
+    for (trace_id, part), spans in intervals.items():
+        parts[part] += _covered(spans)
+        per_call.setdefault(trace_id, []).extend(spans)
+    busy = sum(_covered(spans) for spans in per_call.values())
+    total = sum(span.duration for span in calls.values())
+    parts["other"] = total - busy
+    parts["total"] = total
+    return {key: round(value * 1000 / len(calls), 2) for key, value in parts.items()}
+
+
+async def run(args) -> Dict[str, dict]:
+    fake = FakeTrello(
+        boards=args.boards,
+        lists=args.lists,
+        cards=args.cards,
+        checklists=args.checklists,
+        latency=args.latency_ms / 1000,
+    )
+    await client.close()
+    client.transport = fake.transport
+    client.client = client._build_client()
+
+    mcp = FastMCP("bench")
+    register_tools(mcp)
+    names = [tool.name for tool in mcp._tool_manager.list_tools()]
+    if args.tools:
+        names = [name for name in names if name in args.tools.split(",")]
+
+    tracer = None
+    if args.breakdown:
+        tracer = tracing.MemoryTracer(max_spans=1_000_000)
+        tracing.set_tracer(tracer)
+
+    rng = random.Random(args.seed)
+    print(
+        f"{args.boards} board(s) x {args.lists} lists x {args.cards} cards, "
+        f"{args.latency_ms:g} ms latency, {args.calls} calls per tool, "
+        f"concurrency {args.concurrency}"
+    )
+    print(
+        f"{'tool':<22}{'cold req':>9}{'req/call':>9}{'calls/s':>9}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}"
+    )
+    results = {}
+    for name in names:
+        if name not in SCENARIOS:
+            print(f"{name:<22}  no scenario, skipped")
+            continue
+        if tracer:
+            tracer.clear()
+        result = await bench_tool(mcp, fake, name, args.calls, args.concurrency, rng)
+        if tracer:
+            result["breakdown_ms"] = breakdown(tracer, name)
+        results[name] = result
+        print(
+            f"{name:<22}{result['cold_requests']:>9}{result['requests_per_call']:>9}"
+            f"{result['calls_per_second']:>9}{result['p50_ms']:>9}"
+            f"{result['p99_ms']:>9}{result['errors']:>8}"
+        )
+    await client.close()
+
+    if tracer:
+        print(
+            f"\n{'time per call (ms)':<22}{'total':>9}{'trello':>9}{'decode':>9}"
+            f"{'render':>9}{'other':>9}"
+        )
+        for name, result in results.items():
+            parts = result["breakdown_ms"]
+            print(
+                f"{name:<22}{parts['total']:>9}{parts['trello']:>9}"
+                f"{parts['decode']:>9}{parts['render']:>9}{parts['other']:>9}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--boards", type=int, default=1)
+    parser.add_argument("--lists", type=int, default=5, help="lists per board")
+    parser.add_argument("--cards", type=int, default=50, help="cards per list")
+    parser.add_argument("--checklists", type=int, default=1, help="checklists per card")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--calls", type=int, default=50, help="calls per tool")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tools", help="comma-separated tools to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="fail if requests exceed these results")
+    parser.add_argument(
+        "--breakdown", action="store_true", help="split call time using traces"
+    )
+    args = parser.parse_args()
+
+    # Keep the per-call info logs of the tools out of the measurements.
+    logging.getLogger().setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            print("Request count regressions:", *regressions, sep="\n  ")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
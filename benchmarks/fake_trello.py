@@ -0,0 +1,438 @@
+"""
+In-process fake of the Trello REST API for benchmarks.
+
+Serves every endpoint used by the services from synthetic boards held in
+memory, through an `httpx.MockTransport`, with an optional simulated network
+latency. Every request is counted per route so benchmarks can report how many
+round trips an operation costs. GET responses carry an `ETag` and conditional
+GETs for unchanged resources are answered with 304, like a revalidating API.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import random
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+from server.utils.fastjson import dumps, loads
+
+WORDS = (
+    "alpha beta gamma delta login bug signup payment invoice deploy api error "
+    "release review design backend frontend mobile report export import sync"
+).split()
+
+LABEL_COLORS = ("green", "yellow", "orange", "red", "purple", "blue")
+
+
+def _pick(item: Dict[str, Any], fields: str | None) -> Dict[str, Any]:
+    """Restricts an entity to the requested comma-separated fields, plus its ID."""
+    if not fields or fields == "all":
+        return dict(item)
+    return {key: item[key] for key in ["id", *fields.split(",")] if key in item}
+
+
+class FakeTrello:
+    """
+    A fake Trello API seeded with synthetic boards.
+
+    Attributes:
+        boards (Dict[str, dict]): Boards by ID.
+        lists (Dict[str, dict]): Lists by ID.
+        cards (Dict[str, dict]): Cards by ID.
+        checklists (Dict[str, dict]): Checklists by ID, with their check items.
+        labels (Dict[str, List[dict]]): Labels by board ID.
+        latency (float): Seconds each request is delayed by, simulating the network.
+        requests (Counter): Requests served, by method and route template.
+        not_modified (int): Conditional GETs answered with 304.
+    """
+
+    def __init__(
+        self,
+        boards: int = 1,
+        lists: int = 5,
+        cards: int = 50,
+        checklists: int = 1,
+        checkitems: int = 3,
+        latency: float = 0.0,
+        seed: int = 0,
+    ):
+        """Seeds the fake with synthetic data.
+
+        Args:
+            boards (int): Number of boards.
+            lists (int): Lists per board.
+            cards (int): Cards per list.
+            checklists (int): Checklists per card.
+            checkitems (int): Check items per checklist.
+            latency (float): Seconds each request is delayed by.
+            seed (int): Seed for the generated names and descriptions.
+        """
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self.boards: Dict[str, dict] = {}
+        self.lists: Dict[str, dict] = {}
+        self.cards: Dict[str, dict] = {}
+        self.checklists: Dict[str, dict] = {}
+        self.labels: Dict[str, List[dict]] = {}
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self.routes = self._build_routes()
+        for _ in range(boards):
+            board = self.add_board()
+            for _ in range(lists):
+                trello_list = self.add_list(board["id"])
+                for _ in range(cards):
+                    card = self.add_card(trello_list["id"])
+                    for _ in range(checklists):
+                        checklist = self.add_checklist(card["id"])
+                        for _ in range(checkitems):
+                            self.add_checkitem(checklist["id"])
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        """Returns a transport serving requests from this fake."""
+        return httpx.MockTransport(self.handle)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def new_id(self) -> str:
+        return f"{next(self._ids):024x}"
+
+    def _text(self, words: int) -> str:
+        return " ".join(self._random.choices(WORDS, k=words))
+
+    def add_board(self) -> dict:
+        board_id = self.new_id()
+        self.boards[board_id] = {
+            "id": board_id,
+            "name": self._text(2).title(),
+            "desc": self._text(8),
+            "closed": False,
+            "idOrganization": None,
+            "url": f"https://trello.com/b/{board_id[-8:]}",
+        }
+        self.labels[board_id] = [
+            {"id": self.new_id(), "name": name, "color": color}
+            for name, color in zip(("bug", "feature", "chore"), LABEL_COLORS)
+        ]
+        return self.boards[board_id]
+
+    def add_list(self, board_id: str, name: str | None = None) -> dict:
+        list_id = self.new_id()
+        self.lists[list_id] = {
+            "id": list_id,
+            "name": name or self._text(1).title(),
+            "closed": False,
+            "idBoard": board_id,
+            "pos": float(len(self.lists) + 1) * 16384,
+        }
+        return self.lists[list_id]
+
+    def add_card(self, list_id: str, **fields) -> dict:
+        card_id = self.new_id()
+        board_id = self.lists[list_id]["idBoard"]
+        labels = self.labels[board_id]
+        card = {
+            "id": card_id,
+            "name": self._text(5),
+            "desc": self._text(20) if self._random.random() < 0.5 else "",
+            "closed": False,
+            "idList": list_id,
+            "idBoard": board_id,
+            "url": f"https://trello.com/c/{card_id[-8:]}",
+            "pos": float(len(self.cards) + 1) * 16384,
+            "labels": labels[: self._random.randrange(len(labels) + 1)],
+            "due": None,
+        }
+        card.update(fields)
+        self.cards[card_id] = card
+        return card
+
+    def add_checklist(self, card_id: str, name: str | None = None) -> dict:
+        checklist_id = self.new_id()
+        self.checklists[checklist_id] = {
+            "id": checklist_id,
+            "name": name or self._text(2).title(),
+            "idCard": card_id,
+            "idBoard": self.cards[card_id]["idBoard"],
+            "pos": float(len(self.checklists) + 1) * 16384,
+            "checkItems": [],
+        }
+        return self.checklists[checklist_id]
+
+    def add_checkitem(self, checklist_id: str, name: str | None = None) -> dict:
+        items = self.checklists[checklist_id]["checkItems"]
+        item = {
+            "id": self.new_id(),
+            "name": name or self._text(4),
+            "state": "incomplete",
+            "idChecklist": checklist_id,
+            "pos": float(len(items) + 1) * 16384,
+        }
+        items.append(item)
+        return item
+
+    def _build_routes(self) -> List[tuple]:
+        routes = [
+            ("GET", "/members/{id}/boards", self._member_boards),
+            ("GET", "/boards/{id}", self._board),
+            ("GET", "/boards/{id}/labels", self._board_labels),
+            ("GET", "/boards/{id}/lists", self._board_lists),
+            ("GET", "/boards/{id}/cards", self._board_cards),
+            ("GET", "/boards/{id}/actions", lambda board_id, params, body: []),
+            ("GET", "/lists/{id}", self._list),
+            ("GET", "/lists/{id}/cards", self._list_cards),
+            ("POST", "/lists", self._create_list),
+            ("PUT", "/lists/{id}", self._update_list),
+            ("PUT", "/lists/{id}/closed", self._close_list),
+            ("GET", "/cards/{id}", self._card),
+            ("GET", "/cards/{id}/checklists", self._card_checklists),
+            ("POST", "/cards", self._create_card),
+            ("PUT", "/cards/{id}", self._update_card),
+            ("DELETE", "/cards/{id}", self._delete_card),
+            ("GET", "/checklists/{id}", self._checklist),
+            ("POST", "/checklists", self._create_checklist),
+            ("PUT", "/checklists/{id}", self._update_checklist),
+            ("DELETE", "/checklists/{id}", self._delete_checklist),
+            ("POST", "/checklists/{id}/checkItems", self._create_checkitem),
+            ("PUT", "/checklists/{id}/checkItems/{id}", self._update_checkitem),
+            ("DELETE", "/checklists/{id}/checkItems/{id}", self._delete_checkitem),
+        ]
+        return [
+            (
+                method,
+                template,
+                re.compile("^" + template.replace("{id}", "([^/]+)") + "$"),
+                handler,
+            )
+            for method, template, handler in routes
+        ]
+
+    def _route(self, method: str, path: str) -> tuple[str, Callable, tuple]:
+        for route_method, template, pattern, handler in self.routes:
+            if route_method == method and (match := pattern.match(path)):
+                return template, handler, match.groups()
+        raise KeyError(f"{method} {path}")
+
+    def _call(self, method: str, path: str, params: dict, body: Any) -> Any:
+        """Serves one route, returning the response body or raising KeyError on 404."""
+        _, handler, ids = self._route(method, path)
+        return handler(*ids, params, body)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Serves a request made through `transport`."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        path = request.url.path.removeprefix("/1")
+        params = dict(request.url.params)
+        body = loads(request.content) if request.content else {}
+        if path == "/batch":
+            self.requests["GET /batch"] += 1
+            return self._response(200, self._batch(params["urls"].split(",")))
+        try:
+            template, handler, ids = self._route(request.method, path)
+            self.requests[f"{request.method} {template}"] += 1
+            result = handler(*ids, params, body)
+        except KeyError:
+            self.requests[f"{request.method} (not found)"] += 1
+            return self._response(
+                404, {"message": "The requested resource was not found."}
+            )
+        if request.method != "GET":
+            return self._response(200, result)
+        content = dumps(result)
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers={"etag": etag})
+        return httpx.Response(
+            200,
+            content=content,
+            headers={"content-type": "application/json", "etag": etag},
+        )
+
+    @staticmethod
+    def _response(status: int, body: Any) -> httpx.Response:
+        return httpx.Response(
+            status, content=dumps(body), headers={"content-type": "application/json"}
+        )
+
+    def _batch(self, urls: List[str]) -> List[Any]:
+        results = []
+        for url in urls:
+            parts = urlsplit(url)
+            try:
+                body = self._call("GET", parts.path, dict(parse_qsl(parts.query)), {})
+                results.append({"200": body})
+            except KeyError:
+                results.append({"statusCode": 404, "message": "not found"})
+        return results
+
+    # Boards
+
+    def _member_boards(self, member_id, params, body):
+        return [_pick(board, params.get("fields")) for board in self.boards.values()]
+
+    def _board(self, board_id, params, body):
+        board = _pick(self.boards[board_id], params.get("fields"))
+        if "lists" in params:
+            board["lists"] = [
+                _pick(item, params.get("list_fields"))
+                for item in self._open(self._lists_of(board_id), params["lists"])
+            ]
+        if "cards" in params:
+            cards = self._open(self._cards_of(board_id), params["cards"])
+            board["cards"] = [_pick(card, params.get("card_fields")) for card in cards]
+        if "labels" in params:
+            board["labels"] = [
+                _pick(label, params.get("label_fields"))
+                for label in self.labels[board_id]
+            ]
+        if "checklists" in params:
+            board["checklists"] = [
+                _pick(checklist, params.get("checklist_fields"))
+                | {"checkItems": checklist["checkItems"]}
+                for checklist in self.checklists.values()
+                if checklist["idBoard"] == board_id
+            ]
+        return board
+
+    def _board_labels(self, board_id, params, body):
+        self.boards[board_id]
+        return [_pick(label, params.get("fields")) for label in self.labels[board_id]]
+
+    def _board_lists(self, board_id, params, body):
+        self.boards[board_id]
+        return [
+            _pick(item, params.get("fields"))
+            for item in self._lists_of(board_id)
+            if not item["closed"]
+        ]
+
+    def _board_cards(self, board_id, params, body):
+        self.boards[board_id]
+        # Newest first, continuing below the `before` cursor.
+        cards = sorted(
+            self._open(self._cards_of(board_id), "open"),
+            key=lambda card: card["id"],
+            reverse=True,
+        )
+        if before := params.get("before"):
+            cards = [card for card in cards if card["id"] < before]
+        limit = int(params.get("limit", 1000))
+        return [_pick(card, params.get("fields")) for card in cards[:limit]]
+
+    # Lists
+
+    def _list(self, list_id, params, body):
+        return _pick(self.lists[list_id], params.get("fields"))
+
+    def _list_cards(self, list_id, params, body):
+        self.lists[list_id]
+        return [
+            _pick(card, params.get("fields"))
+            for card in self.cards.values()
+            if card["idList"] == list_id and not card["closed"]
+        ]
+
+    def _create_list(self, _, body):
+        return self.add_list(body["idBoard"], body["name"])
+
+    def _update_list(self, list_id, params, body):
+        self.lists[list_id].update(body)
+        return self.lists[list_id]
+
+    def _close_list(self, list_id, params, body):
+        self.lists[list_id]["closed"] = str(body.get("value")).lower() == "true"
+        return self.lists[list_id]
+
+    # Cards
+
+    def _card(self, card_id, params, body):
+        return _pick(self.cards[card_id], params.get("fields"))
+
+    def _card_checklists(self, card_id, params, body):
+        self.cards[card_id]
+        return [
+            checklist
+            for checklist in self.checklists.values()
+            if checklist["idCard"] == card_id
+        ]
+
+    def _create_card(self, _, body):
+        fields = {key: value for key, value in body.items() if key != "idList"}
+        return self.add_card(body["idList"], **fields)
+
+    def _update_card(self, card_id, params, body):
+        card = self.cards[card_id]
+        card.update(body)
+        if "idList" in body:
+            card["idBoard"] = self.lists[card["idList"]]["idBoard"]
+        return card
+
+    def _delete_card(self, card_id, params, body):
+        del self.cards[card_id]
+        return {"limits": {}}
+
+    # Checklists
+
+    def _checklist(self, checklist_id, params, body):
+        return self.checklists[checklist_id]
+
+    def _create_checklist(self, _, body):
+        return self.add_checklist(body["idCard"], body["name"])
+
+    def _update_checklist(self, checklist_id, params, body):
+        self.checklists[checklist_id].update(body)
+        return self.checklists[checklist_id]
+
+    def _delete_checklist(self, checklist_id, params, body):
+        del self.checklists[checklist_id]
+        return {"limits": {}}
+
+    def _create_checkitem(self, checklist_id, params, body):
+        item = self.add_checkitem(checklist_id, body["name"])
+        if body.get("checked"):
+            item["state"] = "complete"
+        return item
+
+    def _checkitem(self, checklist_id: str, checkitem_id: str) -> dict:
+        for item in self.checklists[checklist_id]["checkItems"]:
+            if item["id"] == checkitem_id:
+                return item
+        raise KeyError(checkitem_id)
+
+    def _update_checkitem(self, checklist_id, checkitem_id, params, body):
+        item = self._checkitem(checklist_id, checkitem_id)
+        if "name" in body:
+            item["name"] = body["name"]
+        if "checked" in body:
+            item["state"] = "complete" if body["checked"] else "incomplete"
+        return item
+
+    def _delete_checkitem(self, checklist_id, checkitem_id, params, body):
+        items = self.checklists[checklist_id]["checkItems"]
+        items.remove(self._checkitem(checklist_id, checkitem_id))
+        return {"limits": {}}
+
+    # Helpers
+
+    def _lists_of(self, board_id: str) -> List[dict]:
+        return [item for item in self.lists.values() if item["idBoard"] == board_id]
+
+    def _cards_of(self, board_id: str) -> List[dict]:
+        return [card for card in self.cards.values() if card["idBoard"] == board_id]
+
+    @staticmethod
+    def _open(items: List[dict], status: str) -> List[dict]:
+        if status == "all":
+            return items
+        return [item for item in items if not item["closed"]]
@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import os
+from contextlib import AsyncExitStack, asynccontextmanager
 
-import uvicorn
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from starlette.applications import Starlette
-from starlette.routing import Mount
 
 from server.tools.tools import register_tools
+from server.trello import lifespan, state
+from server.utils import metrics
+from server.utils.env import env_bool, env_str
+from server.utils.shared import SharedConfig
 
 # Configure logging
 logging.basicConfig(
@@ -19,8 +22,16 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
 # Initialize MCP server
-mcp = FastMCP("Trello MCP Server")
+mcp = FastMCP(
+    "Trello MCP Server",
+    lifespan=lifespan,
+    # Streamable HTTP: handle each request without server-side session state
+    stateless_http=env_bool("MCP_STATELESS_HTTP", True),
+    json_response=env_bool("MCP_JSON_RESPONSE", False),
+)
 
 # Register tools
 register_tools(mcp)
@@ -43,8 +54,94 @@ def start_claude_server():
         raise
 
 
-def start_sse_server():
-    """Start the MCP server in SSE mode using uvicorn"""
+def select_transport() -> str:
+    """Return the transport set by `MCP_TRANSPORT`, or by `USE_CLAUDE_APP` when unset"""
+    use_claude = os.getenv("USE_CLAUDE_APP", "true").lower() == "true"
+    transport = env_str("MCP_TRANSPORT", "stdio" if use_claude else "sse").lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"MCP_TRANSPORT must be one of {', '.join(TRANSPORTS)}")
+    return transport
+
+
+def create_app():
+    """Create the Starlette app serving the MCP server over HTTP.
+
+    Serves the transport selected by `MCP_TRANSPORT`: SSE at `/sse` and
+    `/messages/`, or streamable HTTP at `/mcp`. Used directly for a single
+    process, and as the app factory of each uvicorn worker process when
+    `MCP_SERVER_WORKERS` is above 1.
+    """
+    # Imported here so that Claude app mode over stdio does not load them
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.routing import Mount
+
+    from server.mirror.webhooks import WebhookReceiver
+    from server.utils.sse_relay import SessionRelay
+    from server.utils.tenants import CredentialsMiddleware
+
+    components = state()
+    shared_state = components.shared_state
+    mirror_sync = components.mirror_sync
+    tenant_pool = components.tenant_pool
+    transport = select_transport()
+    background = []
+    if transport == "streamable-http":
+        routes = [Mount("/", app=mcp.streamable_http_app())]
+        if shared_state and not mcp.settings.stateless_http:
+            logger.warning(
+                "Streamable HTTP sessions are not shared between workers, "
+                "set MCP_STATELESS_HTTP=true or route each session to one worker"
+            )
+    elif shared_state:
+        # Relay client messages to the worker holding their SSE session
+        relay = SessionRelay(mcp, shared_state)
+        routes = [Mount("/", app=relay.sse_app())]
+        background.append(relay.run)
+    else:
+        routes = [Mount("/", app=mcp.sse_app())]
+    if metrics.metrics_enabled():
+        # Expose Prometheus metrics next to the MCP endpoints
+        routes = metrics.routes() + routes
+    mirror_config = components.mirror_config
+    if mirror_sync and mirror_config.webhooks:
+        # Receive webhooks for the mirrored boards on this server
+        receiver = WebhookReceiver(mirror_sync)
+        routes = receiver.routes() + routes
+        # Registered by the worker keeping the mirror in sync; any worker receives them.
+        mirror_sync.leader_jobs.append(receiver.register_all)
+        logger.info(f"Mirroring boards: {', '.join(mirror_config.boards)}")
+    middleware = []
+    if tenant_pool:
+        # Serve each request with the Trello credentials it carries
+        middleware.append(Middleware(CredentialsMiddleware))
+        background.append(tenant_pool.run)
+
+    @asynccontextmanager
+    async def server_lifespan(app):
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(lifespan(app))
+            if tenant_pool:
+                stack.push_async_callback(tenant_pool.close)
+            if transport == "streamable-http":
+                # The lifespan of the mounted app does not run, so start the
+                # session manager of the streamable HTTP transport here
+                await stack.enter_async_context(mcp.session_manager.run())
+            tasks = [asyncio.create_task(job()) for job in background]
+            try:
+                yield
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    # Create Starlette app with MCP server mounted
+    return Starlette(routes=routes, middleware=middleware, lifespan=server_lifespan)
+
+
+def start_http_server(transport: str):
+    """Start the MCP server in SSE or streamable HTTP mode using uvicorn"""
+    import uvicorn
+
     try:
         # Verify environment variables
         if not os.getenv("TRELLO_API_KEY") or not os.getenv("TRELLO_TOKEN"):
@@ -54,34 +151,42 @@ def start_sse_server():
 
         host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
         port = int(os.getenv("MCP_SERVER_PORT", "8000"))
-
-        # Create Starlette app with MCP server mounted
-        app = Starlette(
-            routes=[
-                Mount("/", app=mcp.sse_app()),
-            ]
-        )
+        shared_config = SharedConfig.from_env()
 
         logger.info(
-            f"Starting Trello MCP Server in SSE mode on http://{host}:{port}..."
+            f"Starting Trello MCP Server in {transport} mode on http://{host}:{port}..."
         )
-        uvicorn.run(app, host=host, port=port)
+        if shared_config.enabled:
+            # Each worker process imports this module and builds its own app
+            logger.info(
+                f"Running {shared_config.workers} workers sharing state in "
+                f"{shared_config.path}"
+            )
+            uvicorn.run(
+                "main:create_app",
+                factory=True,
+                host=host,
+                port=port,
+                workers=shared_config.workers,
+            )
+        else:
+            uvicorn.run(create_app(), host=host, port=port)
     except Exception as e:
-        logger.error(f"Error starting SSE server: {str(e)}")
+        logger.error(f"Error starting {transport} server: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
     try:
-        # Check which mode to run in (default to true for Claude app mode)
-        use_claude = os.getenv("USE_CLAUDE_APP", "true").lower() == "true"
+        # Check which transport to run (defaults to Claude app mode over stdio)
+        transport = select_transport()
 
-        if use_claude:
+        if transport == "stdio":
             # Run in Claude app mode
             start_claude_server()
         else:
-            # Run in SSE mode
-            start_sse_server()
+            # Run in SSE or streamable HTTP mode
+            start_http_server(transport)
     except KeyboardInterrupt:
         logger.info("Shutting down server...")
     except Exception as e:
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from server.dtos.update_card import UpdateCardPayload
+
+
+class CardUpdate(BaseModel):
+    """
+    A single card update within a bulk update.
+
+    Attributes:
+        card_id (str): The ID of the card to update.
+        payload (UpdateCardPayload): The attributes to update on the card.
+    """
+
+    card_id: str
+    payload: UpdateCardPayload
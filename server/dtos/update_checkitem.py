@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class UpdateCheckItemPayload(BaseModel):
+    """
+    Payload for updating a checkitem within a bulk update.
+
+    Attributes:
+        checklist_id (str): The ID of the checklist containing the item.
+        checkitem_id (str): The ID of the checkitem to update.
+        name (str): New name for the checkitem.
+        checked (bool): New checked state.
+        pos (str): New position for the item.
+    """
+
+    checklist_id: str
+    checkitem_id: str
+    name: str | None = None
+    checked: bool | None = None
+    pos: str | None = None
@@ -0,0 +1,120 @@
+"""
+Keeps the mirror current by polling each board's actions feed.
+
+For deployments that webhooks cannot reach, each poll fetches only the actions
+after the board's cursor (`/boards/{id}/actions?since=<action id>`) and replays
+them oldest first, instead of refetching the board's lists and cards. A
+successful poll confirms the board is current, so full resyncs only happen
+when polling fails for longer than the staleness bound.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from server.mirror.store import MIRRORED_ACTIONS
+from server.mirror.sync import MirrorSync
+
+logger = logging.getLogger(__name__)
+
+
+def _action_time(action: Dict[str, Any]) -> float | None:
+    """Returns the time an action happened as a UNIX timestamp, if known."""
+    try:
+        return datetime.fromisoformat(action["date"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+class ActionPoller:
+    """
+    Replays new actions of the mirrored boards at a fixed interval.
+    """
+
+    def __init__(self, sync: MirrorSync, interval: float | None = None):
+        self.sync = sync
+        self.store = sync.store
+        self.interval = interval or sync.config.poll_interval
+        self.action_filter = ",".join(sorted(MIRRORED_ACTIONS))
+        self.polls = 0
+        self.errors = 0
+        self.deltas = 0
+        self.apply_seconds = 0.0
+        self.polled_at: Dict[str, float] = {}
+        self.delivery_lag: Dict[str, float] = {}
+
+    async def poll_board(self, board_id: str) -> int:
+        """Applies the actions on a board since its cursor.
+
+        Boards without a cursor are skipped until a full sync has recorded one.
+
+        Args:
+            board_id (str): The ID of the board to poll.
+
+        Returns:
+            int: The number of actions applied.
+        """
+        async with self.sync.lock:
+            cursor = self.store.cursors.get(board_id)
+            if cursor is None:
+                return 0
+            actions = [
+                action
+                async for action in self.sync.boards.iter_board_actions(
+                    board_id, since=cursor, action_filter=self.action_filter
+                )
+            ]
+            started = time.perf_counter()
+            # The feed is newest first; deltas must be replayed in order.
+            for action in reversed(actions):
+                await self.sync.apply(action)
+            self.apply_seconds += time.perf_counter() - started
+            self.deltas += len(actions)
+            now = time.time()
+            self.polled_at[board_id] = now
+            self.store.mark_synced(board_id, now)
+            if actions and (happened := _action_time(actions[0])) is not None:
+                self.delivery_lag[board_id] = max(0.0, now - happened)
+        if actions:
+            logger.info(f"Applied {len(actions)} actions to mirror of board {board_id}")
+        return len(actions)
+
+    async def run(self):
+        """Polls every mirrored board until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            for board_id in self.sync.config.boards:
+                self.polls += 1
+                try:
+                    await self.poll_board(board_id)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"Failed to poll actions of board {board_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns sync lag and delta-apply rate metrics for the poller.
+
+        `lag_seconds` is the time since each board was last polled successfully,
+        `delivery_lag_seconds` how long after it happened the newest polled action
+        was applied, and `apply_rate` the deltas applied per second of apply time.
+        """
+        now = time.time()
+        return {
+            "polls": self.polls,
+            "errors": self.errors,
+            "deltas_applied": self.deltas,
+            "apply_rate": (
+                round(self.deltas / self.apply_seconds, 2)
+                if self.apply_seconds
+                else 0.0
+            ),
+            "lag_seconds": {
+                board_id: round(now - polled_at, 3)
+                for board_id, polled_at in self.polled_at.items()
+            },
+            "delivery_lag_seconds": {
+                board_id: round(lag, 3) for board_id, lag in self.delivery_lag.items()
+            },
+        }
@@ -0,0 +1,764 @@
+"""
+In-memory mirror of Trello boards, lists, cards, labels and checklists.
+
+The store is seeded from board snapshots and kept current by applying Trello
+action deltas (from webhooks or the actions feed) and the results of mutations
+made through the services. Reads are answered only while a board was confirmed current
+(by a full sync or a poll of its actions) within the configured staleness
+bound; otherwise callers fall back to the API. The store can optionally persist itself to SQLite.
+Changes are written to the file from the event loop shortly after they are made,
+retrying while another process is writing, so a busy file never stalls the loop.
+Worker processes sharing the SQLite file reload it when another one changed it.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from pydantic import BaseModel
+
+from server.models import (
+    TrelloBoard,
+    TrelloBoardSnapshot,
+    TrelloCard,
+    TrelloCheckItem,
+    TrelloChecklist,
+    TrelloLabel,
+    TrelloList,
+)
+from server.utils.env import env_float, env_str
+
+logger = logging.getLogger(__name__)
+
+# Actions whose payload does not carry the full entity; the entity is refetched.
+FETCH_CARD_ACTIONS = {
+    "createCard",
+    "copyCard",
+    "moveCardToBoard",
+    "convertToCardFromCheckItem",
+    "emailCard",
+}
+FETCH_LIST_ACTIONS = {"createList", "moveListToBoard"}
+FETCH_CHECKLIST_ACTIONS = {"addChecklistToCard", "copyChecklist"}
+
+# Every action type that changes mirrored state, used to filter the actions feed.
+MIRRORED_ACTIONS = (
+    FETCH_CARD_ACTIONS
+    | FETCH_LIST_ACTIONS
+    | FETCH_CHECKLIST_ACTIONS
+    | {
+        "updateCard",
+        "deleteCard",
+        "moveCardFromBoard",
+        "updateList",
+        "moveListFromBoard",
+        "updateChecklist",
+        "removeChecklistFromCard",
+        "createCheckItem",
+        "updateCheckItem",
+        "updateCheckItemStateOnCard",
+        "deleteCheckItem",
+        "addLabelToCard",
+        "removeLabelFromCard",
+        "createLabel",
+        "updateLabel",
+        "deleteLabel",
+        "updateBoard",
+    }
+)
+
+
+class MirrorConfig(BaseModel):
+    """
+    Settings for the local board mirror.
+
+    Attributes:
+        boards (List[str]): IDs of the boards to mirror. The mirror is disabled when empty.
+        max_staleness (float): Seconds since a board was last confirmed current (by a
+            full sync or a poll of its actions) for which reads are served from the mirror.
+        db_path (str): Path of the SQLite file to persist the mirror to, if any.
+        callback_url (str): Public URL of the webhook receiver, if webhooks are used.
+        api_secret (str): Trello API secret used to verify webhook signatures;
+            webhooks are only used when it is set.
+        poll_interval (float): Seconds between polls of the actions feed when
+            webhooks are not used.
+    """
+
+    boards: List[str] = []
+    max_staleness: float = 600.0
+    db_path: str | None = None
+    callback_url: str | None = None
+    api_secret: str | None = None
+    poll_interval: float = 30.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.boards)
+
+    @property
+    def webhooks(self) -> bool:
+        """Whether the mirror is kept current by webhooks, which need a callback
+        URL and the API secret to authenticate deliveries with."""
+        return bool(self.callback_url and self.api_secret)
+
+    @classmethod
+    def from_env(cls) -> "MirrorConfig":
+        """Builds a mirror configuration from `TRELLO_MIRROR_*` environment variables.
+
+        Returns:
+            MirrorConfig: The configuration, with defaults for unset variables.
+        """
+        boards = env_str("TRELLO_MIRROR_BOARDS", "")
+        return cls(
+            boards=[board.strip() for board in boards.split(",") if board.strip()],
+            max_staleness=env_float("TRELLO_MIRROR_MAX_STALENESS", cls().max_staleness),
+            db_path=env_str("TRELLO_MIRROR_DB"),
+            callback_url=env_str("TRELLO_WEBHOOK_CALLBACK_URL"),
+            api_secret=env_str("TRELLO_API_SECRET"),
+            poll_interval=env_float("TRELLO_MIRROR_POLL_INTERVAL", cls().poll_interval),
+        )
+
+
+def _update(model: BaseModel, changes: Dict[str, Any]) -> BaseModel:
+    """Returns a copy of `model` with the changed attributes it knows about applied."""
+    known = {
+        key: value for key, value in changes.items() if key in type(model).model_fields
+    }
+    if not known:
+        return model
+    return model.model_validate({**model.model_dump(), **known})
+
+
+class MirrorStore:
+    """
+    Mirror of board state, keyed by entity ID.
+    """
+
+    # Seconds a write waits for another process's write transaction before it
+    # is retried from the event loop. Every millisecond waited stalls the loop.
+    BUSY_TIMEOUT = 0.01
+
+    # Seconds between attempts to write to a busy file, and how long `flush`
+    # keeps trying before leaving the changes for the next write or refresh.
+    RETRY_INTERVAL = 0.02
+    RETRY_TIMEOUT = 5.0
+
+    # Writing a board's sync time makes every other worker reload the file, so
+    # on its own it is only written once the written time is older than this
+    # fraction of the staleness bound.
+    SYNC_WRITE_FRACTION = 0.25
+
+    def __init__(self, max_staleness: float = 600.0, db_path: str | None = None):
+        self.max_staleness = max_staleness
+        self.boards: Dict[str, TrelloBoard] = {}
+        self.lists: Dict[str, TrelloList] = {}
+        self.cards: Dict[str, TrelloCard] = {}
+        self.checklists: Dict[str, TrelloChecklist] = {}
+        self.labels: Dict[str, Dict[str, TrelloLabel]] = {}
+        self.synced_at: Dict[str, float] = {}
+        self.cursors: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.actions_applied = 0
+        self.reloads = 0
+        self.busy = 0
+        self.db_path = db_path
+        self.db: sqlite3.Connection | None = None
+        # The file's `PRAGMA data_version` when last loaded, which changes when
+        # another connection commits, and a count of this store's own writes.
+        self._data_version: int | None = None
+        self._writes = 0
+        # Changes not yet written to the file: entity rows by (kind, ID), None
+        # for deleted ones, and boards whose sync time or cursor changed.
+        self._pending: Dict[Tuple[str, str], Tuple[str | None, str] | None] = {}
+        self._pending_boards: Set[str] = set()
+        # The sync time of each board as last written to or read from the file.
+        self._written_synced_at: Dict[str, float] = {}
+        self._flusher: asyncio.Task | None = None
+        if db_path:
+            self._open(db_path)
+
+    @classmethod
+    def from_config(cls, config: MirrorConfig) -> "MirrorStore":
+        return cls(max_staleness=config.max_staleness, db_path=config.db_path)
+
+    # Freshness
+
+    def fresh(self, board_id: str | None) -> bool:
+        """Returns whether reads for a board may be served from the mirror."""
+        synced_at = self.synced_at.get(board_id) if board_id else None
+        ok = synced_at is not None and time.time() - synced_at <= self.max_staleness
+        if ok:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return ok
+
+    def stale_boards(self, margin: float = 0.0) -> List[str]:
+        """Returns the synced boards whose last full sync is older than the bound minus `margin`."""
+        now = time.time()
+        return [
+            board_id
+            for board_id, synced_at in self.synced_at.items()
+            if now - synced_at > self.max_staleness - margin
+        ]
+
+    # Reads (None when the data is unknown or not fresh)
+
+    def board(self, board_id: str) -> TrelloBoard | None:
+        if not self.fresh(board_id):
+            return None
+        return self.boards.get(board_id)
+
+    def board_labels(self, board_id: str) -> List[TrelloLabel] | None:
+        if not self.fresh(board_id):
+            return None
+        return list(self.labels.get(board_id, {}).values())
+
+    def board_snapshot(
+        self,
+        board_id: str,
+        include_closed: bool = False,
+        include_checklists: bool = True,
+    ) -> TrelloBoardSnapshot | None:
+        board = self.board(board_id)
+        if board is None:
+            return None
+        lists = self._board_lists(board_id, include_closed)
+        cards = sorted(
+            (
+                card
+                for card in self.cards.values()
+                if card.idBoard == board_id and (include_closed or not card.closed)
+            ),
+            key=lambda card: card.pos,
+        )
+        checklists = []
+        if include_checklists:
+            card_ids = {card.id for card in cards}
+            checklists = [
+                checklist
+                for checklist in self.checklists.values()
+                if checklist.idCard in card_ids
+            ]
+        return TrelloBoardSnapshot(
+            **board.model_dump(),
+            lists=lists,
+            cards=cards,
+            labels=list(self.labels.get(board_id, {}).values()),
+            checklists=checklists,
+        )
+
+    def board_lists(self, board_id: str) -> List[TrelloList] | None:
+        if not self.fresh(board_id):
+            return None
+        return self._board_lists(board_id, include_closed=False)
+
+    def _board_lists(self, board_id: str, include_closed: bool) -> List[TrelloList]:
+        return sorted(
+            (
+                trello_list
+                for trello_list in self.lists.values()
+                if trello_list.idBoard == board_id
+                and (include_closed or not trello_list.closed)
+            ),
+            key=lambda trello_list: trello_list.pos,
+        )
+
+    def list_by_id(self, list_id: str) -> TrelloList | None:
+        trello_list = self.lists.get(list_id)
+        if trello_list is None or not self.fresh(trello_list.idBoard):
+            return None
+        return trello_list
+
+    def list_cards(self, list_id: str) -> List[TrelloCard] | None:
+        if self.list_by_id(list_id) is None:
+            return None
+        return sorted(
+            (
+                card
+                for card in self.cards.values()
+                if card.idList == list_id and not card.closed
+            ),
+            key=lambda card: card.pos,
+        )
+
+    def card(self, card_id: str) -> TrelloCard | None:
+        card = self.cards.get(card_id)
+        if card is None or not self.fresh(card.idBoard):
+            return None
+        return card
+
+    def card_checklists(self, card_id: str) -> List[TrelloChecklist] | None:
+        if self.card(card_id) is None:
+            return None
+        return sorted(
+            (
+                checklist
+                for checklist in self.checklists.values()
+                if checklist.idCard == card_id
+            ),
+            key=lambda checklist: checklist.pos or 0,
+        )
+
+    def checklist(self, checklist_id: str) -> TrelloChecklist | None:
+        checklist = self.checklists.get(checklist_id)
+        if checklist is None:
+            return None
+        card = self.cards.get(checklist.idCard)
+        if card is None or not self.fresh(card.idBoard):
+            return None
+        return checklist
+
+    # Writes
+
+    def load_snapshot(self, snapshot: TrelloBoardSnapshot):
+        """Replaces everything known about a board with a full snapshot of it."""
+        board_id = snapshot.id
+        # The changes are written in one transaction, so other processes reading
+        # the file see the old or the new board, never a mix.
+        self._drop_board(board_id)
+        self.boards[board_id] = TrelloBoard(
+            **snapshot.model_dump(include=set(TrelloBoard.model_fields))
+        )
+        self._persist("board", board_id, board_id, self.boards[board_id])
+        for trello_list in snapshot.lists:
+            self.upsert_list(trello_list)
+        for card in snapshot.cards:
+            self.upsert_card(card)
+        for checklist in snapshot.checklists:
+            self.upsert_checklist(checklist, board_id)
+        self.labels[board_id] = {label.id: label for label in snapshot.labels}
+        for label in snapshot.labels:
+            self._persist("label", label.id, board_id, label)
+        self.mark_synced(board_id)
+        logger.info(
+            f"Mirrored board {board_id}: {len(snapshot.lists)} lists, "
+            f"{len(snapshot.cards)} cards, {len(snapshot.checklists)} checklists"
+        )
+
+    def mark_synced(self, board_id: str, synced_at: float | None = None):
+        """Records that a board was confirmed current.
+
+        The time is written to the file with other changes, or on its own once
+        the written one nears the staleness bound, so that polls finding nothing
+        new do not make the other workers reload the mirror.
+        """
+        synced_at = synced_at or time.time()
+        self.synced_at[board_id] = synced_at
+        written = self._written_synced_at.get(board_id, 0.0)
+        if (
+            self._pending
+            or board_id in self._pending_boards
+            or synced_at - written >= self.max_staleness * self.SYNC_WRITE_FRACTION
+        ):
+            self._persist_meta(board_id)
+
+    def set_cursor(self, board_id: str, cursor: str):
+        """Records the last applied action for a board."""
+        self.cursors[board_id] = cursor
+        self._persist_meta(board_id)
+
+    def upsert_list(self, trello_list: TrelloList):
+        self.lists[trello_list.id] = trello_list
+        self._persist("list", trello_list.id, trello_list.idBoard, trello_list)
+
+    def upsert_card(self, card: TrelloCard):
+        self.cards[card.id] = card
+        self._persist("card", card.id, card.idBoard, card)
+
+    def upsert_checklist(self, checklist: TrelloChecklist, board_id: str | None = None):
+        self.checklists[checklist.id] = checklist
+        card = self.cards.get(checklist.idCard)
+        board_id = board_id or checklist.idBoard or (card.idBoard if card else None)
+        self._persist("checklist", checklist.id, board_id, checklist)
+
+    def upsert_checkitem(self, checkitem: TrelloCheckItem):
+        checklist = self.checklists.get(checkitem.idChecklist)
+        if checklist is None:
+            return
+        items = [item for item in checklist.checkItems if item.id != checkitem.id]
+        items.append(checkitem)
+        self.upsert_checklist(checklist.model_copy(update={"checkItems": items}))
+
+    def remove_card(self, card_id: str):
+        self.cards.pop(card_id, None)
+        self._unpersist("card", card_id)
+        for checklist_id in [
+            checklist.id
+            for checklist in self.checklists.values()
+            if checklist.idCard == card_id
+        ]:
+            self.remove_checklist(checklist_id)
+
+    def remove_list(self, list_id: str):
+        self.lists.pop(list_id, None)
+        self._unpersist("list", list_id)
+        for card_id in [
+            card.id for card in self.cards.values() if card.idList == list_id
+        ]:
+            self.remove_card(card_id)
+
+    def remove_checklist(self, checklist_id: str):
+        self.checklists.pop(checklist_id, None)
+        self._unpersist("checklist", checklist_id)
+
+    def remove_checkitem(self, checklist_id: str, checkitem_id: str):
+        checklist = self.checklists.get(checklist_id)
+        if checklist is None:
+            return
+        items = [item for item in checklist.checkItems if item.id != checkitem_id]
+        self.upsert_checklist(checklist.model_copy(update={"checkItems": items}))
+
+    def _drop_board(self, board_id: str):
+        for list_id in [
+            trello_list.id
+            for trello_list in self.lists.values()
+            if trello_list.idBoard == board_id
+        ]:
+            self.remove_list(list_id)
+        for card_id in [
+            card.id for card in self.cards.values() if card.idBoard == board_id
+        ]:
+            self.remove_card(card_id)
+        for label_id in self.labels.pop(board_id, {}):
+            self._unpersist("label", label_id)
+
+    # Action deltas
+
+    def apply_action(self, action: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Applies a Trello action to the mirror.
+
+        Args:
+            action (Dict[str, Any]): The action object from a webhook or the actions feed.
+
+        Returns:
+            List[Tuple[str, str]]: Entities ("card", "list" or "checklist", ID) whose full
+            state is not contained in the action and must be fetched from the API.
+        """
+        kind = action.get("type", "")
+        data = action.get("data", {})
+        card = data.get("card") or {}
+        trello_list = data.get("list") or {}
+        checklist = data.get("checklist") or {}
+        checkitem = data.get("checkItem") or {}
+        label = data.get("label") or {}
+        board_id = (data.get("board") or {}).get("id")
+        fetch: List[Tuple[str, str]] = []
+        self.actions_applied += 1
+
+        if kind in FETCH_CARD_ACTIONS:
+            fetch.append(("card", card["id"]))
+        elif kind == "updateCard":
+            existing = self.cards.get(card.get("id"))
+            if existing is None:
+                fetch.append(("card", card["id"]))
+            else:
+                self.upsert_card(_update(existing, card))
+        elif kind in ("deleteCard", "moveCardFromBoard"):
+            self.remove_card(card.get("id"))
+        elif kind in FETCH_LIST_ACTIONS:
+            fetch.append(("list", trello_list["id"]))
+        elif kind == "updateList":
+            existing = self.lists.get(trello_list.get("id"))
+            if existing is None:
+                fetch.append(("list", trello_list["id"]))
+            else:
+                self.upsert_list(_update(existing, trello_list))
+        elif kind == "moveListFromBoard":
+            self.remove_list(trello_list.get("id"))
+        elif kind in FETCH_CHECKLIST_ACTIONS:
+            fetch.append(("checklist", checklist["id"]))
+        elif kind == "updateChecklist":
+            existing = self.checklists.get(checklist.get("id"))
+            if existing is None:
+                fetch.append(("checklist", checklist["id"]))
+            else:
+                self.upsert_checklist(_update(existing, checklist))
+        elif kind == "removeChecklistFromCard":
+            self.remove_checklist(checklist.get("id"))
+        elif kind in (
+            "createCheckItem",
+            "updateCheckItem",
+            "updateCheckItemStateOnCard",
+        ):
+            self._apply_checkitem(checklist.get("id"), checkitem, fetch)
+        elif kind == "deleteCheckItem":
+            self.remove_checkitem(checklist.get("id"), checkitem.get("id"))
+        elif kind in ("addLabelToCard", "removeLabelFromCard"):
+            existing = self.cards.get(card.get("id"))
+            if existing is not None:
+                labels = [
+                    item for item in existing.labels if item.id != label.get("id")
+                ]
+                if kind == "addLabelToCard":
+                    labels.append(TrelloLabel(**{"name": "", **label}))
+                self.upsert_card(existing.model_copy(update={"labels": labels}))
+        elif kind in ("createLabel", "updateLabel") and board_id:
+            labels = self.labels.setdefault(board_id, {})
+            existing = labels.get(label.get("id"))
+            updated = (
+                _update(existing, label)
+                if existing
+                else TrelloLabel(**{"name": "", **label})
+            )
+            labels[updated.id] = updated
+            self._persist("label", updated.id, board_id, updated)
+        elif kind == "deleteLabel" and board_id:
+            self.labels.get(board_id, {}).pop(label.get("id"), None)
+            self._unpersist("label", label.get("id"))
+        elif kind == "updateBoard" and board_id in self.boards:
+            self.boards[board_id] = _update(self.boards[board_id], data["board"])
+            self._persist("board", board_id, board_id, self.boards[board_id])
+        else:
+            self.actions_applied -= 1
+            logger.debug(f"Ignoring action type without mirrored state: {kind}")
+        return fetch
+
+    def _apply_checkitem(
+        self,
+        checklist_id: str | None,
+        checkitem: Dict[str, Any],
+        fetch: List[Tuple[str, str]],
+    ):
+        checklist = self.checklists.get(checklist_id)
+        if checklist is None:
+            if checklist_id:
+                fetch.append(("checklist", checklist_id))
+            return
+        existing = next(
+            (item for item in checklist.checkItems if item.id == checkitem.get("id")),
+            None,
+        )
+        if existing is not None:
+            self.upsert_checkitem(_update(existing, checkitem))
+        else:
+            self.upsert_checkitem(
+                TrelloCheckItem(**{**checkitem, "idChecklist": checklist_id})
+            )
+
+    # Persistence
+
+    def _open(self, db_path: str):
+        # Workers starting together create the schema, so wait longer until then.
+        self.db = sqlite3.connect(db_path, isolation_level=None, timeout=10.0)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_entities ("
+            "kind TEXT NOT NULL, id TEXT NOT NULL, board_id TEXT, data TEXT NOT NULL, "
+            "PRIMARY KEY (kind, id))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_boards ("
+            "board_id TEXT PRIMARY KEY, synced_at REAL, cursor TEXT)"
+        )
+        self.db.execute(f"PRAGMA busy_timeout = {int(self.BUSY_TIMEOUT * 1000)}")
+        self._data_version = self._version()
+        self._install(_read_state(self.db))
+        logger.info(
+            f"Loaded mirror from disk: {len(self.boards)} boards, {len(self.cards)} cards"
+        )
+
+    def _version(self) -> int:
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _install(self, state: Dict[str, Dict]):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._written_synced_at = dict(self.synced_at)
+
+    async def refresh(self) -> bool:
+        """Reloads the mirror from its SQLite file if another process changed it.
+
+        The file is read in a thread after this store's pending changes are
+        written. A reload that overlapped a write of this store is discarded and
+        retried on the next call, so it never loses the write.
+
+        Returns:
+            bool: Whether the mirror was reloaded.
+        """
+        if self.db is None:
+            return False
+        await self.flush()
+        if self._pending or self._pending_boards:
+            return False
+        version = self._version()
+        if version == self._data_version:
+            return False
+        writes = self._writes
+        state = await asyncio.to_thread(_read_file, self.db_path)
+        if self._writes != writes:
+            return False
+        self._install(state)
+        self._data_version = version
+        self.reloads += 1
+        return True
+
+    def _persist(
+        self, kind: str, entity_id: str, board_id: str | None, model: BaseModel
+    ):
+        if self.db is not None:
+            self._writes += 1
+            self._pending[kind, entity_id] = (board_id, model.model_dump_json())
+            self._schedule_flush()
+
+    def _unpersist(self, kind: str, entity_id: str | None):
+        if self.db is not None and entity_id:
+            self._writes += 1
+            self._pending[kind, entity_id] = None
+            self._schedule_flush()
+
+    def _persist_meta(self, board_id: str):
+        if self.db is not None:
+            self._writes += 1
+            self._pending_boards.add(board_id)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Writes the pending changes once the current (synchronous) update is done."""
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop, e.g. in a script: write right away.
+            self._try_write()
+            return
+        self._flusher = loop.create_task(self.flush())
+
+    def _try_write(self) -> bool:
+        """Writes the pending changes, returning False if the file is busy."""
+        try:
+            self._write_pending()
+        except sqlite3.OperationalError:
+            self.busy += 1
+            return False
+        return True
+
+    def _write_pending(self):
+        """Writes the pending changes in one transaction."""
+        if not self._pending and not self._pending_boards:
+            return
+        upserts = [
+            (kind, entity_id, *row)
+            for (kind, entity_id), row in self._pending.items()
+            if row is not None
+        ]
+        deletes = [key for key, row in self._pending.items() if row is None]
+        boards = [
+            (board_id, self.synced_at.get(board_id), self.cursors.get(board_id))
+            for board_id in self._pending_boards
+        ]
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany(
+                "DELETE FROM mirror_entities WHERE kind = ? AND id = ?", deletes
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO mirror_entities (kind, id, board_id, data) "
+                "VALUES (?, ?, ?, ?)",
+                upserts,
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO mirror_boards (board_id, synced_at, cursor) "
+                "VALUES (?, ?, ?)",
+                boards,
+            )
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        for board_id, synced_at, _ in boards:
+            if synced_at:
+                self._written_synced_at[board_id] = synced_at
+        self._pending = {}
+        self._pending_boards = set()
+
+    async def flush(self):
+        """Writes the pending changes to the SQLite file, retrying while it is busy.
+
+        Changes still pending after `RETRY_TIMEOUT` are left for the next write
+        or refresh to retry.
+        """
+        deadline = time.monotonic() + self.RETRY_TIMEOUT
+        while self.db is not None and not self._try_write():
+            if time.monotonic() >= deadline:
+                logger.warning("Mirror file stayed busy, retrying its writes later")
+                return
+            await asyncio.sleep(self.RETRY_INTERVAL)
+
+    def close(self):
+        if self.db is not None:
+            if not self._try_write():
+                logger.warning("Mirror file is busy, dropped its unwritten changes")
+            self.db.close()
+            self.db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the size of the mirror and how often reads were served from it."""
+        now = time.time()
+        return {
+            "boards": len(self.boards),
+            "lists": len(self.lists),
+            "cards": len(self.cards),
+            "checklists": len(self.checklists),
+            "hits": self.hits,
+            "misses": self.misses,
+            "actions_applied": self.actions_applied,
+            "reloads": self.reloads,
+            "busy": self.busy,
+            "sync_age_seconds": {
+                board_id: round(now - synced_at, 3)
+                for board_id, synced_at in self.synced_at.items()
+            },
+        }
+
+
+def _read_state(db: sqlite3.Connection) -> Dict[str, Dict]:
+    """Reads a persisted mirror, returning the `MirrorStore` attributes it holds."""
+    state = {
+        "boards": {},
+        "lists": {},
+        "cards": {},
+        "checklists": {},
+        "labels": {},
+        "synced_at": {},
+        "cursors": {},
+    }
+    models = {
+        "list": ("lists", TrelloList),
+        "card": ("cards", TrelloCard),
+        "checklist": ("checklists", TrelloChecklist),
+        "board": ("boards", TrelloBoard),
+    }
+    for kind, entity_id, board_id, data in db.execute(
+        "SELECT kind, id, board_id, data FROM mirror_entities"
+    ):
+        if kind == "label":
+            state["labels"].setdefault(board_id, {})[entity_id] = (
+                TrelloLabel.model_validate_json(data)
+            )
+        elif kind in models:
+            name, model = models[kind]
+            state[name][entity_id] = model.model_validate_json(data)
+    for board_id, synced_at, cursor in db.execute(
+        "SELECT board_id, synced_at, cursor FROM mirror_boards"
+    ):
+        if synced_at:
+            state["synced_at"][board_id] = synced_at
+        if cursor:
+            state["cursors"][board_id] = cursor
+    return state
+
+
+def _read_file(db_path: str) -> Dict[str, Dict]:
+    """Reads a persisted mirror through a connection of its own, e.g. in a thread."""
+    db = sqlite3.connect(db_path)
+    try:
+        # One read transaction, so the tables are read as of the same commit.
+        db.execute("BEGIN")
+        return _read_state(db)
+    finally:
+        db.close()
@@ -0,0 +1,279 @@
+"""
+Keeps the mirror in step with Trello.
+
+Boards are seeded from a full snapshot and resynced before their last sync
+falls outside the staleness bound, which also recovers from missed deltas.
+Between resyncs, action deltas are applied as they arrive; entities whose
+full state is not part of an action are refetched from the API.
+
+When several worker processes share state, one of them at a time holds the
+mirror role and does all of the above, including applying the webhook actions
+the other workers receive and queue for it. The others read the mirror from
+the SQLite file it is persisted to, reloading it whenever it changes.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List
+
+from pydantic import ValidationError
+
+from server.mirror.store import MIRRORED_ACTIONS, MirrorConfig, MirrorStore
+from server.models import TrelloChecklist
+from server.services.board import BoardService
+from server.services.card import CardService
+from server.services.checklist import ChecklistService
+from server.services.list import ListService
+from server.utils.fastjson import dumps, loads
+from server.utils.shared import SharedState
+from server.utils.trello_api import TrelloClient
+
+logger = logging.getLogger(__name__)
+
+# The worker role of keeping the mirror in sync, see `SharedState.lead`.
+MIRROR_ROLE = "mirror"
+
+
+class MirrorSync:
+    """
+    Seeds, resyncs and applies action deltas to a `MirrorStore`.
+    """
+
+    # Seconds the mirror role is held without renewal.
+    ROLE_TTL = 10.0
+
+    # Seconds between renewals of the role and checks for changes by other workers.
+    COORDINATE_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        client: TrelloClient,
+        store: MirrorStore,
+        config: MirrorConfig,
+        shared: SharedState | None = None,
+    ):
+        self.client = client
+        self.store = store
+        self.config = config
+        # Services without a mirror, so fetches always go to the API.
+        self.boards = BoardService(client)
+        self.lists = ListService(client)
+        self.cards = CardService(client)
+        self.checklists = ChecklistService(client)
+        # Serializes full syncs and polled deltas so old deltas never land on a newer snapshot.
+        self.lock = asyncio.Lock()
+        # Set to an `ActionPoller` to keep boards current from the actions feed.
+        self.poller = None
+        # Jobs run only by the worker holding the mirror role, e.g. registering webhooks.
+        self.leader_jobs: List[Callable[[], Awaitable[Any]]] = []
+        self.shared = shared
+        # Without shared state, this process is the only one keeping the mirror.
+        self.leading = shared is None
+        self._tasks: List[asyncio.Task] = []
+        self._leader_tasks: List[asyncio.Task] = []
+        self._sessions = 0
+        self.malformed = 0
+
+    async def sync_board(self, board_id: str):
+        """Replaces the mirrored state of a board with a fresh snapshot.
+
+        The newest action is recorded as the board's cursor before the snapshot
+        is taken, so replaying the actions feed from it misses no change.
+        """
+        async with self.lock:
+            latest = await self.latest_action(board_id)
+            self.client.invalidate(f"/boards/{board_id}?")
+            snapshot = await self.boards.get_board_snapshot(board_id)
+            self.store.load_snapshot(snapshot)
+            if latest:
+                self.store.set_cursor(board_id, latest["id"])
+
+    async def latest_action(self, board_id: str) -> Dict[str, Any] | None:
+        """Returns the newest action on a board that changes mirrored state, if any."""
+        actions = self.boards.iter_board_actions(
+            board_id, action_filter=",".join(sorted(MIRRORED_ACTIONS)), page_size=1
+        )
+        try:
+            return await anext(actions, None)
+        finally:
+            await actions.aclose()
+
+    async def deliver(self, action: Dict[str, Any]):
+        """Applies a webhook action, or queues it for the worker holding the mirror role.
+
+        Args:
+            action (Dict[str, Any]): The action object from a webhook.
+        """
+        if not self.leading:
+            await self.shared.post_action(dumps(action))
+            return
+        # Serialized with full syncs, so a delta never lands under an older snapshot.
+        async with self.lock:
+            await self.apply(action)
+
+    async def apply(self, action: Dict[str, Any]):
+        """Applies an action delta and fetches the entities it does not fully describe.
+
+        Actions missing the fields their type needs are logged and skipped.
+
+        Args:
+            action (Dict[str, Any]): The action object from a webhook or the actions feed.
+        """
+        try:
+            board_id = ((action.get("data") or {}).get("board") or {}).get("id")
+            if board_id and board_id not in self.config.boards:
+                return
+            fetch = self.store.apply_action(action)
+            self._invalidate(action, board_id)
+        except (KeyError, TypeError, AttributeError, ValidationError) as e:
+            # Skip rather than fail, since Trello disables webhooks that keep failing.
+            self.malformed += 1
+            logger.warning(
+                f"Skipping malformed {action.get('type')} action {action.get('id')}: "
+                f"{e!r}"
+            )
+            return
+        for kind, entity_id in fetch:
+            try:
+                await self._fetch(kind, entity_id)
+            except Exception as e:
+                logger.warning(f"Failed to fetch {kind} {entity_id} for mirror: {e}")
+        if board_id and action.get("id"):
+            self.store.set_cursor(board_id, action["id"])
+
+    async def _fetch(self, kind: str, entity_id: str):
+        if kind == "card":
+            self.store.upsert_card(await self.cards.get_card(entity_id))
+        elif kind == "list":
+            self.store.upsert_list(await self.lists.get_list(entity_id))
+        elif kind == "checklist":
+            self.store.upsert_checklist(
+                TrelloChecklist(**await self.checklists.get_checklist(entity_id))
+            )
+
+    def _invalidate(self, action: Dict[str, Any], board_id: str | None):
+        """Evicts cached responses that a change made outside this server made stale."""
+        data = action.get("data") or {}
+        patterns = [
+            f"/{resource}s/{data[resource]['id']}"
+            for resource in ("card", "list", "checklist")
+            if isinstance(data.get(resource), dict) and data[resource].get("id")
+        ]
+        if isinstance(data.get("card"), dict) and data["card"].get("id"):
+            patterns.append("/lists/*/cards")
+        if board_id:
+            patterns += [f"/boards/{board_id}/*", f"/boards/{board_id}?"]
+        self.client.invalidate(*patterns)
+
+    async def _run(self):
+        """Seeds every configured board, then resyncs boards nearing the staleness bound."""
+        interval = self.config.max_staleness / 2
+        pending = [
+            board_id
+            for board_id in self.config.boards
+            if board_id not in self.store.synced_at
+            or board_id in self.store.stale_boards(margin=interval)
+        ]
+        while True:
+            for board_id in pending:
+                try:
+                    await self.sync_board(board_id)
+                except Exception as e:
+                    logger.error(f"Failed to sync mirror of board {board_id}: {e}")
+            await asyncio.sleep(interval)
+            pending = self.store.stale_boards(margin=interval) + [
+                board_id
+                for board_id in self.config.boards
+                if board_id not in self.store.synced_at
+            ]
+
+    async def _drain(self):
+        """Applies the webhook actions that other workers queued, until cancelled."""
+        while True:
+            try:
+                bodies = self.shared.take_actions()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read queued webhook actions, retrying: {e}")
+                bodies = []
+            if bodies:
+                async with self.lock:
+                    for body in bodies:
+                        await self.apply(loads(body))
+            await asyncio.sleep(self.shared.POLL_INTERVAL)
+
+    def _start_leading(self):
+        jobs = [self._run, *self.leader_jobs]
+        if self.poller:
+            jobs.append(self.poller.run)
+        if self.shared:
+            jobs.append(self._drain)
+        self._leader_tasks = [asyncio.create_task(job()) for job in jobs]
+
+    async def _stop_leading(self):
+        for task in self._leader_tasks:
+            task.cancel()
+        await asyncio.gather(*self._leader_tasks, return_exceptions=True)
+        self._leader_tasks = []
+
+    async def _coordinate(self):
+        """Keeps the mirror role in one worker and this worker's mirror current."""
+        while True:
+            try:
+                leading = self.shared.lead(MIRROR_ROLE, self.ROLE_TTL)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to renew the mirror role, retrying: {e}")
+                leading = self.leading
+            if leading and not self.leading:
+                logger.info("This worker now keeps the board mirror in sync")
+                self.leading = True
+                self._start_leading()
+            elif not leading and self.leading:
+                logger.info("Another worker now keeps the board mirror in sync")
+                self.leading = False
+                await self._stop_leading()
+            try:
+                await self.store.refresh()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to reload the mirror, retrying: {e}")
+            await asyncio.sleep(self.COORDINATE_INTERVAL)
+
+    @asynccontextmanager
+    async def running(self):
+        """Keeps the mirror synced in the background while the context is active.
+
+        Like `TrelloClient.session()`, holders are reference counted, so the
+        server and its MCP sessions share one set of background tasks. With
+        shared state, the tasks run only while this worker holds the mirror role.
+        """
+        self._sessions += 1
+        if self._sessions == 1:
+            if self.shared is None:
+                self._start_leading()
+            else:
+                self._tasks = [asyncio.create_task(self._coordinate())]
+        try:
+            yield self
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0:
+                for task in self._tasks:
+                    task.cancel()
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+                self._tasks = []
+                await self._stop_leading()
+                if self.shared and self.leading:
+                    # Hand the role over now rather than when the lease expires.
+                    self.leading = False
+                    await self.shared.resign(MIRROR_ROLE)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the mirror's size and hit counters, and the poller's metrics if polling."""
+        stats = self.store.stats()
+        stats["malformed_actions"] = self.malformed
+        if self.shared:
+            stats["leader"] = self.leading
+        if self.poller:
+            stats["poller"] = self.poller.stats()
+        return stats
@@ -0,0 +1,140 @@
+"""
+Trello webhook receiver and registration for the board mirror.
+
+Trello verifies a callback URL with a `HEAD` request when a webhook is
+created, then `POST`s every action on the watched model to it. Deliveries
+are authenticated with the `X-Trello-Webhook` header: the base64 HMAC-SHA1 of
+the body followed by the callback URL, keyed with the API secret. Without the
+secret, anyone could write to the mirror, so the receiver requires it.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from server.mirror.sync import MirrorSync
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBHOOK_PATH = "/webhooks/trello"
+
+
+def verify_signature(
+    body: bytes, callback_url: str, secret: str, signature: str
+) -> bool:
+    """Checks the `X-Trello-Webhook` signature of a webhook delivery.
+
+    Args:
+        body (bytes): The raw request body.
+        callback_url (str): The callback URL the webhook was registered with.
+        secret (str): The Trello API secret.
+        signature (str): The value of the `X-Trello-Webhook` header.
+
+    Returns:
+        bool: Whether the signature matches.
+    """
+    digest = hmac.new(
+        secret.encode(), body + callback_url.encode(), hashlib.sha1
+    ).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), signature)
+
+
+class WebhookReceiver:
+    """
+    Receives Trello webhook deliveries and applies them to the mirror.
+    """
+
+    def __init__(self, sync: MirrorSync):
+        if not sync.config.webhooks:
+            raise ValueError(
+                "TRELLO_WEBHOOK_CALLBACK_URL and TRELLO_API_SECRET must be set "
+                "to receive webhooks"
+            )
+        self.sync = sync
+        self.config = sync.config
+        self.path = urlparse(self.config.callback_url).path or DEFAULT_WEBHOOK_PATH
+        self.received = 0
+        self.rejected = 0
+
+    def routes(self) -> List[Route]:
+        """Returns the Starlette routes serving the callback URL."""
+        return [Route(self.path, self.handle, methods=["HEAD", "POST"])]
+
+    async def handle(self, request: Request) -> Response:
+        if request.method == "HEAD":
+            return Response(status_code=200)
+        body = await request.body()
+        if not verify_signature(
+            body,
+            self.config.callback_url,
+            self.config.api_secret,
+            request.headers.get("x-trello-webhook", ""),
+        ):
+            self.rejected += 1
+            logger.warning("Rejected webhook delivery with an invalid signature")
+            return Response(status_code=401)
+        try:
+            action = json.loads(body).get("action")
+        except (ValueError, AttributeError):
+            return Response(status_code=400)
+        self.received += 1
+        if isinstance(action, dict):
+            await self.sync.deliver(action)
+        return Response(status_code=200)
+
+    async def register(self, board_id: str) -> Dict[str, Any]:
+        """Registers a webhook for a board, reusing an existing one for the same callback.
+
+        Args:
+            board_id (str): The ID of the board to watch.
+
+        Returns:
+            Dict[str, Any]: The webhook object.
+        """
+        client = self.sync.client
+        for webhook in await client.GET(
+            f"/tokens/{client.token}/webhooks", cache=False
+        ):
+            if (
+                webhook.get("idModel") == board_id
+                and webhook.get("callbackURL") == self.config.callback_url
+            ):
+                return webhook
+        webhook = await client.POST(
+            "/webhooks",
+            data={
+                "callbackURL": self.config.callback_url,
+                "idModel": board_id,
+                "description": f"Trello MCP mirror of board {board_id}",
+            },
+        )
+        logger.info(f"Registered webhook {webhook.get('id')} for board {board_id}")
+        return webhook
+
+    async def register_all(self, attempts: int = 5, delay: float = 2.0):
+        """Registers webhooks for all mirrored boards once the server accepts requests.
+
+        Trello calls the callback URL while creating a webhook, so registration
+        is retried while the server is still starting up.
+        """
+        await asyncio.sleep(delay)
+        for board_id in self.config.boards:
+            for attempt in range(1, attempts + 1):
+                try:
+                    await self.register(board_id)
+                    break
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to register webhook for board {board_id} "
+                        f"(attempt {attempt}/{attempts}): {e}"
+                    )
+                    await asyncio.sleep(delay * attempt)
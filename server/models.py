@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List
 
 from pydantic import BaseModel
 
@@ -45,3 +45,57 @@ class TrelloCard(BaseModel):
     pos: float
     labels: List[TrelloLabel] = []
     due: str | None = None
+
+
+class TrelloCheckItem(BaseModel):
+    """Model representing an item on a Trello checklist."""
+
+    id: str
+    name: str
+    state: str = "incomplete"
+    idChecklist: str
+    pos: float | None = None
+
+
+class TrelloChecklist(BaseModel):
+    """Model representing a Trello checklist."""
+
+    id: str
+    name: str
+    idCard: str
+    idBoard: str | None = None
+    pos: float | None = None
+    checkItems: List[TrelloCheckItem] = []
+
+
+class TrelloBoardSnapshot(TrelloBoard):
+    """Model representing a board together with its lists, cards, labels and checklists."""
+
+    lists: List[TrelloList] = []
+    cards: List[TrelloCard] = []
+    labels: List[TrelloLabel] = []
+    checklists: List[TrelloChecklist] = []
+
+
+class BulkItemResult(BaseModel):
+    """Model representing the outcome of one item in a bulk operation."""
+
+    index: int
+    ok: bool
+    result: Any | None = None
+    error: str | None = None
+
+
+class TrelloCardPage(BaseModel):
+    """Model representing one page of cards and the cursor for the next page."""
+
+    cards: List[TrelloCard] = []
+    next_cursor: str | None = None
+
+
+class TrelloCardSearchHit(BaseModel):
+    """Model representing a card matching a search query."""
+
+    card: TrelloCard
+    score: float
+    matched: List[str] = []
@@ -2,52 +2,177 @@
 Service for managing Trello boards in MCP server.
 """
 
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 
-from server.models import TrelloBoard, TrelloLabel
+from server.models import (
+    TrelloBoard,
+    TrelloBoardSnapshot,
+    TrelloCard,
+    TrelloChecklist,
+    TrelloLabel,
+    TrelloList,
+)
+from server.mirror.store import MirrorStore
+from server.utils.decode import decode, decode_list
+from server.utils.fields import model_fields
+from server.utils.pagination import MAX_PAGE_SIZE, paginate
+from server.utils.tracing import trace_methods
 from server.utils.trello_api import TrelloClient
 
 
+@trace_methods
 class BoardService:
     """
     Service class for managing Trello boards
     """
 
-    def __init__(self, client: TrelloClient):
+    def __init__(self, client: TrelloClient, mirror: MirrorStore | None = None):
         self.client = client
+        self.mirror = mirror
 
-    async def get_board(self, board_id: str) -> TrelloBoard:
+    async def get_board(
+        self, board_id: str, fields: List[str] | None = None
+    ) -> TrelloBoard:
         """Retrieves a specific board by its ID.
 
         Args:
             board_id (str): The ID of the board to retrieve.
+            fields (List[str], optional): Board fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             TrelloBoard: The board object containing board details.
         """
-        response = await self.client.GET(f"/boards/{board_id}")
+        if self.mirror and (board := self.mirror.board(board_id)):
+            return board
+        response = await self.client.GET(
+            f"/boards/{board_id}",
+            params={"fields": model_fields(TrelloBoard, fields)},
+            batch=True,
+        )
         return TrelloBoard(**response)
 
-    async def get_boards(self, member_id: str = "me") -> List[TrelloBoard]:
+    async def get_boards(
+        self, member_id: str = "me", fields: List[str] | None = None
+    ) -> List[TrelloBoard]:
         """Retrieves all boards for a given member.
 
         Args:
             member_id (str): The ID of the member whose boards to retrieve. Defaults to "me" for the authenticated user.
+            fields (List[str], optional): Board fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             List[TrelloBoard]: A list of board objects.
         """
-        response = await self.client.GET(f"/members/{member_id}/boards")
-        return [TrelloBoard(**board) for board in response]
+        response = await self.client.GET(
+            f"/members/{member_id}/boards",
+            params={"fields": model_fields(TrelloBoard, fields)},
+            raw=True,
+        )
+        return decode_list(TrelloBoard, response)
 
-    async def get_board_labels(self, board_id: str) -> List[TrelloLabel]:
+    async def get_board_labels(
+        self, board_id: str, fields: List[str] | None = None
+    ) -> List[TrelloLabel]:
         """Retrieves all labels for a specific board.
 
         Args:
             board_id (str): The ID of the board whose labels to retrieve.
+            fields (List[str], optional): Label fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             List[TrelloLabel]: A list of label objects for the board.
         """
-        response = await self.client.GET(f"/boards/{board_id}/labels")
-        return [TrelloLabel(**label) for label in response]
+        if self.mirror and (labels := self.mirror.board_labels(board_id)) is not None:
+            return labels
+        response = await self.client.GET(
+            f"/boards/{board_id}/labels",
+            params={"fields": model_fields(TrelloLabel, fields)},
+            raw=True,
+        )
+        return decode_list(TrelloLabel, response)
+
+    async def get_board_snapshot(
+        self,
+        board_id: str,
+        include_closed: bool = False,
+        include_checklists: bool = True,
+        card_fields: List[str] | None = None,
+        fresh: bool = False,
+    ) -> TrelloBoardSnapshot:
+        """Retrieves a board with its lists, cards, labels and checklists in one request.
+
+        Uses Trello's nested resource expansion and restricts every nested
+        resource to the fields of its model to keep the payload small.
+
+        Args:
+            board_id (str): The ID of the board to retrieve.
+            include_closed (bool): Whether to include archived lists and cards. Defaults to False.
+            include_checklists (bool): Whether to include card checklists. Defaults to True.
+            card_fields (List[str], optional): Card fields to return. Required fields are always included. Defaults to all fields.
+            fresh (bool): Whether to read the board from the API rather than the mirror
+                or a cached snapshot; the response replaces cached snapshots. Defaults to False.
+
+        Returns:
+            TrelloBoardSnapshot: The board together with its nested resources.
+        """
+        if fresh:
+            self.client.invalidate(f"/boards/{board_id}?")
+        elif self.mirror and (
+            snapshot := self.mirror.board_snapshot(
+                board_id, include_closed, include_checklists
+            )
+        ):
+            return snapshot
+        status = "all" if include_closed else "open"
+        params = {
+            "fields": model_fields(TrelloBoard),
+            "lists": status,
+            "list_fields": model_fields(TrelloList),
+            "cards": status,
+            "card_fields": model_fields(TrelloCard, card_fields),
+            "labels": "all",
+            "label_fields": model_fields(TrelloLabel),
+            "labels_limit": 1000,
+        }
+        if include_checklists:
+            params["checklists"] = "all"
+            params["checklist_fields"] = model_fields(
+                TrelloChecklist, exclude=["checkItems"]
+            )
+        response = await self.client.GET(f"/boards/{board_id}", params=params, raw=True)
+        return decode(TrelloBoardSnapshot, response)
+
+    async def iter_board_actions(
+        self,
+        board_id: str,
+        since: str | None = None,
+        action_filter: str | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yields the actions on a board, newest first, fetching one page at a time.
+
+        The feed is always read from the API, never from the response cache.
+
+        Args:
+            board_id (str): The ID of the board whose actions to retrieve.
+            since (str, optional): Only return actions after this action ID or date.
+            action_filter (str, optional): Comma-separated action types, e.g. "createCard,updateCard".
+            page_size (int): Actions fetched per request, at most 1000.
+
+        Yields:
+            Dict[str, Any]: The raw action objects.
+        """
+        params = {}
+        if since:
+            params["since"] = since
+        if action_filter:
+            params["filter"] = action_filter
+        async for page in paginate(
+            self.client,
+            f"/boards/{board_id}/actions",
+            params=params,
+            page_size=page_size,
+            cache=False,
+        ):
+            for action in page:
+                yield action
@@ -2,43 +2,145 @@
 Service for managing Trello cards in MCP server.
 """
 
-from typing import Any, Dict, List
+import logging
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlencode
 
-from server.models import TrelloCard
+from server.mirror.store import MirrorStore
+from server.models import BulkItemResult, TrelloCard, TrelloCardPage
+from server.utils.bulk import run_bounded
+from server.utils.decode import decode_list
+from server.utils.fields import model_fields
+from server.utils.pagination import MAX_PAGE_SIZE, next_cursor
+from server.utils.search import CardIndex
+from server.utils.tracing import trace_methods
 from server.utils.trello_api import TrelloClient
 
+logger = logging.getLogger(__name__)
 
+
+@trace_methods
 class CardService:
     """
     Service class for managing Trello cards.
     """
 
-    def __init__(self, client: TrelloClient):
+    def __init__(
+        self,
+        client: TrelloClient,
+        mirror: MirrorStore | None = None,
+        index: CardIndex | None = None,
+    ):
         self.client = client
+        self.mirror = mirror
+        self.index = index
 
-    async def get_card(self, card_id: str) -> TrelloCard:
+    async def get_card(
+        self, card_id: str, fields: List[str] | None = None
+    ) -> TrelloCard:
         """Retrieves a specific card by its ID.
 
         Args:
             card_id (str): The ID of the card to retrieve.
+            fields (List[str], optional): Card fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             TrelloCard: The card object containing card details.
         """
-        response = await self.client.GET(f"/cards/{card_id}")
+        if self.mirror and (card := self.mirror.card(card_id)):
+            return card
+        response = await self.client.GET(
+            f"/cards/{card_id}",
+            params={"fields": model_fields(TrelloCard, fields)},
+            batch=True,
+        )
         return TrelloCard(**response)
 
-    async def get_cards(self, list_id: str) -> List[TrelloCard]:
+    async def get_cards(
+        self, list_id: str, fields: List[str] | None = None
+    ) -> List[TrelloCard]:
         """Retrieves all cards in a given list.
 
         Args:
             list_id (str): The ID of the list whose cards to retrieve.
+            fields (List[str], optional): Card fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             List[TrelloCard]: A list of card objects.
         """
-        response = await self.client.GET(f"/lists/{list_id}/cards")
-        return [TrelloCard(**card) for card in response]
+        if self.mirror and (cards := self.mirror.list_cards(list_id)) is not None:
+            return cards
+        response = await self.client.GET(
+            f"/lists/{list_id}/cards",
+            params={"fields": model_fields(TrelloCard, fields)},
+            raw=True,
+        )
+        return decode_list(TrelloCard, response)
+
+    async def get_board_cards_page(
+        self,
+        board_id: str,
+        limit: int = 100,
+        cursor: str | None = None,
+        fields: List[str] | None = None,
+    ) -> TrelloCardPage:
+        """Retrieves one page of the open cards on a board, newest first.
+
+        Args:
+            board_id (str): The ID of the board whose cards to retrieve.
+            limit (int): Maximum number of cards in the page, at most 1000. Defaults to 100.
+            cursor (str, optional): Cursor returned with the previous page.
+            fields (List[str], optional): Card fields to return. Required fields are always included. Defaults to all fields.
+
+        Returns:
+            TrelloCardPage: The cards and the cursor for the next page, if any.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        params = {"fields": model_fields(TrelloCard, fields), "limit": limit}
+        if cursor:
+            params["before"] = cursor
+        response = await self.client.GET(f"/boards/{board_id}/cards", params=params)
+        return TrelloCardPage(
+            cards=decode_list(TrelloCard, response),
+            next_cursor=next_cursor(response, limit),
+        )
+
+    async def get_cards_by_ids(
+        self, card_ids: List[str], fields: List[str] | None = None
+    ) -> List[TrelloCard]:
+        """Retrieves several cards by their IDs using Trello's batch endpoint.
+
+        Up to ten cards are fetched per round trip. Cards that cannot be
+        retrieved are skipped and logged.
+
+        Args:
+            card_ids (List[str]): The IDs of the cards to retrieve.
+            fields (List[str], optional): Card fields to return. Required fields are always included. Defaults to all fields.
+
+        Returns:
+            List[TrelloCard]: The retrieved cards, in the order requested.
+        """
+        mirrored = {}
+        if self.mirror:
+            for card_id in card_ids:
+                if card := self.mirror.card(card_id):
+                    mirrored[card_id] = card
+        missing = [card_id for card_id in card_ids if card_id not in mirrored]
+        query = urlencode({"fields": model_fields(TrelloCard, fields)})
+        results = await self.client.BATCH(
+            [f"/cards/{card_id}?{query}" for card_id in missing]
+        )
+        fetched = {}
+        for card_id, result in zip(missing, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Skipping card {card_id}: {result}")
+                continue
+            fetched[card_id] = TrelloCard(**result)
+        return [
+            mirrored.get(card_id) or fetched[card_id]
+            for card_id in card_ids
+            if card_id in mirrored or card_id in fetched
+        ]
 
     async def create_card(self, **kwargs) -> TrelloCard:
         """Creates a new card in a given list.
@@ -52,7 +154,9 @@ class CardService:
             TrelloCard: The newly created card object.
         """
         response = await self.client.POST("/cards", data=kwargs)
-        return TrelloCard(**response)
+        card = TrelloCard(**response)
+        self._invalidate(card)
+        return card
 
     async def update_card(self, card_id: str, **kwargs) -> TrelloCard:
         """Updates a card's attributes.
@@ -65,7 +169,64 @@ class CardService:
             TrelloCard: The updated card object.
         """
         response = await self.client.PUT(f"/cards/{card_id}", data=kwargs)
-        return TrelloCard(**response)
+        card = TrelloCard(**response)
+        # A move leaves a stale listing behind in the source list, which is unknown here.
+        self._invalidate(card, moved="idList" in kwargs or "idBoard" in kwargs)
+        return card
+
+    async def create_cards(self, cards: List[Dict[str, Any]]) -> List[BulkItemResult]:
+        """Creates several cards concurrently.
+
+        Args:
+            cards (List[Dict[str, Any]]): The attributes of each card to create.
+
+        Returns:
+            List[BulkItemResult]: The created card or the error for each item, in order.
+        """
+        return await run_bounded(cards, lambda data: self.create_card(**data))
+
+    async def update_cards(
+        self, updates: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[BulkItemResult]:
+        """Updates several cards concurrently.
+
+        Args:
+            updates (List[Tuple[str, Dict[str, Any]]]): Pairs of card ID and the
+                attributes to update on that card.
+
+        Returns:
+            List[BulkItemResult]: The updated card or the error for each item, in order.
+        """
+        return await run_bounded(
+            updates, lambda update: self.update_card(update[0], **update[1])
+        )
+
+    async def move_cards(
+        self,
+        card_ids: List[str],
+        list_id: str,
+        board_id: str | None = None,
+        pos: str | None = None,
+    ) -> List[BulkItemResult]:
+        """Moves several cards to a list concurrently.
+
+        Args:
+            card_ids (List[str]): The IDs of the cards to move.
+            list_id (str): The ID of the destination list.
+            board_id (str, optional): The ID of the destination board, when moving across boards.
+            pos (str, optional): The position of the cards in the destination list.
+
+        Returns:
+            List[BulkItemResult]: The moved card or the error for each item, in order.
+        """
+        data = {"idList": list_id}
+        if board_id:
+            data["idBoard"] = board_id
+        if pos:
+            data["pos"] = pos
+        return await run_bounded(
+            card_ids, lambda card_id: self.update_card(card_id, **data)
+        )
 
     async def delete_card(self, card_id: str) -> Dict[str, Any]:
         """Deletes a card.
@@ -76,4 +237,30 @@ class CardService:
         Returns:
             Dict[str, Any]: The response from the delete operation.
         """
-        return await self.client.DELETE(f"/cards/{card_id}")
+        response = await self.client.DELETE(f"/cards/{card_id}")
+        if self.mirror:
+            self.mirror.remove_card(card_id)
+        if self.index:
+            self.index.remove_card(card_id)
+        self.client.invalidate(
+            f"/cards/{card_id}", "/lists/*/cards", "/boards/*/cards", "/boards/*?"
+        )
+        return response
+
+    def _invalidate(self, card: TrelloCard, moved: bool = False):
+        """Evicts cached reads that include the given card and updates the mirror and index."""
+        if self.mirror:
+            self.mirror.upsert_card(card)
+        if self.index:
+            self.index.upsert_card(card)
+        if moved:
+            self.client.invalidate(
+                f"/cards/{card.id}", "/lists/*/cards", "/boards/*/cards", "/boards/*?"
+            )
+        else:
+            self.client.invalidate(
+                f"/cards/{card.id}",
+                f"/lists/{card.idList}/cards",
+                f"/boards/{card.idBoard}/cards",
+                f"/boards/{card.idBoard}?",
+            )
@@ -1,18 +1,39 @@
 import logging
-from typing import Dict, List
+from typing import Any, Dict, List
 
+from server.mirror.store import MirrorStore
+from server.models import BulkItemResult, TrelloCheckItem, TrelloChecklist
+from server.utils.bulk import run_bounded
+from server.utils.fields import model_fields
+from server.utils.search import CardIndex
+from server.utils.tracing import trace_methods
 from server.utils.trello_api import TrelloClient
 
 logger = logging.getLogger(__name__)
 
+# Restrict checklist reads to the fields of the checklist models.
+CHECKLIST_PARAMS = {
+    "fields": model_fields(TrelloChecklist, exclude=["checkItems"]),
+    "checkItems": "all",
+    "checkItem_fields": model_fields(TrelloCheckItem),
+}
 
+
+@trace_methods
 class ChecklistService:
     """
     Service class for handling Trello checklist operations.
     """
 
-    def __init__(self, client: TrelloClient):
+    def __init__(
+        self,
+        client: TrelloClient,
+        mirror: MirrorStore | None = None,
+        index: CardIndex | None = None,
+    ):
         self.client = client
+        self.mirror = mirror
+        self.index = index
 
     async def get_checklist(self, checklist_id: str) -> Dict:
         """
@@ -24,7 +45,11 @@ class ChecklistService:
         Returns:
             Dict: The checklist data
         """
-        return await self.client.GET(f"/checklists/{checklist_id}")
+        if self.mirror and (checklist := self.mirror.checklist(checklist_id)):
+            return checklist.model_dump()
+        return await self.client.GET(
+            f"/checklists/{checklist_id}", params=CHECKLIST_PARAMS, batch=True
+        )
 
     async def get_card_checklists(self, card_id: str) -> List[Dict]:
         """
@@ -36,7 +61,14 @@ class ChecklistService:
         Returns:
             List[Dict]: List of checklists on the card
         """
-        return await self.client.GET(f"/cards/{card_id}/checklists")
+        if (
+            self.mirror
+            and (checklists := self.mirror.card_checklists(card_id)) is not None
+        ):
+            return [checklist.model_dump() for checklist in checklists]
+        return await self.client.GET(
+            f"/cards/{card_id}/checklists", params=CHECKLIST_PARAMS, batch=True
+        )
 
     async def create_checklist(
         self, card_id: str, name: str, pos: str | None = None
@@ -55,7 +87,12 @@ class ChecklistService:
         data = {"name": name}
         if pos:
             data["pos"] = pos
-        return await self.client.POST(f"/checklists", data={"idCard": card_id, **data})
+        response = await self.client.POST(
+            f"/checklists", data={"idCard": card_id, **data}
+        )
+        self._invalidate(response.get("id"), card_id)
+        self._mirror_checklist(response)
+        return response
 
     async def update_checklist(
         self, checklist_id: str, name: str | None = None, pos: str | None = None
@@ -76,7 +113,10 @@ class ChecklistService:
             data["name"] = name
         if pos:
             data["pos"] = pos
-        return await self.client.PUT(f"/checklists/{checklist_id}", data=data)
+        response = await self.client.PUT(f"/checklists/{checklist_id}", data=data)
+        self._invalidate(checklist_id, response.get("idCard"))
+        self._mirror_checklist(response)
+        return response
 
     async def delete_checklist(self, checklist_id: str) -> Dict:
         """
@@ -88,7 +128,13 @@ class ChecklistService:
         Returns:
             Dict: The response from the delete operation
         """
-        return await self.client.DELETE(f"/checklists/{checklist_id}")
+        response = await self.client.DELETE(f"/checklists/{checklist_id}")
+        self._invalidate(checklist_id)
+        if self.mirror:
+            self.mirror.remove_checklist(checklist_id)
+        if self.index:
+            self.index.remove_checklist(checklist_id)
+        return response
 
     async def add_checkitem(
         self,
@@ -112,9 +158,12 @@ class ChecklistService:
         data = {"name": name, "checked": checked}
         if pos:
             data["pos"] = pos
-        return await self.client.POST(
+        response = await self.client.POST(
             f"/checklists/{checklist_id}/checkItems", data=data
         )
+        self._invalidate(checklist_id)
+        self._mirror_checkitem(checklist_id, response)
+        return response
 
     async def update_checkitem(
         self,
@@ -144,9 +193,26 @@ class ChecklistService:
             data["checked"] = checked
         if pos:
             data["pos"] = pos
-        return await self.client.PUT(
+        response = await self.client.PUT(
             f"/checklists/{checklist_id}/checkItems/{checkitem_id}", data=data
         )
+        self._invalidate(checklist_id)
+        self._mirror_checkitem(checklist_id, response)
+        return response
+
+    async def update_checkitems(
+        self, items: List[Dict[str, Any]]
+    ) -> List[BulkItemResult]:
+        """
+        Update several checkitems concurrently.
+
+        Args:
+            items (List[Dict[str, Any]]): The arguments of `update_checkitem` for each item
+
+        Returns:
+            List[BulkItemResult]: The updated checkitem or the error for each item, in order
+        """
+        return await run_bounded(items, lambda item: self.update_checkitem(**item))
 
     async def delete_checkitem(self, checklist_id: str, checkitem_id: str) -> Dict:
         """
@@ -159,6 +225,40 @@ class ChecklistService:
         Returns:
             Dict: The response from the delete operation
         """
-        return await self.client.DELETE(
+        response = await self.client.DELETE(
             f"/checklists/{checklist_id}/checkItems/{checkitem_id}"
         )
+        self._invalidate(checklist_id)
+        if self.mirror:
+            self.mirror.remove_checkitem(checklist_id, checkitem_id)
+        if self.index:
+            self.index.remove_checkitem(checklist_id, checkitem_id)
+        return response
+
+    def _invalidate(self, checklist_id: str | None, card_id: str | None = None):
+        """Evicts cached reads that include the given checklist.
+
+        When the owning card is unknown, checklist listings of all cards are evicted.
+        Board snapshots embed checklists, so they are evicted as well.
+        """
+        self.client.invalidate(
+            f"/checklists/{checklist_id}",
+            f"/cards/{card_id or '*'}/checklists",
+            "/boards/*?",
+        )
+
+    def _mirror_checklist(self, response: Dict):
+        """Writes a checklist returned by a mutation through to the mirror and index."""
+        checklist = TrelloChecklist(**response)
+        if self.mirror:
+            self.mirror.upsert_checklist(checklist)
+        if self.index:
+            self.index.upsert_checklist(checklist)
+
+    def _mirror_checkitem(self, checklist_id: str, response: Dict):
+        """Writes a checkitem returned by a mutation through to the mirror and index."""
+        checkitem = TrelloCheckItem(**{"idChecklist": checklist_id, **response})
+        if self.mirror:
+            self.mirror.upsert_checkitem(checkitem)
+        if self.index:
+            self.index.upsert_checkitem(checkitem)
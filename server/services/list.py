@@ -1,41 +1,65 @@
 from typing import List
 
+from server.mirror.store import MirrorStore
 from server.models import TrelloList
+from server.utils.decode import decode_list
+from server.utils.fields import model_fields
+from server.utils.tracing import trace_methods
 from server.utils.trello_api import TrelloClient
 
 
+@trace_methods
 class ListService:
     """
     Service class for managing Trello lists.
     """
 
-    def __init__(self, client: TrelloClient):
+    def __init__(self, client: TrelloClient, mirror: MirrorStore | None = None):
         self.client = client
+        self.mirror = mirror
 
     # Lists
-    async def get_list(self, list_id: str) -> TrelloList:
+    async def get_list(
+        self, list_id: str, fields: List[str] | None = None
+    ) -> TrelloList:
         """Retrieves a specific list by its ID.
 
         Args:
             list_id (str): The ID of the list to retrieve.
+            fields (List[str], optional): List fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             TrelloList: The list object containing list details.
         """
-        response = await self.client.GET(f"/lists/{list_id}")
+        if self.mirror and (trello_list := self.mirror.list_by_id(list_id)):
+            return trello_list
+        response = await self.client.GET(
+            f"/lists/{list_id}",
+            params={"fields": model_fields(TrelloList, fields)},
+            batch=True,
+        )
         return TrelloList(**response)
 
-    async def get_lists(self, board_id: str) -> List[TrelloList]:
+    async def get_lists(
+        self, board_id: str, fields: List[str] | None = None
+    ) -> List[TrelloList]:
         """Retrieves all lists on a given board.
 
         Args:
             board_id (str): The ID of the board whose lists to retrieve.
+            fields (List[str], optional): List fields to return. Required fields are always included. Defaults to all fields.
 
         Returns:
             List[TrelloList]: A list of list objects.
         """
-        response = await self.client.GET(f"/boards/{board_id}/lists")
-        return [TrelloList(**list_data) for list_data in response]
+        if self.mirror and (lists := self.mirror.board_lists(board_id)) is not None:
+            return lists
+        response = await self.client.GET(
+            f"/boards/{board_id}/lists",
+            params={"fields": model_fields(TrelloList, fields)},
+            raw=True,
+        )
+        return decode_list(TrelloList, response)
 
     async def create_list(
         self, board_id: str, name: str, pos: str = "bottom"
@@ -52,7 +76,9 @@ class ListService:
         """
         data = {"name": name, "idBoard": board_id, "pos": pos}
         response = await self.client.POST("/lists", data=data)
-        return TrelloList(**response)
+        trello_list = TrelloList(**response)
+        self._invalidate(trello_list)
+        return trello_list
 
     async def update_list(self, list_id: str, name: str) -> TrelloList:
         """Updates the name of a list.
@@ -65,7 +91,9 @@ class ListService:
             TrelloList: The updated list object.
         """
         response = await self.client.PUT(f"/lists/{list_id}", data={"name": name})
-        return TrelloList(**response)
+        trello_list = TrelloList(**response)
+        self._invalidate(trello_list)
+        return trello_list
 
     async def delete_list(self, list_id: str) -> TrelloList:
         """Archives a list.
@@ -79,4 +107,18 @@ class ListService:
         response = await self.client.PUT(
             f"/lists/{list_id}/closed", data={"value": "true"}
         )
-        return TrelloList(**response)
+        trello_list = TrelloList(**response)
+        # Archiving a list also hides its cards from board-level card listings.
+        self._invalidate(trello_list)
+        self.client.invalidate(f"/boards/{trello_list.idBoard}/cards")
+        return trello_list
+
+    def _invalidate(self, trello_list: TrelloList):
+        """Evicts cached reads that include the given list and updates the mirror."""
+        if self.mirror:
+            self.mirror.upsert_list(trello_list)
+        self.client.invalidate(
+            f"/lists/{trello_list.id}",
+            f"/boards/{trello_list.idBoard}/lists",
+            f"/boards/{trello_list.idBoard}?",
+        )
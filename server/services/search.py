@@ -0,0 +1,64 @@
+"""
+Service for searching Trello cards in MCP server.
+"""
+
+import logging
+from typing import List
+
+from server.mirror.store import MirrorStore
+from server.models import TrelloCardSearchHit
+from server.services.board import BoardService
+from server.utils.search import CardIndex
+from server.utils.tracing import trace_methods
+from server.utils.trello_api import TrelloClient
+
+logger = logging.getLogger(__name__)
+
+
+@trace_methods
+class SearchService:
+    """
+    Service class for full-text search over the cards of a board.
+    """
+
+    def __init__(
+        self,
+        client: TrelloClient,
+        index: CardIndex,
+        mirror: MirrorStore | None = None,
+    ):
+        self.index = index
+        self.boards = BoardService(client, mirror)
+
+    async def search_cards(
+        self,
+        board_id: str,
+        query: str,
+        limit: int = 10,
+        include_closed: bool = False,
+        refresh: bool = False,
+    ) -> List[TrelloCardSearchHit]:
+        """Searches the cards on a board by name, labels, description and checklist items.
+
+        The board is indexed from a single snapshot on first use and reindexed once
+        the index is older than its TTL; mutations made through this server update
+        it in place. A refresh reads the board from the API, bypassing the board
+        mirror and cached snapshots.
+
+        Args:
+            board_id (str): The ID of the board whose cards to search.
+            query (str): Free-text query. Words are matched case-insensitively, including as prefixes.
+            limit (int): Maximum number of hits to return. Defaults to 10.
+            include_closed (bool): Whether archived cards may be returned. Defaults to False.
+            refresh (bool): Whether to rebuild the board's index before searching. Defaults to False.
+
+        Returns:
+            List[TrelloCardSearchHit]: The best matching cards with their scores, best first.
+        """
+        if refresh or not self.index.fresh(board_id):
+            logger.info(f"Indexing cards of board {board_id} for search")
+            snapshot = await self.boards.get_board_snapshot(
+                board_id, include_closed=True, fresh=refresh
+            )
+            self.index.load_snapshot(snapshot)
+        return self.index.search(board_id, query, limit, include_closed)
@@ -7,27 +7,34 @@ from typing import List
 
 from mcp.server.fastmcp import Context
 
-from server.models import TrelloBoard, TrelloLabel
+from server.models import TrelloBoard, TrelloBoardSnapshot, TrelloLabel
 from server.services.board import BoardService
-from server.trello import client
+from server.trello import tenant
 
 logger = logging.getLogger(__name__)
 
-service = BoardService(client)
 
+def get_service() -> BoardService:
+    """Returns the board service for the Trello credentials of the current call."""
+    current = tenant()
+    return BoardService(current.client, current.mirror)
 
-async def get_board(ctx: Context, board_id: str) -> TrelloBoard:
+
+async def get_board(
+    ctx: Context, board_id: str, fields: List[str] | None = None
+) -> TrelloBoard:
     """Retrieves a specific board by its ID.
 
     Args:
         board_id (str): The ID of the board to retrieve.
+        fields (List[str], optional): Board fields to return, e.g. ["name", "url"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         TrelloBoard: The board object containing board details.
     """
     try:
         logger.info(f"Getting board with ID: {board_id}")
-        result = await service.get_board(board_id)
+        result = await get_service().get_board(board_id, fields)
         logger.info(f"Successfully retrieved board: {board_id}")
         return result
     except Exception as e:
@@ -37,15 +44,20 @@ async def get_board(ctx: Context, board_id: str) -> TrelloBoard:
         raise
 
 
-async def get_boards(ctx: Context) -> List[TrelloBoard]:
+async def get_boards(
+    ctx: Context, fields: List[str] | None = None
+) -> List[TrelloBoard]:
     """Retrieves all boards for the authenticated user.
 
+    Args:
+        fields (List[str], optional): Board fields to return, e.g. ["name", "url"]. Required fields are always included. Defaults to all fields.
+
     Returns:
         List[TrelloBoard]: A list of board objects.
     """
     try:
         logger.info("Getting all boards")
-        result = await service.get_boards()
+        result = await get_service().get_boards(fields=fields)
         logger.info(f"Successfully retrieved {len(result)} boards")
         return result
     except Exception as e:
@@ -55,18 +67,21 @@ async def get_boards(ctx: Context) -> List[TrelloBoard]:
         raise
 
 
-async def get_board_labels(ctx: Context, board_id: str) -> List[TrelloLabel]:
+async def get_board_labels(
+    ctx: Context, board_id: str, fields: List[str] | None = None
+) -> List[TrelloLabel]:
     """Retrieves all labels for a specific board.
 
     Args:
         board_id (str): The ID of the board whose labels to retrieve.
+        fields (List[str], optional): Label fields to return, e.g. ["name"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         List[TrelloLabel]: A list of label objects for the board.
     """
     try:
         logger.info(f"Getting labels for board: {board_id}")
-        result = await service.get_board_labels(board_id)
+        result = await get_service().get_board_labels(board_id, fields)
         logger.info(f"Successfully retrieved {len(result)} labels for board: {board_id}")
         return result
     except Exception as e:
@@ -74,3 +89,40 @@ async def get_board_labels(ctx: Context, board_id: str) -> List[TrelloLabel]:
         logger.error(error_msg)
         await ctx.error(error_msg)
         raise
+
+
+async def get_board_snapshot(
+    ctx: Context,
+    board_id: str,
+    include_closed: bool = False,
+    include_checklists: bool = True,
+    card_fields: List[str] | None = None,
+) -> TrelloBoardSnapshot:
+    """Retrieves a board with all of its lists, cards, labels and checklists in a single call.
+
+    Prefer this over calling get_lists, get_cards and get_card_checklists for every list and card.
+
+    Args:
+        board_id (str): The ID of the board to retrieve.
+        include_closed (bool, optional): Whether to include archived lists and cards. Defaults to False.
+        include_checklists (bool, optional): Whether to include card checklists. Defaults to True.
+        card_fields (List[str], optional): Card fields to return, e.g. ["name", "idList"]. Required fields are always included. Defaults to all fields.
+
+    Returns:
+        TrelloBoardSnapshot: The board together with its lists, cards, labels and checklists.
+    """
+    try:
+        logger.info(f"Getting snapshot of board: {board_id}")
+        result = await get_service().get_board_snapshot(
+            board_id, include_closed, include_checklists, card_fields
+        )
+        logger.info(
+            f"Successfully retrieved snapshot of board {board_id}: "
+            f"{len(result.lists)} lists, {len(result.cards)} cards"
+        )
+        return result
+    except Exception as e:
+        error_msg = f"Failed to get board snapshot: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
@@ -0,0 +1,74 @@
+"""
+This module contains tools for inspecting and clearing the response cache.
+"""
+
+import logging
+from typing import Any, Dict
+
+from mcp.server.fastmcp import Context
+
+from server.trello import state, tenant
+
+logger = logging.getLogger(__name__)
+
+# Statistics about the whole server rather than one client, shown only for the
+# server's own credentials: the shared state and the cache file.
+SERVER_STATS = ("shared",)
+SERVER_CACHE_STATS = ("path", "file_bytes")
+
+
+async def get_cache_stats(ctx: Context) -> Dict[str, Any]:
+    """Retrieves runtime statistics of the response cache and request scheduling.
+
+    Returns:
+        Dict[str, Any]: Cache size, hit ratio and evictions, together with retry,
+        rate limiter, request coalescing, batching, board mirror and search index
+        statistics. Requests with their own credentials only get those of their
+        own client.
+    """
+    try:
+        logger.info("Getting cache statistics")
+        components = state()
+        current = tenant()
+        result = current.client.stats()
+        if current is components.default_tenant:
+            # The mirror holds the server's own boards, not those of other tenants.
+            if components.mirror_sync:
+                result["mirror"] = components.mirror_sync.stats()
+        else:
+            for key in SERVER_STATS:
+                result.pop(key, None)
+            for key in SERVER_CACHE_STATS:
+                result.get("cache", {}).pop(key, None)
+        result["search"] = current.index.stats()
+        return result
+    except Exception as e:
+        error_msg = f"Failed to get cache statistics: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
+
+
+async def clear_cache(ctx: Context, pattern: str | None = None) -> Dict[str, int]:
+    """Clears cached responses, so the next reads fetch fresh data from Trello.
+
+    Args:
+        pattern (str, optional): Endpoint pattern to clear, e.g. "/boards/{board_id}" or "/lists/*/cards", including sub-resources. Defaults to clearing the whole cache.
+
+    Returns:
+        Dict[str, int]: The number of cleared responses.
+    """
+    try:
+        logger.info(f"Clearing cache for: {pattern or 'all entries'}")
+        client = tenant().client
+        if pattern:
+            cleared = client.invalidate(pattern)
+        else:
+            cleared = client.cache.clear() if client.cache else 0
+        logger.info(f"Successfully cleared {cleared} cached responses")
+        return {"cleared": cleared}
+    except Exception as e:
+        error_msg = f"Failed to clear cache: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
@@ -7,29 +7,37 @@ from typing import List
 
 from mcp.server.fastmcp import Context
 
-from server.models import TrelloCard
+from server.models import BulkItemResult, TrelloCard, TrelloCardPage
 from server.services.card import CardService
-from server.trello import client
+from server.trello import tenant
 from server.dtos.update_card import UpdateCardPayload
+from server.dtos.update_cards import CardUpdate
 from server.dtos.create_card import CreateCardPayload
 
 logger = logging.getLogger(__name__)
 
-service = CardService(client)
 
+def get_service() -> CardService:
+    """Returns the card service for the Trello credentials of the current call."""
+    current = tenant()
+    return CardService(current.client, current.mirror, current.index)
 
-async def get_card(ctx: Context, card_id: str) -> TrelloCard:
+
+async def get_card(
+    ctx: Context, card_id: str, fields: List[str] | None = None
+) -> TrelloCard:
     """Retrieves a specific card by its ID.
 
     Args:
         card_id (str): The ID of the card to retrieve.
+        fields (List[str], optional): Card fields to return, e.g. ["name", "due"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         TrelloCard: The card object containing card details.
     """
     try:
         logger.info(f"Getting card with ID: {card_id}")
-        result = await service.get_card(card_id)
+        result = await get_service().get_card(card_id, fields)
         logger.info(f"Successfully retrieved card: {card_id}")
         return result
     except Exception as e:
@@ -39,18 +47,21 @@ async def get_card(ctx: Context, card_id: str) -> TrelloCard:
         raise
 
 
-async def get_cards(ctx: Context, list_id: str) -> List[TrelloCard]:
+async def get_cards(
+    ctx: Context, list_id: str, fields: List[str] | None = None
+) -> List[TrelloCard]:
     """Retrieves all cards in a given list.
 
     Args:
         list_id (str): The ID of the list whose cards to retrieve.
+        fields (List[str], optional): Card fields to return, e.g. ["name", "due"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         List[TrelloCard]: A list of card objects.
     """
     try:
         logger.info(f"Getting cards for list: {list_id}")
-        result = await service.get_cards(list_id)
+        result = await get_service().get_cards(list_id, fields)
         logger.info(f"Successfully retrieved {len(result)} cards for list: {list_id}")
         return result
     except Exception as e:
@@ -60,6 +71,67 @@ async def get_cards(ctx: Context, list_id: str) -> List[TrelloCard]:
         raise
 
 
+async def get_board_cards(
+    ctx: Context,
+    board_id: str,
+    limit: int = 100,
+    cursor: str | None = None,
+    fields: List[str] | None = None,
+) -> TrelloCardPage:
+    """Retrieves one page of the open cards on a board, newest first.
+
+    Use this instead of get_cards on every list for large boards. Pass the returned
+    next_cursor to fetch the following page; it is null after the last page.
+
+    Args:
+        board_id (str): The ID of the board whose cards to retrieve.
+        limit (int, optional): Maximum number of cards to return, at most 1000. Defaults to 100.
+        cursor (str, optional): The next_cursor of the previous page.
+        fields (List[str], optional): Card fields to return, e.g. ["name", "idList"]. Required fields are always included. Defaults to all fields.
+
+    Returns:
+        TrelloCardPage: The cards and the cursor for the next page.
+    """
+    try:
+        logger.info(f"Getting page of cards for board: {board_id} (cursor: {cursor})")
+        result = await get_service().get_board_cards_page(
+            board_id, limit, cursor, fields
+        )
+        logger.info(
+            f"Successfully retrieved {len(result.cards)} cards for board: {board_id}"
+        )
+        return result
+    except Exception as e:
+        error_msg = f"Failed to get board cards: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
+
+
+async def get_cards_by_ids(
+    ctx: Context, card_ids: List[str], fields: List[str] | None = None
+) -> List[TrelloCard]:
+    """Retrieves several cards by their IDs in as few requests as possible.
+
+    Args:
+        card_ids (List[str]): The IDs of the cards to retrieve.
+        fields (List[str], optional): Card fields to return, e.g. ["name", "due"]. Required fields are always included. Defaults to all fields.
+
+    Returns:
+        List[TrelloCard]: The retrieved cards. Cards that could not be found are omitted.
+    """
+    try:
+        logger.info(f"Getting {len(card_ids)} cards by ID")
+        result = await get_service().get_cards_by_ids(card_ids, fields)
+        logger.info(f"Successfully retrieved {len(result)} of {len(card_ids)} cards")
+        return result
+    except Exception as e:
+        error_msg = f"Failed to get cards by IDs: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
+
+
 async def create_card(ctx: Context, payload: CreateCardPayload) -> TrelloCard:
     """Creates a new card in a given list.
 
@@ -73,7 +145,9 @@ async def create_card(ctx: Context, payload: CreateCardPayload) -> TrelloCard:
     """
     try:
         logger.info(f"Creating card in list {payload.idList} with name: {payload.name}")
-        result = await service.create_card(**payload.model_dump(exclude_unset=True))
+        result = await get_service().create_card(
+            **payload.model_dump(exclude_unset=True)
+        )
         logger.info(f"Successfully created card in list: {payload.idList}")
         return result
     except Exception as e:
@@ -97,7 +171,7 @@ async def update_card(
     """
     try:
         logger.info(f"Updating card: {card_id} with payload: {payload}")
-        result = await service.update_card(
+        result = await get_service().update_card(
             card_id, **payload.model_dump(exclude_unset=True)
         )
         logger.info(f"Successfully updated card: {card_id}")
@@ -120,7 +194,7 @@ async def delete_card(ctx: Context, card_id: str) -> dict:
     """
     try:
         logger.info(f"Deleting card: {card_id}")
-        result = await service.delete_card(card_id)
+        result = await get_service().delete_card(card_id)
         logger.info(f"Successfully deleted card: {card_id}")
         return result
     except Exception as e:
@@ -128,3 +202,90 @@ async def delete_card(ctx: Context, card_id: str) -> dict:
         logger.error(error_msg)
         await ctx.error(error_msg)
         raise
+
+
+async def create_cards(
+    ctx: Context, payloads: List[CreateCardPayload]
+) -> List[BulkItemResult]:
+    """Creates several cards at once.
+
+    Args:
+        payloads (List[CreateCardPayload]): The cards to create.
+
+    Returns:
+        List[BulkItemResult]: For each payload, in order, the created card or the error.
+    """
+    try:
+        logger.info(f"Creating {len(payloads)} cards")
+        result = await get_service().create_cards(
+            [payload.model_dump(exclude_unset=True) for payload in payloads]
+        )
+        logger.info(
+            f"Successfully created {sum(item.ok for item in result)} of {len(payloads)} cards"
+        )
+        return result
+    except Exception as e:
+        error_msg = f"Failed to create cards: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
+
+
+async def update_cards(ctx: Context, updates: List[CardUpdate]) -> List[BulkItemResult]:
+    """Updates several cards at once.
+
+    Args:
+        updates (List[CardUpdate]): The card IDs and the attributes to update on each card.
+
+    Returns:
+        List[BulkItemResult]: For each update, in order, the updated card or the error.
+    """
+    try:
+        logger.info(f"Updating {len(updates)} cards")
+        result = await get_service().update_cards(
+            [
+                (update.card_id, update.payload.model_dump(exclude_unset=True))
+                for update in updates
+            ]
+        )
+        logger.info(
+            f"Successfully updated {sum(item.ok for item in result)} of {len(updates)} cards"
+        )
+        return result
+    except Exception as e:
+        error_msg = f"Failed to update cards: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
+
+
+async def move_cards(
+    ctx: Context,
+    card_ids: List[str],
+    list_id: str,
+    board_id: str | None = None,
+    pos: str | None = None,
+) -> List[BulkItemResult]:
+    """Moves several cards to a list at once.
+
+    Args:
+        card_ids (List[str]): The IDs of the cards to move.
+        list_id (str): The ID of the destination list.
+        board_id (str, optional): The ID of the destination board, when moving across boards.
+        pos (str, optional): The position of the cards in the destination list ("top", "bottom" or a number).
+
+    Returns:
+        List[BulkItemResult]: For each card, in order, the moved card or the error.
+    """
+    try:
+        logger.info(f"Moving {len(card_ids)} cards to list: {list_id}")
+        result = await get_service().move_cards(card_ids, list_id, board_id, pos)
+        logger.info(
+            f"Successfully moved {sum(item.ok for item in result)} of {len(card_ids)} cards to list: {list_id}"
+        )
+        return result
+    except Exception as e:
+        error_msg = f"Failed to move cards: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
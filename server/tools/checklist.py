@@ -5,11 +5,18 @@ This module contains tools for managing Trello checklists.
 import logging
 from typing import Dict, List
 
+from server.dtos.update_checkitem import UpdateCheckItemPayload
+from server.models import BulkItemResult
 from server.services.checklist import ChecklistService
-from server.trello import client
+from server.trello import tenant
 
 logger = logging.getLogger(__name__)
-service = ChecklistService(client)
+
+
+def get_service() -> ChecklistService:
+    """Returns the checklist service for the Trello credentials of the current call."""
+    current = tenant()
+    return ChecklistService(current.client, current.mirror, current.index)
 
 
 async def get_checklist(checklist_id: str) -> Dict:
@@ -22,7 +29,7 @@ async def get_checklist(checklist_id: str) -> Dict:
     Returns:
         Dict: The checklist data
     """
-    return await service.get_checklist(checklist_id)
+    return await get_service().get_checklist(checklist_id)
 
 
 async def get_card_checklists(card_id: str) -> List[Dict]:
@@ -35,7 +42,7 @@ async def get_card_checklists(card_id: str) -> List[Dict]:
     Returns:
         List[Dict]: List of checklists on the card
     """
-    return await service.get_card_checklists(card_id)
+    return await get_service().get_card_checklists(card_id)
 
 
 async def create_checklist(card_id: str, name: str, pos: str | None = None) -> Dict:
@@ -50,7 +57,7 @@ async def create_checklist(card_id: str, name: str, pos: str | None = None) -> D
     Returns:
         Dict: The created checklist data
     """
-    return await service.create_checklist(card_id, name, pos)
+    return await get_service().create_checklist(card_id, name, pos)
 
 
 async def update_checklist(
@@ -67,7 +74,7 @@ async def update_checklist(
     Returns:
         Dict: The updated checklist data
     """
-    return await service.update_checklist(checklist_id, name, pos)
+    return await get_service().update_checklist(checklist_id, name, pos)
 
 
 async def delete_checklist(checklist_id: str) -> Dict:
@@ -80,7 +87,7 @@ async def delete_checklist(checklist_id: str) -> Dict:
     Returns:
         Dict: The response from the delete operation
     """
-    return await service.delete_checklist(checklist_id)
+    return await get_service().delete_checklist(checklist_id)
 
 
 async def add_checkitem(
@@ -98,7 +105,7 @@ async def add_checkitem(
     Returns:
         Dict: The created checkitem data
     """
-    return await service.add_checkitem(checklist_id, name, checked, pos)
+    return await get_service().add_checkitem(checklist_id, name, checked, pos)
 
 
 async def update_checkitem(
@@ -121,11 +128,28 @@ async def update_checkitem(
     Returns:
         Dict: The updated checkitem data
     """
-    return await service.update_checkitem(
+    return await get_service().update_checkitem(
         checklist_id, checkitem_id, name, checked, pos
     )
 
 
+async def update_checkitems(
+    items: List[UpdateCheckItemPayload],
+) -> List[BulkItemResult]:
+    """
+    Update several checkitems at once, e.g. to tick off many items.
+
+    Args:
+        items (List[UpdateCheckItemPayload]): The checkitems to update and their new values
+
+    Returns:
+        List[BulkItemResult]: For each item, in order, the updated checkitem or the error
+    """
+    return await get_service().update_checkitems(
+        [item.model_dump(exclude_unset=True) for item in items]
+    )
+
+
 async def delete_checkitem(checklist_id: str, checkitem_id: str) -> Dict:
     """
     Delete a checkitem from a checklist.
@@ -137,4 +161,4 @@ async def delete_checkitem(checklist_id: str, checkitem_id: str) -> Dict:
     Returns:
         Dict: The response from the delete operation
     """
-    return await service.delete_checkitem(checklist_id, checkitem_id)
+    return await get_service().delete_checkitem(checklist_id, checkitem_id)
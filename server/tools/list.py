@@ -9,26 +9,33 @@ from mcp.server.fastmcp import Context
 
 from server.models import TrelloList
 from server.services.list import ListService
-from server.trello import client
+from server.trello import tenant
 
 logger = logging.getLogger(__name__)
 
-service = ListService(client)
+
+def get_service() -> ListService:
+    """Returns the list service for the Trello credentials of the current call."""
+    current = tenant()
+    return ListService(current.client, current.mirror)
 
 
 # List Tools
-async def get_list(ctx: Context, list_id: str) -> TrelloList:
+async def get_list(
+    ctx: Context, list_id: str, fields: List[str] | None = None
+) -> TrelloList:
     """Retrieves a specific list by its ID.
 
     Args:
         list_id (str): The ID of the list to retrieve.
+        fields (List[str], optional): List fields to return, e.g. ["name", "pos"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         TrelloList: The list object containing list details.
     """
     try:
         logger.info(f"Getting list with ID: {list_id}")
-        result = await service.get_list(list_id)
+        result = await get_service().get_list(list_id, fields)
         logger.info(f"Successfully retrieved list: {list_id}")
         return result
     except Exception as e:
@@ -38,18 +45,21 @@ async def get_list(ctx: Context, list_id: str) -> TrelloList:
         raise
 
 
-async def get_lists(ctx: Context, board_id: str) -> List[TrelloList]:
+async def get_lists(
+    ctx: Context, board_id: str, fields: List[str] | None = None
+) -> List[TrelloList]:
     """Retrieves all lists on a given board.
 
     Args:
         board_id (str): The ID of the board whose lists to retrieve.
+        fields (List[str], optional): List fields to return, e.g. ["name", "pos"]. Required fields are always included. Defaults to all fields.
 
     Returns:
         List[TrelloList]: A list of list objects.
     """
     try:
         logger.info(f"Getting lists for board: {board_id}")
-        result = await service.get_lists(board_id)
+        result = await get_service().get_lists(board_id, fields)
         logger.info(f"Successfully retrieved {len(result)} lists for board: {board_id}")
         return result
     except Exception as e:
@@ -74,7 +84,7 @@ async def create_list(
     """
     try:
         logger.info(f"Creating list '{name}' in board: {board_id}")
-        result = await service.create_list(board_id, name, pos)
+        result = await get_service().create_list(board_id, name, pos)
         logger.info(f"Successfully created list '{name}' in board: {board_id}")
         return result
     except Exception as e:
@@ -96,7 +106,7 @@ async def update_list(ctx: Context, list_id: str, name: str) -> TrelloList:
     """
     try:
         logger.info(f"Updating list {list_id} with new name: {name}")
-        result = await service.update_list(list_id, name)
+        result = await get_service().update_list(list_id, name)
         logger.info(f"Successfully updated list: {list_id}")
         return result
     except Exception as e:
@@ -117,7 +127,7 @@ async def delete_list(ctx: Context, list_id: str) -> TrelloList:
     """
     try:
         logger.info(f"Archiving list: {list_id}")
-        result = await service.delete_list(list_id)
+        result = await get_service().delete_list(list_id)
         logger.info(f"Successfully archived list: {list_id}")
         return result
     except Exception as e:
@@ -0,0 +1,56 @@
+"""
+This module contains tools for searching Trello cards.
+"""
+
+import logging
+from typing import List
+
+from mcp.server.fastmcp import Context
+
+from server.models import TrelloCardSearchHit
+from server.services.search import SearchService
+from server.trello import tenant
+
+logger = logging.getLogger(__name__)
+
+
+def get_service() -> SearchService:
+    """Returns the search service for the Trello credentials of the current call."""
+    current = tenant()
+    return SearchService(current.client, current.index, current.mirror)
+
+
+async def search_cards(
+    ctx: Context,
+    board_id: str,
+    query: str,
+    limit: int = 10,
+    include_closed: bool = False,
+    refresh: bool = False,
+) -> List[TrelloCardSearchHit]:
+    """Searches the cards on a board by name, labels, description and checklist items.
+
+    Use this instead of listing every list's cards to find cards by their content.
+
+    Args:
+        board_id (str): The ID of the board whose cards to search.
+        query (str): Free-text query, e.g. "login bug". Words are matched case-insensitively, including as prefixes.
+        limit (int): Maximum number of hits to return. Defaults to 10.
+        include_closed (bool): Whether archived cards may be returned. Defaults to False.
+        refresh (bool): Whether to rebuild the board's index before searching, to pick up changes made outside this server. Defaults to False.
+
+    Returns:
+        List[TrelloCardSearchHit]: The best matching cards, best first, with their relevance score and the fields that matched.
+    """
+    try:
+        logger.info(f"Searching cards on board {board_id} for: {query}")
+        result = await get_service().search_cards(
+            board_id, query, limit, include_closed, refresh
+        )
+        logger.info(f"Found {len(result)} cards on board {board_id} for: {query}")
+        return result
+    except Exception as e:
+        error_msg = f"Failed to search cards: {str(e)}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise
@@ -2,36 +2,76 @@
 This module contains tools for managing Trello boards, lists, and cards.
 """
 
-from server.tools import board, card, checklist, list
+from server.tools import board, cache, card, checklist, list, search
+from server.trello import state
+from server.utils.metrics import instrument_tool
+from server.utils.render import output_format, with_rendering
+from server.utils.retry import RetryPolicy, with_deadline
+from server.utils.tenants import with_tenant
+from server.utils.tracing import trace_tool
 
 
 def register_tools(mcp):
     """Register tools with the MCP server."""
+
+    fmt = output_format()
+    deadline = RetryPolicy.from_env().deadline
+
+    def tenants():
+        components = state()
+        return components.tenant_pool, components.default_tenant
+
+    def add_tool(fn):
+        # Every tool call uses the client for its request's Trello credentials,
+        # every Trello request and retry made by one call shares a deadline,
+        # every result is rendered in the configured output format, and every
+        # call is traced, counted and timed for the metrics.
+        fn = with_tenant(fn, tenants)
+        mcp.add_tool(
+            instrument_tool(
+                trace_tool(with_rendering(with_deadline(fn, deadline), fmt))
+            )
+        )
+
     # Board Tools
-    mcp.add_tool(board.get_board)
-    mcp.add_tool(board.get_boards)
-    mcp.add_tool(board.get_board_labels)
+    add_tool(board.get_board)
+    add_tool(board.get_boards)
+    add_tool(board.get_board_labels)
+    add_tool(board.get_board_snapshot)
 
     # List Tools
-    mcp.add_tool(list.get_list)
-    mcp.add_tool(list.get_lists)
-    mcp.add_tool(list.create_list)
-    mcp.add_tool(list.update_list)
-    mcp.add_tool(list.delete_list)
+    add_tool(list.get_list)
+    add_tool(list.get_lists)
+    add_tool(list.create_list)
+    add_tool(list.update_list)
+    add_tool(list.delete_list)
 
     # Card Tools
-    mcp.add_tool(card.get_card)
-    mcp.add_tool(card.get_cards)
-    mcp.add_tool(card.create_card)
-    mcp.add_tool(card.update_card)
-    mcp.add_tool(card.delete_card)
+    add_tool(card.get_card)
+    add_tool(card.get_cards)
+    add_tool(card.get_board_cards)
+    add_tool(card.get_cards_by_ids)
+    add_tool(card.create_card)
+    add_tool(card.update_card)
+    add_tool(card.delete_card)
+    add_tool(card.create_cards)
+    add_tool(card.update_cards)
+    add_tool(card.move_cards)
+
+    # Search Tools
+    add_tool(search.search_cards)
 
     # Checklist Tools
-    mcp.add_tool(checklist.get_checklist)
-    mcp.add_tool(checklist.get_card_checklists)
-    mcp.add_tool(checklist.create_checklist)
-    mcp.add_tool(checklist.update_checklist)
-    mcp.add_tool(checklist.delete_checklist)
-    mcp.add_tool(checklist.add_checkitem)
-    mcp.add_tool(checklist.update_checkitem)
-    mcp.add_tool(checklist.delete_checkitem)
+    add_tool(checklist.get_checklist)
+    add_tool(checklist.get_card_checklists)
+    add_tool(checklist.create_checklist)
+    add_tool(checklist.update_checklist)
+    add_tool(checklist.delete_checklist)
+    add_tool(checklist.add_checkitem)
+    add_tool(checklist.update_checkitem)
+    add_tool(checklist.update_checkitems)
+    add_tool(checklist.delete_checkitem)
+
+    # Cache Tools
+    add_tool(cache.get_cache_stats)
+    add_tool(cache.clear_cache)
@@ -1,9 +1,29 @@
 import logging
 import os
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from dotenv import load_dotenv
 
+from server.mirror.poller import ActionPoller
+from server.mirror.store import MirrorConfig, MirrorStore
+from server.mirror.sync import MirrorSync
+from server.utils.batch import BatchConfig
+from server.utils.cache import CacheConfig
+from server.utils.env import env_bool, env_float
+from server.utils.metrics import client_collector, registry, tenant_collector
+from server.utils.rate_limit import RateLimitConfig
+from server.utils.retry import RetryPolicy
+from server.utils.search import CardIndex
+from server.utils.shared import SharedConfig, SharedState
+from server.utils.tenants import (
+    ClientPool,
+    Tenant,
+    TenantConfig,
+    current_tenant,
+    tenant_id,
+)
 from server.utils.trello_api import TrelloClient
+from server.utils.transport import TransportConfig
 
 # Configure logging
 logging.basicConfig(
@@ -15,19 +35,177 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-# Initialize Trello client and service
-try:
-    api_key = os.getenv("TRELLO_API_KEY")
-    token = os.getenv("TRELLO_TOKEN")
-    if not api_key or not token:
-        raise ValueError(
-            "TRELLO_API_KEY and TRELLO_TOKEN must be set in environment variables"
+class TrelloState:
+    """
+    The Trello client of the server and the components built around it.
+
+    Created on first use by `state()` rather than at import, so that starting
+    the server, e.g. when a desktop client spawns it in Claude app mode, does
+    not wait for clients, caches and stores that are not needed yet.
+
+    Attributes:
+        client (TrelloClient): The client using `TRELLO_API_KEY` and `TRELLO_TOKEN`.
+        cache_config (CacheConfig): The response cache settings of every client.
+        shared_config (SharedConfig): The worker settings.
+        shared_state (SharedState | None): State shared with other worker processes.
+        mirror_config (MirrorConfig): The board mirror settings.
+        mirror (MirrorStore | None): The board mirror, if enabled.
+        mirror_sync (MirrorSync | None): Keeps the mirror current, if enabled.
+        search_index (CardIndex): The card search index of the server's client.
+        default_tenant (Tenant): The tenant of the server's own credentials.
+        tenant_config (TenantConfig): The per-request credentials settings.
+        tenant_pool (ClientPool | None): Clients for request credentials, if enabled.
+    """
+
+    client: TrelloClient
+    cache_config: CacheConfig
+    shared_config: SharedConfig
+    shared_state: SharedState | None
+    mirror_config: MirrorConfig
+    mirror: MirrorStore | None
+    mirror_sync: MirrorSync | None
+    search_index: CardIndex
+    default_tenant: Tenant
+    tenant_config: TenantConfig
+    tenant_pool: ClientPool | None
+
+    def __init__(self):
+        api_key = os.getenv("TRELLO_API_KEY")
+        token = os.getenv("TRELLO_TOKEN")
+        if not api_key or not token:
+            raise ValueError(
+                "TRELLO_API_KEY and TRELLO_TOKEN must be set in environment variables"
+            )
+        self.shared_config = SharedConfig.from_env()
+        self.shared_state = (
+            self.shared_config.build() if self.shared_config.enabled else None
+        )
+        # Each worker serves its own metrics; a label tells them apart.
+        registry.per_worker = self.shared_state is not None
+        self.cache_config = CacheConfig.from_env()
+        if self.shared_state and self.cache_config.backend == "memory":
+            # Workers share cached responses through the SQLite cache file.
+            logger.info("Using the sqlite cache backend to share it between workers")
+            self.cache_config.backend = "sqlite"
+
+        # The server's own entries get a namespace too, so that clearing or
+        # counting them leaves those of request credentials alone.
+        default_id = tenant_id(api_key, token)
+        self.client = self.build_client(api_key, token, namespace=default_id)
+        registry.add_collector(client_collector(self.client))
+        self.mirror_config = MirrorConfig.from_env()
+        if (
+            self.shared_state
+            and self.mirror_config.enabled
+            and not self.mirror_config.db_path
+        ):
+            # Workers share the mirror, which one of them syncs, through its file.
+            self.mirror_config.db_path = os.path.join(
+                os.path.dirname(self.shared_state.path), "mirror.db"
+            )
+            logger.info(
+                f"Sharing the board mirror between workers in {self.mirror_config.db_path}"
+            )
+        self.mirror = (
+            MirrorStore.from_config(self.mirror_config)
+            if self.mirror_config.enabled
+            else None
+        )
+        self.mirror_sync = (
+            MirrorSync(self.client, self.mirror, self.mirror_config, self.shared_state)
+            if self.mirror
+            else None
+        )
+        # Without webhooks, the mirror is kept current from the actions feed.
+        if self.mirror_sync and not self.mirror_config.webhooks:
+            if self.mirror_config.callback_url:
+                logger.warning(
+                    "TRELLO_API_SECRET is not set, so webhook deliveries cannot be "
+                    "authenticated; polling the actions feed instead"
+                )
+            self.mirror_sync.poller = ActionPoller(self.mirror_sync)
+        self.search_index = CardIndex(ttl=env_float("TRELLO_SEARCH_TTL", 300.0))
+        self.default_tenant = Tenant(
+            default_id, self.client, self.search_index, self.mirror
+        )
+
+        self.tenant_config = TenantConfig.from_env()
+        self.tenant_pool = (
+            ClientPool(self.build_tenant, self.tenant_config)
+            if self.tenant_config.enabled
+            else None
+        )
+        if self.tenant_pool:
+            registry.add_collector(tenant_collector(self.tenant_pool))
+
+    def build_client(
+        self, api_key: str, token: str, namespace: str = ""
+    ) -> TrelloClient:
+        """Creates a client for a set of credentials, configured from the environment."""
+        return TrelloClient(
+            api_key=api_key,
+            token=token,
+            config=TransportConfig.from_env(),
+            rate_limit=RateLimitConfig.from_env(),
+            retry_policy=RetryPolicy.from_env(),
+            cache=self.cache_config.model_copy(update={"namespace": namespace}),
+            coalesce=env_bool("TRELLO_COALESCE_GETS", True),
+            batch=BatchConfig.from_env(),
+            shared=self.shared_state,
         )
-    client = TrelloClient(api_key=api_key, token=token)
-    logger.info("Trello client and service initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Trello client: {str(e)}")
-    raise
+
+    def build_tenant(self, api_key: str, token: str) -> Tenant:
+        """Creates a tenant for request credentials, without the board mirror."""
+        key = tenant_id(api_key, token)
+        return Tenant(
+            key,
+            self.build_client(api_key, token, namespace=key),
+            CardIndex(ttl=env_float("TRELLO_SEARCH_TTL", 300.0)),
+        )
+
+
+_state: TrelloState | None = None
+
+
+def state() -> TrelloState:
+    """Returns the Trello client and its components, creating them on first use."""
+    global _state
+    if _state is None:
+        try:
+            _state = TrelloState()
+            logger.info("Trello client and service initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Trello client: {str(e)}")
+            raise
+    return _state
+
+
+def __getattr__(name: str):
+    # Components such as `client` are module attributes created on first access.
+    if not name.startswith("_") and name in TrelloState.__annotations__:
+        return getattr(state(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def tenant() -> Tenant:
+    """Returns the tenant serving the current tool call, by default the server's own."""
+    return current_tenant() or state().default_tenant
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Holds the shared Trello connection pool open for the lifetime of `app`.
+
+    Usable both as a FastMCP lifespan (one per MCP session) and as a Starlette
+    lifespan (one per server process); the pool is drained once all exit.
+    Mirrored boards are kept in sync in the background for the same lifetime.
+    """
+    components = state()
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(components.client.session())
+        if components.mirror_sync:
+            await stack.enter_async_context(components.mirror_sync.running())
+        yield
 
 
 # Add a prompt for common Trello operations
@@ -38,6 +216,7 @@ def trello_help() -> str:
     1. Board Operations:
        - Get a specific board
        - List all boards
+       - Get a snapshot of a board with all lists, cards, labels and checklists
     2. List Operations:
        - Get a specific list
        - List all lists in a board
@@ -46,10 +225,14 @@ def trello_help() -> str:
        - Archive a list
     3. Card Operations:
        - Get a specific card
+       - Get several cards by their IDs
        - List all cards in a list
+       - Page through all cards on a board
        - Create a new card
        - Update a card's attributes
        - Delete a card
+       - Create, update or move many cards at once
+       - Search cards on a board by name, labels, description and checklist items
     4. Checklist Operations:
        - Get a specific checklist
        - List all checklists in a card
@@ -58,5 +241,9 @@ def trello_help() -> str:
        - Delete a checklist
        - Add checkitem to checklist
        - Update checkitem
+       - Update many checkitems at once
        - Delete checkitem
+    5. Cache Operations:
+       - Get cache and request statistics
+       - Clear cached responses
     """
@@ -0,0 +1,125 @@
+"""
+Automatic batching of independent GET requests into Trello `/batch` calls.
+
+Reads submitted within a short window are grouped into a single `/batch`
+request of up to ten routes, so that several entity reads issued by one agent
+turn cost one round trip instead of one each.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from pydantic import BaseModel
+
+from server.utils.env import env_bool, env_float
+
+logger = logging.getLogger(__name__)
+
+# Trello accepts at most ten routes per /batch request.
+MAX_BATCH_SIZE = 10
+
+
+class BatchConfig(BaseModel):
+    """
+    Settings for automatic request batching.
+
+    Attributes:
+        enabled (bool): Whether batchable GETs are aggregated into `/batch` calls.
+        window (float): Seconds to wait for more requests before sending a batch.
+    """
+
+    enabled: bool = True
+    window: float = 0.005
+
+    @classmethod
+    def from_env(cls) -> "BatchConfig":
+        """Builds a batching configuration from `TRELLO_BATCH_*` environment variables.
+
+        Returns:
+            BatchConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            enabled=env_bool("TRELLO_BATCH_ENABLED", defaults.enabled),
+            window=env_float("TRELLO_BATCH_WINDOW_MS", defaults.window * 1000) / 1000,
+        )
+
+
+class BatchDispatcher:
+    """
+    Collects routes submitted within a window and sends them as one batch.
+
+    `send` receives up to `MAX_BATCH_SIZE` distinct routes and returns one result
+    per route, in order; results that are exceptions are raised to the callers
+    that submitted that route.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[str]], Awaitable[List[Any]]],
+        window: float = 0.005,
+    ):
+        self.send = send
+        self.window = window
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.batches = 0
+        self.routes = 0
+
+    async def submit(self, route: str) -> Any:
+        """Queues a route for the next batch and waits for its result.
+
+        Args:
+            route (str): The API route including its query string, e.g. `/cards/{id}`.
+
+        Returns:
+            Any: The decoded response body for the route.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((route, future))
+        if len(self._pending) >= MAX_BATCH_SIZE:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:MAX_BATCH_SIZE]
+            self._pending = self._pending[MAX_BATCH_SIZE:]
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        routes = list(dict.fromkeys(route for route, _ in batch))
+        self.batches += 1
+        self.routes += len(batch)
+        try:
+            results = dict(zip(routes, await self.send(routes)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for route, future in batch:
+            if future.done():
+                continue
+            result = results.get(route)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Returns how many batches were sent and how many routes they carried."""
+        return {
+            "batches": self.batches,
+            "routes": self.routes,
+            "avg_batch_size": (
+                round(self.routes / self.batches, 2) if self.batches else 0.0
+            ),
+        }
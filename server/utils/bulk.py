@@ -0,0 +1,48 @@
+"""
+Bounded-concurrency execution for bulk operations.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Sequence
+
+from server.models import BulkItemResult
+from server.utils.env import env_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_CONCURRENCY = 5
+
+
+async def run_bounded(
+    items: Sequence[Any],
+    fn: Callable[[Any], Awaitable[Any]],
+    concurrency: int | None = None,
+) -> List[BulkItemResult]:
+    """Applies `fn` to every item with at most `concurrency` calls in flight.
+
+    Failures do not stop the remaining items; each item reports its own outcome.
+    Requests still pass through the client's rate limiter, so the semaphore only
+    bounds how many items wait on it at once.
+
+    Args:
+        items (Sequence[Any]): The items to process.
+        fn (Callable[[Any], Awaitable[Any]]): The operation to apply to each item.
+        concurrency (int, optional): Maximum concurrent operations. Defaults to
+            `TRELLO_BULK_CONCURRENCY` or 5.
+
+    Returns:
+        List[BulkItemResult]: One result per item, in input order.
+    """
+    limit = concurrency or env_int("TRELLO_BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(index: int, item: Any) -> BulkItemResult:
+        async with semaphore:
+            try:
+                return BulkItemResult(index=index, ok=True, result=await fn(item))
+            except Exception as e:
+                logger.error(f"Bulk item {index} failed: {str(e)}")
+                return BulkItemResult(index=index, ok=False, error=str(e))
+
+    return await asyncio.gather(*(run(i, item) for i, item in enumerate(items)))
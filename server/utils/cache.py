@@ -0,0 +1,687 @@
+"""
+Read-through response cache for Trello GET requests.
+
+Responses are stored per endpoint and query parameters with a TTL chosen by
+resource type (boards, lists, cards, ...); responses embedding nested resources
+use the shortest TTL among them. Entries whose response carried an
+`ETag` or `Last-Modified` validator are kept after expiry so they can be
+revalidated with a conditional request instead of being refetched.
+
+Responses are kept in process memory by default, or in a SQLite file that
+survives restarts, so a freshly spawned server starts with a warm cache.
+
+Services invalidate affected entries after mutations using endpoint patterns,
+where `*` matches one path segment, e.g. `/lists/*/cards`. A pattern ending in
+`?` matches only the resource itself (with any query), not its sub-resources,
+e.g. `/boards/{id}?` for nested board snapshots.
+"""
+
+import abc
+import logging
+import os
+import re
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict
+from urllib.parse import urlencode
+
+from pydantic import BaseModel
+
+from server.utils.env import env_bool, env_float, env_int, env_str
+from server.utils.fastjson import dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    "members": 300.0,
+    "boards": 300.0,
+    "labels": 300.0,
+    "lists": 120.0,
+    "cards": 30.0,
+    "checklists": 30.0,
+}
+
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "trello-mcp", "cache.db")
+
+# Query parameters that nest resources of the same name into a response, e.g.
+# `/boards/{id}?cards=open`.
+NESTED_RESOURCES = ("lists", "cards", "checklists", "labels", "members")
+
+
+class CacheConfig(BaseModel):
+    """
+    Settings for the response cache.
+
+    Attributes:
+        enabled (bool): Whether GET responses are cached.
+        max_entries (int): Maximum number of cached responses before LRU eviction.
+        default_ttl (float): TTL in seconds for resources without a specific TTL.
+        ttls (Dict[str, float]): TTL in seconds per resource type.
+        backend (str): Where responses are stored: "memory" or "sqlite".
+        path (str): Path of the SQLite cache file for the "sqlite" backend.
+        max_bytes (int): Maximum compressed size of the SQLite cache before LRU eviction.
+        namespace (str): Prefix isolating the entries of one set of credentials in a
+            SQLite cache file shared with others.
+    """
+
+    enabled: bool = True
+    max_entries: int = 1024
+    default_ttl: float = 30.0
+    ttls: Dict[str, float] = DEFAULT_TTLS
+    backend: str = "memory"
+    path: str = DEFAULT_CACHE_PATH
+    max_bytes: int = 64 * 1024 * 1024
+    namespace: str = ""
+
+    @classmethod
+    def from_env(cls) -> "CacheConfig":
+        """Builds a cache configuration from `TRELLO_CACHE_*` environment variables.
+
+        Per-resource TTLs are read from `TRELLO_CACHE_TTL_<RESOURCE>`, e.g.
+        `TRELLO_CACHE_TTL_CARDS`.
+
+        Returns:
+            CacheConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            enabled=env_bool("TRELLO_CACHE_ENABLED", defaults.enabled),
+            max_entries=env_int("TRELLO_CACHE_MAX_ENTRIES", defaults.max_entries),
+            default_ttl=env_float("TRELLO_CACHE_TTL", defaults.default_ttl),
+            ttls={
+                resource: env_float(f"TRELLO_CACHE_TTL_{resource.upper()}", ttl)
+                for resource, ttl in defaults.ttls.items()
+            },
+            backend=env_str("TRELLO_CACHE_BACKEND", defaults.backend).lower(),
+            path=env_str("TRELLO_CACHE_PATH", defaults.path),
+            max_bytes=env_int("TRELLO_CACHE_MAX_BYTES", defaults.max_bytes),
+        )
+
+    def build_store(self) -> "CacheStore":
+        """Creates the storage backend selected by `backend`."""
+        if self.backend == "sqlite":
+            return SQLiteStore(
+                os.path.expanduser(self.path),
+                self.max_entries,
+                self.max_bytes,
+                self.namespace,
+            )
+        if self.backend != "memory":
+            raise ValueError(f"Unknown cache backend: {self.backend}")
+        return MemoryStore(self.max_entries)
+
+
+class CacheEntry:
+    """
+    A cached response body, its expiry time and its revalidation validators.
+
+    The body is either decoded JSON or the raw JSON bytes of the response.
+    """
+
+    __slots__ = ("value", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Returns the headers that make a GET conditional on this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheStore(abc.ABC):
+    """
+    Storage backend interface for the response cache.
+    """
+
+    evictions = 0
+
+    @abc.abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Returns the entry stored under `key`, if any."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry, generation: int | None = None) -> bool:
+        """Stores `entry` under `key`, evicting entries beyond the store's bounds.
+
+        With a `generation`, the entry is only stored if no invalidation happened
+        since `generation()` returned it, checked atomically with the write.
+        Returns whether the entry was stored.
+        """
+
+    @abc.abstractmethod
+    def generation(self) -> int:
+        """Returns the number of invalidations, bumped by `delete_matching` and `clear`."""
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Deletes the entry stored under `key`, if any."""
+
+    @abc.abstractmethod
+    def delete_matching(self, pattern: re.Pattern) -> int:
+        """Deletes all entries whose key matches `pattern`, returning the count."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Deletes all entries."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Returns the number of stored entries."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns backend-specific counters."""
+        return {"backend": "memory"}
+
+
+class MemoryStore(CacheStore):
+    """
+    In-process LRU store bounded by entry count.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.evictions = 0
+        self._generation = 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry, generation: int | None = None) -> bool:
+        if generation is not None and generation != self._generation:
+            return False
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def generation(self) -> int:
+        return self._generation
+
+    def delete(self, key: str):
+        self.entries.pop(key, None)
+
+    def delete_matching(self, pattern: re.Pattern) -> int:
+        self._generation += 1
+        keys = [key for key in self.entries if pattern.match(key)]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+
+    def clear(self):
+        self._generation += 1
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class SQLiteStore(CacheStore):
+    """
+    Persistent LRU store in a SQLite database, bounded by entry count and size.
+
+    Bodies are stored as zlib-compressed JSON and read back as raw JSON bytes,
+    which the client parses or validates directly. Expiry times are kept as
+    wall-clock times on disk, so entries stay valid across restarts, and are
+    translated to and from the monotonic clock used by `CacheEntry`. The
+    database runs in WAL mode so several server processes can share it. Stores
+    with a namespace prefix their keys with it, so several clients can share
+    the file without seeing, counting or clearing each other's entries; the
+    size caps apply to the whole file. Each namespace's invalidation counter is
+    kept in the file too, so a response fetched in one process is not stored
+    after another process invalidated it.
+    """
+
+    # Expired entries are purged every this many writes.
+    PURGE_EVERY = 256
+    # Reads record the access time at most this often per entry (seconds), so
+    # that hits do not each turn into a write; LRU order is kept to this grain.
+    TOUCH_INTERVAL = 60.0
+
+    # Seconds a statement waits for another process's write transaction before
+    # failing with "database is locked", which callers treat as a miss or a
+    # dropped write. Every millisecond waited stalls the event loop.
+    BUSY_TIMEOUT = 0.01
+
+    # Invalidations cannot be dropped without serving stale responses, so they
+    # wait longer for the write lock.
+    INVALIDATE_TIMEOUT = 1.0
+
+    def __init__(
+        self, path: str, max_entries: int, max_bytes: int, namespace: str = ""
+    ):
+        self.path = path
+        self.prefix = f"{namespace}:" if namespace else ""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.purged = 0
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Workers starting together create the schema, so wait longer until then.
+        self.db = sqlite3.connect(path, isolation_level=None, timeout=10.0)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, etag TEXT, last_modified TEXT, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS cache_entries_accessed_at "
+            "ON cache_entries (accessed_at)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache_generations ("
+            "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+        self.db.create_function(
+            "regexp", 2, lambda pattern, key: re.match(pattern, key) is not None
+        )
+        self.purge()
+        self._busy_timeout(self.BUSY_TIMEOUT)
+
+    def _busy_timeout(self, seconds: float):
+        self.db.execute(f"PRAGMA busy_timeout = {int(seconds * 1000)}")
+
+    @contextmanager
+    def _transaction(self, wait: float | None = None):
+        """Runs the enclosed statements in one write transaction.
+
+        Args:
+            wait (float | None): Seconds to wait for the write lock instead of
+                `BUSY_TIMEOUT`.
+        """
+        if wait is None:
+            self.db.execute("BEGIN IMMEDIATE")
+        else:
+            self._busy_timeout(wait)
+            try:
+                self.db.execute("BEGIN IMMEDIATE")
+            finally:
+                self._busy_timeout(self.BUSY_TIMEOUT)
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    @staticmethod
+    def _offset() -> float:
+        """Returns the difference between the wall clock and the monotonic clock."""
+        return time.time() - time.monotonic()
+
+    def get(self, key: str) -> CacheEntry | None:
+        row = self.db.execute(
+            "SELECT value, expires_at, etag, last_modified, accessed_at "
+            "FROM cache_entries WHERE key = ?",
+            (self.prefix + key,),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at, etag, last_modified, accessed_at = row
+        now = time.time()
+        if now - accessed_at >= self.TOUCH_INTERVAL:
+            try:
+                self.db.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                    (now, self.prefix + key),
+                )
+            except sqlite3.OperationalError:
+                # Another process is writing; the access is recorded next time.
+                pass
+        return CacheEntry(
+            zlib.decompress(value),
+            expires_at - self._offset(),
+            etag,
+            last_modified,
+        )
+
+    def set(self, key: str, entry: CacheEntry, generation: int | None = None) -> bool:
+        body = entry.value
+        value = zlib.compress(body if isinstance(body, bytes) else dumps(body))
+        with self._transaction():
+            if generation is not None and generation != self.generation():
+                return False
+            self.db.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, value, size, expires_at, etag, last_modified, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.prefix + key,
+                    value,
+                    len(value),
+                    entry.expires_at + self._offset(),
+                    entry.etag,
+                    entry.last_modified,
+                    time.time(),
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self.purge()
+            self._evict()
+        return True
+
+    def generation(self) -> int:
+        row = self.db.execute(
+            "SELECT generation FROM cache_generations WHERE namespace = ?",
+            (self.prefix,),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_generation(self):
+        self.db.execute(
+            "INSERT INTO cache_generations (namespace, generation) VALUES (?, 1) "
+            "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1",
+            (self.prefix,),
+        )
+
+    def _evict(self):
+        """Evicts least recently used entries until both caps are met."""
+        count, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        while count > self.max_entries or size > self.max_bytes:
+            rows = self.db.execute(
+                "SELECT key, size FROM cache_entries ORDER BY accessed_at LIMIT ?",
+                (max(count - self.max_entries, 1),),
+            ).fetchall()
+            if not rows:
+                break
+            self.db.executemany(
+                "DELETE FROM cache_entries WHERE key = ?", [(key,) for key, _ in rows]
+            )
+            self.evictions += len(rows)
+            count -= len(rows)
+            size -= sum(row_size for _, row_size in rows)
+
+    def purge(self) -> int:
+        """Deletes expired entries that have no validators to revalidate them with."""
+        removed = self.db.execute(
+            "DELETE FROM cache_entries WHERE expires_at < ? "
+            "AND etag IS NULL AND last_modified IS NULL",
+            (time.time(),),
+        ).rowcount
+        self.purged += removed
+        return removed
+
+    def delete(self, key: str):
+        self.db.execute("DELETE FROM cache_entries WHERE key = ?", (self.prefix + key,))
+
+    def delete_matching(self, pattern: re.Pattern) -> int:
+        with self._transaction(self.INVALIDATE_TIMEOUT):
+            self._bump_generation()
+            return self.db.execute(
+                "DELETE FROM cache_entries WHERE key REGEXP ?",
+                (re.escape(self.prefix) + pattern.pattern,),
+            ).rowcount
+
+    # Selects the entries of the store's namespace; all entries without one.
+    _OWN = "substr(key, 1, ?) = ?"
+
+    def _own(self) -> tuple:
+        return (len(self.prefix), self.prefix)
+
+    def clear(self):
+        with self._transaction(self.INVALIDATE_TIMEOUT):
+            self._bump_generation()
+            self.db.execute(f"DELETE FROM cache_entries WHERE {self._OWN}", self._own())
+
+    def __len__(self) -> int:
+        return self.db.execute(
+            f"SELECT COUNT(*) FROM cache_entries WHERE {self._OWN}", self._own()
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        own, total = self.db.execute(
+            f"SELECT COALESCE(SUM(CASE WHEN {self._OWN} THEN size END), 0), "
+            "COALESCE(SUM(size), 0) FROM cache_entries",
+            self._own(),
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "bytes": own,
+            "file_bytes": total,
+            "max_bytes": self.max_bytes,
+            "purged": self.purged,
+        }
+
+
+def cache_key(endpoint: str, params: dict | None = None) -> str:
+    """Builds a cache key from an endpoint and its query parameters."""
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+def resource_of(endpoint: str) -> str:
+    """Returns the resource type of an endpoint, e.g. "lists" for `/boards/{id}/lists`."""
+    segments = endpoint.strip("/").split("/")
+    return segments[-1] if len(segments) % 2 else segments[-2]
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compiles an endpoint pattern into a regex matching it and any sub-resource or query."""
+    suffix = r"(?:[/?]|$)"
+    if pattern.endswith("?"):
+        pattern, suffix = pattern[:-1], r"(?:\?|$)"
+    segments = [
+        "[^/?]+" if segment == "*" else re.escape(segment)
+        for segment in pattern.strip("/").split("/")
+    ]
+    return re.compile("/" + "/".join(segments) + suffix)
+
+
+class ResponseCache:
+    """
+    Caches GET responses with per-resource TTLs and pattern-based invalidation.
+    """
+
+    def __init__(self, config: CacheConfig, store: CacheStore | None = None):
+        self.config = config
+        self.store = store or config.build_store()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    def _failed(self, operation: str, error: Exception):
+        """Records a failure of the store, which callers then treat as a miss."""
+        self.errors += 1
+        logger.warning(
+            f"Response cache {operation} failed, bypassing the cache: {error!r}"
+        )
+
+    @property
+    def generation(self) -> int:
+        """Counts invalidations, in every process sharing the store.
+
+        Read before a request and passed to `set`, so that a response racing
+        with a mutation's invalidation is not stored. -1 if the store failed,
+        which no store generation matches.
+        """
+        try:
+            return self.store.generation()
+        except Exception as e:
+            self._failed("read", e)
+            return -1
+
+    def ttl_for(self, endpoint: str, params: dict | None = None) -> float:
+        """Returns the TTL in seconds of a response.
+
+        Responses nesting other resources, e.g. `/boards/{id}?cards=open`, use
+        the shortest TTL among them, so embedded cards expire like cards.
+        """
+        resources = [resource_of(endpoint)]
+        if params:
+            resources.extend(
+                resource
+                for resource in NESTED_RESOURCES
+                if str(params.get(resource, "none")).lower() not in ("none", "false")
+            )
+        return min(
+            self.config.ttls.get(resource, self.config.default_ttl)
+            for resource in resources
+        )
+
+    def lookup(self, endpoint: str, params: dict | None = None) -> CacheEntry | None:
+        """Returns the cache entry for a request, fresh or awaiting revalidation.
+
+        Expired entries without validators are dropped and reported as a miss,
+        as are entries the store fails to read.
+        """
+        key = cache_key(endpoint, params)
+        try:
+            entry = self.store.get(key)
+        except Exception as e:
+            self._failed("read", e)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.fresh(time.monotonic()):
+            self.hits += 1
+            return entry
+        self.expirations += 1
+        self.misses += 1
+        if not entry.revalidatable():
+            try:
+                self.store.delete(key)
+            except Exception as e:
+                self._failed("delete", e)
+            return None
+        self.revalidations += 1
+        return entry
+
+    def get(self, endpoint: str, params: dict | None = None) -> Any | None:
+        """Returns the cached body for a request, or None on a miss or expired entry."""
+        entry = self.lookup(endpoint, params)
+        if entry is None or not entry.fresh(time.monotonic()):
+            return None
+        return entry.value
+
+    def set(
+        self,
+        endpoint: str,
+        params: dict | None,
+        value: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        generation: int | None = None,
+    ) -> bool:
+        """Stores a response body and its validators for a request.
+
+        With a `generation`, the response is dropped if the cache was invalidated
+        after `generation` was read. Returns whether it was stored; responses the
+        store fails to write are dropped too.
+        """
+        ttl = self.ttl_for(endpoint, params)
+        if ttl <= 0:
+            return False
+        try:
+            return self.store.set(
+                cache_key(endpoint, params),
+                CacheEntry(value, time.monotonic() + ttl, etag, last_modified),
+                generation,
+            )
+        except Exception as e:
+            self._failed("write", e)
+            return False
+
+    def revalidated(self, endpoint: str, params: dict | None, entry: CacheEntry):
+        """Renews an entry after the server confirmed it is unchanged (304)."""
+        self.not_modified += 1
+        entry.expires_at = time.monotonic() + self.ttl_for(endpoint, params)
+        try:
+            self.store.set(cache_key(endpoint, params), entry)
+        except Exception as e:
+            self._failed("write", e)
+
+    def invalidate(self, *patterns: str) -> int:
+        """Evicts cached responses for the given endpoint patterns.
+
+        Args:
+            *patterns (str): Endpoints to evict, including their sub-resources and
+                query variants. A `*` segment matches any single path segment.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        removed = 0
+        for pattern in patterns:
+            try:
+                removed += self.store.delete_matching(compile_pattern(pattern))
+            except Exception as e:
+                self.errors += 1
+                logger.error(
+                    f"Failed to invalidate cached responses for {pattern}, they may "
+                    f"be served stale until they expire: {e!r}"
+                )
+        if removed:
+            self.invalidations += removed
+            logger.debug(f"Invalidated {removed} cached responses for {patterns}")
+        return removed
+
+    def clear(self) -> int:
+        """Removes every cached response, returning how many were removed."""
+        removed = len(self.store)
+        self.store.clear()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit, miss and eviction counters for the cache.
+
+        Returns:
+            Dict[str, Any]: Cache counters, current size and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.store.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+            **self.store.stats(),
+        }
@@ -0,0 +1,82 @@
+"""
+Decoding of Trello responses into models.
+
+Two modes are available, selected with `TRELLO_DECODE_MODE`:
+
+- `validate`: validates each item separately, e.g. `TrelloCard(**card)`.
+- `adapter`: validates a whole list in one call with a cached `TypeAdapter`,
+  which runs entirely in pydantic-core. Same checks as `validate`; the default.
+
+Both functions also accept the raw JSON bytes returned by `GET(..., raw=True)`,
+which they hand straight to pydantic-core, skipping the intermediate tree of
+dicts.
+"""
+
+import functools
+from typing import Any, Dict, List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+from server.utils.env import env_str
+from server.utils.tracing import span
+
+DECODE_MODES = ("validate", "adapter")
+DEFAULT_DECODE_MODE = "adapter"
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def decode_mode() -> str:
+    """Returns the decode mode selected by `TRELLO_DECODE_MODE`."""
+    mode = env_str("TRELLO_DECODE_MODE", DEFAULT_DECODE_MODE).lower()
+    if mode not in DECODE_MODES:
+        raise ValueError(f"TRELLO_DECODE_MODE must be one of {', '.join(DECODE_MODES)}")
+    return mode
+
+
+@functools.lru_cache(maxsize=None)
+def list_adapter(model: Type[Model]) -> TypeAdapter:
+    """Returns the cached adapter validating a list of `model`."""
+    return TypeAdapter(List[model])
+
+
+def decode(
+    model: Type[Model], data: Dict[str, Any] | bytes, mode: str | None = None
+) -> Model:
+    """Decodes one response object into `model`.
+
+    Args:
+        model (Type[Model]): The model to decode into.
+        data (Dict[str, Any] | bytes): The decoded JSON object, or its raw JSON bytes.
+        mode (str, optional): The decode mode. Defaults to `TRELLO_DECODE_MODE`.
+
+    Returns:
+        Model: The decoded model.
+    """
+    mode = mode or decode_mode()
+    with span(f"decode {model.__name__}", {"decode.mode": mode}):
+        if isinstance(data, bytes):
+            return model.model_validate_json(data)
+        return model.model_validate(data)
+
+
+def decode_list(
+    model: Type[Model], data: List[Dict[str, Any]] | bytes, mode: str | None = None
+) -> List[Model]:
+    """Decodes a response list into models of one type.
+
+    Args:
+        model (Type[Model]): The model to decode each item into.
+        data (List[Dict[str, Any]] | bytes): The decoded JSON array, or its raw JSON bytes.
+        mode (str, optional): The decode mode. Defaults to `TRELLO_DECODE_MODE`.
+
+    Returns:
+        List[Model]: The decoded models, in order.
+    """
+    mode = mode or decode_mode()
+    with span(f"decode List[{model.__name__}]", {"decode.mode": mode}):
+        if isinstance(data, bytes):
+            return list_adapter(model).validate_json(data)
+        if mode == "adapter":
+            return list_adapter(model).validate_python(data)
+        return [model(**item) for item in data]
@@ -0,0 +1,31 @@
+"""
+Helpers for reading typed configuration values from environment variables.
+"""
+
+import os
+
+
+def env_str(name: str, default: str | None = None) -> str | None:
+    """Reads a string environment variable, treating empty values as unset."""
+    value = os.getenv(name)
+    return value if value else default
+
+
+def env_int(name: str, default: int) -> int:
+    """Reads an integer environment variable."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Reads a float environment variable."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Reads a boolean environment variable ("true"/"false", "1"/"0", "yes"/"no")."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("true", "1", "yes", "on")
@@ -0,0 +1,56 @@
+"""
+JSON parsing and serialization of Trello response bodies.
+
+Uses `orjson` when it is installed (the `fast` extra), which parses the raw
+response bytes directly instead of decoding them to text first, and falls back
+to the standard library otherwise. Set `TRELLO_FAST_JSON=false` to always use
+the standard library.
+"""
+
+import functools
+import json
+import logging
+from typing import Any
+
+from server.utils.env import env_bool
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """Returns the `orjson` module, or None to use the standard library.
+
+    Resolved on first use rather than at import, so that `TRELLO_FAST_JSON`
+    may be set in `.env`, which is only loaded once the server modules are
+    imported.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    if not env_bool("TRELLO_FAST_JSON", True):
+        logger.info("TRELLO_FAST_JSON is disabled, using the standard json module")
+        return None
+    return orjson
+
+
+def backend() -> str:
+    """Returns the name of the JSON library in use, "orjson" or "json"."""
+    return "orjson" if _orjson() is not None else "json"
+
+
+def loads(content: bytes | str) -> Any:
+    """Parses a JSON document from raw bytes or text."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(value: Any) -> bytes:
+    """Serializes a value to compact JSON bytes."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
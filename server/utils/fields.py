@@ -0,0 +1,50 @@
+"""
+Helpers for building Trello `fields=` query parameters from Pydantic models.
+
+Requesting only the fields a model uses keeps response bytes, JSON decoding
+and validation proportional to what the server actually returns to clients.
+"""
+
+from typing import Iterable, Type
+
+from pydantic import BaseModel
+
+
+def model_fields(
+    model: Type[BaseModel],
+    requested: Iterable[str] | None = None,
+    exclude: Iterable[str] = (),
+) -> str:
+    """Returns the comma-separated Trello fields needed to populate a model.
+
+    The `id` field is always returned by Trello and is therefore omitted.
+
+    Args:
+        model (Type[BaseModel]): The model the response is parsed into.
+        requested (Iterable[str], optional): Fields requested by the caller. Required
+            model fields are always added. Defaults to all model fields.
+        exclude (Iterable[str]): Model fields that are not Trello fields, such as
+            nested resources requested through their own query parameter.
+
+    Returns:
+        str: The value for a `fields`-style query parameter.
+
+    Raises:
+        ValueError: If a requested field is not a field of the model.
+    """
+    skip = {"id", *exclude}
+    available = [name for name in model.model_fields if name not in skip]
+    if requested is None:
+        return ",".join(available)
+    requested = set(requested) - {"id"}
+    unknown = requested - set(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields {sorted(unknown)} for {model.__name__}, "
+            f"expected any of {available}"
+        )
+    return ",".join(
+        name
+        for name in available
+        if name in requested or model.model_fields[name].is_required()
+    )
@@ -0,0 +1,379 @@
+"""
+Prometheus metrics for the server, exposed at `/metrics` in SSE mode.
+
+Implements the counters, gauges and histograms needed here and renders them
+in the Prometheus text exposition format, without a client library. Metrics
+are recorded centrally: tool calls by `instrument_tool`, which wraps every
+registered tool, and Trello requests by `TrelloClient`. Values kept by the
+client's own layers (cache, rate limiter, single-flight, batching, retries)
+are read from `TrelloClient.stats()` when the metrics are scraped.
+"""
+
+import abc
+import functools
+import math
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from server.utils.env import env_bool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# A sample of a metric family: its name suffix, labels and value.
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def metrics_enabled() -> bool:
+    """Returns whether `/metrics` is served, per `TRELLO_METRICS_ENABLED`."""
+    return env_bool("TRELLO_METRICS_ENABLED", True)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Metric(abc.ABC):
+    """
+    A metric family with a fixed set of label names.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self) -> List[Sample]:
+        """Returns the samples of the metric family."""
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing value per label set.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        return [
+            ("", dict(zip(self.labelnames, key)), value)
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    """
+    A value per label set that can go up and down.
+    """
+
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        self.values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """
+    Observations counted into cumulative buckets per label set.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket, then the sum and total count.
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for key, state in self.values.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append(
+                    ("_bucket", {**labels, "le": _format_value(bound)}, cumulative)
+                )
+            samples.append(("_bucket", {**labels, "le": "+Inf"}, state[-1]))
+            samples.append(("_sum", labels, state[-2]))
+            samples.append(("_count", labels, state[-1]))
+        return samples
+
+
+class Registry:
+    """
+    The metrics of the process, and collectors computing more at scrape time.
+
+    A collector is a function returning metric families, typically gauges and
+    counters filled from a component's `stats()`.
+
+    Attributes:
+        per_worker (bool): Whether samples get a `worker` label with the process
+            ID, set when several worker processes each serve their own metrics.
+    """
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], Iterable[Metric]]] = []
+        self.per_worker = False
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]):
+        self.collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        metrics = list(self.metrics)
+        for collector in self.collectors:
+            metrics.extend(collector())
+        return metrics
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        # Read at scrape time, since the registry may be set up before forking.
+        worker = {"worker": str(os.getpid())} if self.per_worker else {}
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                labels = {**labels, **worker}
+                lines.append(
+                    f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+TOOL_CALLS = registry.register(
+    Counter("trello_mcp_tool_calls_total", "Tool calls by outcome.", ["tool", "status"])
+)
+TOOL_DURATION = registry.register(
+    Histogram("trello_mcp_tool_duration_seconds", "Duration of tool calls.", ["tool"])
+)
+TOOL_IN_FLIGHT = registry.register(
+    Gauge("trello_mcp_tool_in_flight", "Tool calls in progress.", ["tool"])
+)
+UPSTREAM_REQUESTS = registry.register(
+    Counter(
+        "trello_mcp_upstream_requests_total",
+        "Trello API requests by endpoint template and status code.",
+        ["method", "endpoint", "status"],
+    )
+)
+UPSTREAM_DURATION = registry.register(
+    Histogram(
+        "trello_mcp_upstream_duration_seconds",
+        "Duration of Trello API requests by endpoint template.",
+        ["method", "endpoint"],
+    )
+)
+UPSTREAM_IN_FLIGHT = registry.register(
+    Gauge("trello_mcp_upstream_in_flight", "Trello API requests in progress.")
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replaces the IDs in an endpoint with `{id}`, e.g. `/cards/{id}/checklists`.
+
+    Trello paths alternate resource names and IDs, so every second segment is
+    an ID (or a token, which must not leak into labels either).
+    """
+    segments = endpoint.split("?", 1)[0].strip("/").split("/")
+    return "/" + "/".join(
+        "{id}" if i % 2 else segment for i, segment in enumerate(segments)
+    )
+
+
+def observe_request(method: str, endpoint: str, status: str, seconds: float):
+    """Records one Trello API request attempt."""
+    template = endpoint_template(endpoint)
+    UPSTREAM_REQUESTS.inc(method=method, endpoint=template, status=status)
+    UPSTREAM_DURATION.observe(seconds, method=method, endpoint=template)
+
+
+def instrument_tool(fn):
+    """Wraps an async tool function to count its calls and time them."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        TOOL_IN_FLIGHT.inc(tool=name)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await fn(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            TOOL_IN_FLIGHT.dec(tool=name)
+            TOOL_DURATION.observe(time.perf_counter() - started, tool=name)
+            TOOL_CALLS.inc(tool=name, status=status)
+
+    return wrapper
+
+
+def _stat_metrics(
+    prefix: str, stats: Dict, counters: Dict[str, str], gauges: Dict[str, str]
+) -> List[Metric]:
+    """Builds counters and gauges from the numeric entries of a `stats()` dict."""
+    metrics = []
+    for key, documentation in counters.items():
+        if key in stats:
+            metric = Counter(f"{prefix}_{key}_total", documentation)
+            metric.inc(stats[key])
+            metrics.append(metric)
+    for key, documentation in gauges.items():
+        if key in stats:
+            metric = Gauge(f"{prefix}_{key}", documentation)
+            metric.set(stats[key])
+            metrics.append(metric)
+    return metrics
+
+
+def client_collector(client) -> Callable[[], List[Metric]]:
+    """Returns a collector exposing the scheduling layers of a `TrelloClient`."""
+
+    def collect() -> List[Metric]:
+        stats = client.stats()
+        metrics = _stat_metrics(
+            "trello_mcp_retry",
+            stats["retries"],
+            {
+                "retries": "Retried Trello requests.",
+                "exhausted": "Requests that ran out of retries.",
+            },
+            {},
+        )
+        if "cache" in stats:
+            metrics += _stat_metrics(
+                "trello_mcp_cache",
+                stats["cache"],
+                {
+                    "hits": "Response cache hits.",
+                    "misses": "Response cache misses.",
+                    "evictions": "Responses evicted from the cache.",
+                    "invalidations": "Responses invalidated by mutations.",
+                    "not_modified": "Expired responses revalidated with a 304.",
+                },
+                {
+                    "entries": "Responses in the cache.",
+                    "hit_ratio": "Fraction of cache lookups that were hits.",
+                },
+            )
+        if "rate_limiter" in stats:
+            metrics += _stat_metrics(
+                "trello_mcp_rate_limiter",
+                stats["rate_limiter"],
+                {"delayed": "Requests delayed by the rate limiter."},
+                {"queue_depth": "Requests waiting for the rate limiter."},
+            )
+        if "single_flight" in stats:
+            metrics += _stat_metrics(
+                "trello_mcp_single_flight",
+                stats["single_flight"],
+                {"coalesced": "Reads that shared an identical in-flight request."},
+                {},
+            )
+        if "batch" in stats:
+            metrics += _stat_metrics(
+                "trello_mcp_batch",
+                stats["batch"],
+                {
+                    "batches": "Batches dispatched, including lone reads sent directly.",
+                    "routes": "Reads dispatched in batches.",
+                },
+                {},
+            )
+        return metrics
+
+    return collect
+
+
+def tenant_collector(pool) -> Callable[[], List[Metric]]:
+    """Returns a collector exposing the size and churn of a tenant `ClientPool`."""
+
+    def collect() -> List[Metric]:
+        return _stat_metrics(
+            "trello_mcp_tenant",
+            pool.stats(),
+            {
+                "created": "Tenant clients created for request credentials.",
+                "evictions": "Tenant clients evicted from the pool.",
+            },
+            {"clients": "Tenant clients in the pool."},
+        )
+
+    return collect
+
+
+async def metrics_endpoint(request):
+    """Serves the metrics to a Prometheus scrape."""
+    # Imported on use: the client records metrics in every mode, but only the
+    # HTTP transports serve them.
+    from starlette.responses import Response
+
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+def routes() -> list:
+    """Returns the Starlette routes serving `/metrics`."""
+    from starlette.routing import Route
+
+    return [Route("/metrics", metrics_endpoint, methods=["GET"])]
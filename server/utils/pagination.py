@@ -0,0 +1,55 @@
+"""
+Cursor-based pagination over Trello collection endpoints.
+
+Endpoints such as `/boards/{id}/cards` and `/boards/{id}/actions` return at most
+1000 items, newest first, and accept a `before` cursor (an item ID or date) to
+continue from the oldest item of the previous page.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+
+from server.utils.trello_api import TrelloClient
+
+MAX_PAGE_SIZE = 1000
+
+
+async def paginate(
+    client: TrelloClient,
+    endpoint: str,
+    params: dict | None = None,
+    page_size: int = MAX_PAGE_SIZE,
+    before: str | None = None,
+    cache: bool = True,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yields successive pages of a collection using Trello's `before` cursor.
+
+    Args:
+        client (TrelloClient): The client used to fetch the pages.
+        endpoint (str): The collection endpoint, e.g. `/boards/{id}/cards`.
+        params (dict, optional): Additional query parameters for every page.
+        page_size (int): Items per page, at most 1000.
+        before (str, optional): Cursor to start from. Defaults to the newest item.
+        cache (bool): Whether pages may be served from or stored in the response cache.
+
+    Yields:
+        List[Dict[str, Any]]: The raw items of each page, newest first.
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    cursor = before
+    while True:
+        page_params = {**(params or {}), "limit": page_size}
+        if cursor:
+            page_params["before"] = cursor
+        page = await client.GET(endpoint, params=page_params, cache=cache)
+        if page:
+            yield page
+        cursor = next_cursor(page, page_size)
+        if cursor is None:
+            return
+
+
+def next_cursor(page: List[Dict[str, Any]], page_size: int) -> str | None:
+    """Returns the cursor for the page after `page`, or None if it was the last one."""
+    if len(page) < page_size:
+        return None
+    return page[-1]["id"]
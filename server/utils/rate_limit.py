@@ -0,0 +1,241 @@
+"""
+Client-side rate limiting for the Trello API.
+
+Trello enforces separate request budgets per API key and per token. Each budget
+is modelled as a token bucket; a `RateLimiter` admits a request only when both
+buckets have capacity, queueing callers in FIFO order until they do.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict, Mapping
+
+from pydantic import BaseModel
+
+from server.utils.env import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Buckets are shared by every client using the same credential, so that several
+# clients for one API key draw from a single key budget.
+_buckets: "weakref.WeakValueDictionary[tuple, TokenBucket]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class RateLimitConfig(BaseModel):
+    """
+    Request budgets enforced by the client-side rate limiter.
+
+    Attributes:
+        enabled (bool): Whether requests are scheduled through the rate limiter.
+        key_max (int): Requests allowed per interval for the API key.
+        token_max (int): Requests allowed per interval for the token.
+        interval (float): Length of the budget window in seconds.
+    """
+
+    enabled: bool = True
+    key_max: int = 300
+    token_max: int = 100
+    interval: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimitConfig":
+        """Builds a rate limit configuration from `TRELLO_RATE_LIMIT_*` environment variables.
+
+        Returns:
+            RateLimitConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            enabled=env_bool("TRELLO_RATE_LIMIT_ENABLED", defaults.enabled),
+            key_max=env_int("TRELLO_RATE_LIMIT_KEY_MAX", defaults.key_max),
+            token_max=env_int("TRELLO_RATE_LIMIT_TOKEN_MAX", defaults.token_max),
+            interval=env_float("TRELLO_RATE_LIMIT_INTERVAL", defaults.interval),
+        )
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `capacity / interval` tokens per second.
+    """
+
+    def __init__(self, capacity: int, interval: float):
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.interval
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Returns the seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+    def drain(self):
+        """Empties the bucket, e.g. after the server rejected a request with 429."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0.0)
+
+    def calibrate(
+        self,
+        remaining: int | None = None,
+        capacity: int | None = None,
+        interval: float | None = None,
+    ):
+        """Aligns the bucket with the budget reported by the server.
+
+        Args:
+            remaining (int, optional): Requests the server says are left in the window.
+            capacity (int, optional): Requests the server allows per window.
+            interval (float, optional): Length of the server's window in seconds.
+        """
+        self._refill(time.monotonic())
+        if capacity:
+            self.capacity = capacity
+        if interval:
+            self.interval = interval
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+        self.tokens = min(self.tokens, float(self.capacity))
+
+
+def shared_bucket(
+    scope: str, identity: str, capacity: int, interval: float
+) -> TokenBucket:
+    """Returns the bucket for a credential, creating it on first use.
+
+    Args:
+        scope (str): The budget the bucket tracks, "api-key" or "api-token".
+        identity (str): The credential value the budget belongs to.
+        capacity (int): Requests allowed per interval.
+        interval (float): Length of the budget window in seconds.
+
+    Returns:
+        TokenBucket: The bucket shared by all clients using this credential.
+    """
+    bucket = _buckets.get((scope, identity))
+    if bucket is None:
+        bucket = TokenBucket(capacity, interval)
+        _buckets[(scope, identity)] = bucket
+    return bucket
+
+
+class RateLimiter:
+    """
+    Admits requests when every bucket has capacity, queueing the rest in FIFO order.
+    """
+
+    def __init__(self, buckets: Dict[str, TokenBucket]):
+        self.buckets = buckets
+        # asyncio.Lock wakes waiters in arrival order, which gives fair queueing.
+        self._lock = asyncio.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def for_credentials(
+        cls, api_key: str, token: str, config: RateLimitConfig
+    ) -> "RateLimiter":
+        """Creates a limiter tracking both the API key and the token budgets."""
+        return cls(
+            {
+                "api-key": shared_bucket(
+                    "api-key", api_key, config.key_max, config.interval
+                ),
+                "api-token": shared_bucket(
+                    "api-token", token, config.token_max, config.interval
+                ),
+            }
+        )
+
+    def _reserve(self, now: float) -> float:
+        """Takes a token from every bucket if all have one, else returns the seconds to wait."""
+        delay = max(bucket.delay(now) for bucket in self.buckets.values())
+        if delay <= 0:
+            for bucket in self.buckets.values():
+                bucket.consume()
+        return delay
+
+    async def acquire(self):
+        """Waits until a request may be sent and reserves a slot in every bucket."""
+        start = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._reserve(time.monotonic())
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - start
+        self.admitted += 1
+        if waited > 0.001:
+            self.delayed += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            logger.debug(f"Rate limiter delayed request by {waited:.3f}s")
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Calibrates the buckets from Trello's `x-rate-limit-*` response headers."""
+        for scope, bucket in self.buckets.items():
+            prefix = f"x-rate-limit-{scope}"
+            remaining = headers.get(f"{prefix}-remaining")
+            capacity = headers.get(f"{prefix}-max")
+            interval_ms = headers.get(f"{prefix}-interval-ms")
+            if remaining is None and capacity is None and interval_ms is None:
+                continue
+            try:
+                bucket.calibrate(
+                    remaining=int(remaining) if remaining is not None else None,
+                    capacity=int(capacity) if capacity is not None else None,
+                    interval=int(interval_ms) / 1000 if interval_ms else None,
+                )
+            except ValueError:
+                logger.warning(f"Ignoring malformed rate limit headers for {scope}")
+
+    def throttled(self):
+        """Drains all buckets after the server rejected a request as rate limited."""
+        for bucket in self.buckets.values():
+            bucket.drain()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns queueing metrics for the limiter.
+
+        Returns:
+            Dict[str, float]: Current and peak queue depth, request counts and wait times.
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "max_wait_seconds": round(self.max_wait, 6),
+            "avg_wait_seconds": (
+                round(self.total_wait / self.delayed, 6) if self.delayed else 0.0
+            ),
+        }
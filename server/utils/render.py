@@ -0,0 +1,188 @@
+"""
+Rendering of tool results into the output format sent to the agent.
+
+By default tool results are returned as-is and serialized by FastMCP, which
+emits one JSON text block per list item with every field, including defaults.
+The other formats render the whole result into a single text block:
+
+- `minimal`: compact JSON without default or empty values, with short keys. A
+  `_keys` legend maps the short keys used back to the field names.
+- `compact`: CSV-like text. Lists of records become a header row and one row
+  per record; single records become `field: value` lines.
+"""
+
+import csv
+import functools
+import io
+import json
+from typing import Any, Dict, List
+
+import pydantic_core
+from pydantic import BaseModel
+
+from server.utils.env import env_str
+from server.utils.tracing import span
+
+FORMATS = ("json", "minimal", "compact")
+
+SHORT_KEYS = {
+    "name": "n",
+    "desc": "d",
+    "closed": "x",
+    "url": "u",
+    "pos": "p",
+    "due": "du",
+    "color": "co",
+    "state": "s",
+    "labels": "lb",
+    "idBoard": "b",
+    "idList": "l",
+    "idCard": "c",
+    "idChecklist": "k",
+    "idOrganization": "o",
+    "checkItems": "i",
+    "lists": "L",
+    "cards": "C",
+    "checklists": "K",
+    "card": "cd",
+    "score": "sc",
+    "matched": "m",
+    "next_cursor": "nc",
+    "index": "ix",
+    "result": "r",
+    "error": "e",
+}
+
+
+def output_format() -> str:
+    """Returns the output format selected by `TRELLO_OUTPUT_FORMAT`."""
+    fmt = env_str("TRELLO_OUTPUT_FORMAT", "json").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"TRELLO_OUTPUT_FORMAT must be one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def to_plain(value: Any) -> Any:
+    """Converts a result into plain data, dropping default, None and empty values."""
+    if isinstance(value, BaseModel):
+        # Every optional model field defaults to None or empty, so this drops them all.
+        return value.model_dump(exclude_defaults=True)
+    if isinstance(value, dict):
+        return {
+            key: to_plain(item)
+            for key, item in value.items()
+            if item is not None and item != [] and item != {}
+        }
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def _shorten(value: Any, used: set) -> Any:
+    if isinstance(value, dict):
+        shortened = {}
+        for key, item in value.items():
+            if key in SHORT_KEYS:
+                used.add(key)
+                key = SHORT_KEYS[key]
+            if isinstance(item, (dict, list)):
+                item = _shorten(item, used)
+            shortened[key] = item
+        return shortened
+    if isinstance(value, list):
+        return [_shorten(item, used) for item in value]
+    return value
+
+
+def render_minimal(result: Any) -> str:
+    """Renders a result as minimal JSON with short keys and a legend for them."""
+    used: set = set()
+    data = _shorten(to_plain(result), used)
+    if used:
+        data = {"_keys": {SHORT_KEYS[key]: key for key in used}, "data": data}
+    return pydantic_core.to_json(data).decode()
+
+
+def _cell(value: Any) -> str:
+    """Formats a value for one table cell; records in lists are reduced to their names."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, dict):
+        if "name" in value or "id" in value:
+            return str(value.get("name", value.get("id")))
+        return json.dumps(value)
+    if isinstance(value, list):
+        return ";".join(_cell(item) for item in value)
+    return str(value)
+
+
+def _flatten(row: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flattens nested records into dotted columns, e.g. `card.name`."""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _table(rows: List[Dict[str, Any]]) -> str:
+    rows = [_flatten(row) for row in rows]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(
+            [_cell(row[column]) if column in row else "" for column in columns]
+        )
+    return buffer.getvalue().rstrip("\n")
+
+
+def render_compact(result: Any) -> str:
+    """Renders a result as CSV-like text."""
+    data = to_plain(result)
+    if isinstance(data, list):
+        if data and all(isinstance(row, dict) for row in data):
+            return _table(data)
+        return "\n".join(_cell(item) for item in data)
+    if isinstance(data, dict):
+        lines = []
+        for key, value in data.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                # Nested record lists, e.g. the cards of a snapshot, become sub-tables.
+                lines.append(f"{key}:\n{_table(value)}")
+            else:
+                lines.append(f"{key}: {_cell(value)}")
+        return "\n".join(lines)
+    return _cell(data)
+
+
+RENDERERS = {"minimal": render_minimal, "compact": render_compact}
+
+
+def render(result: Any, fmt: str) -> Any:
+    """Renders a tool result in the given format; "json" returns it unchanged."""
+    renderer = RENDERERS.get(fmt)
+    if renderer is None or result is None or isinstance(result, str):
+        return result
+    return renderer(result)
+
+
+def with_rendering(fn, fmt: str):
+    """Wraps an async tool function so its result is rendered in `fmt`."""
+    if fmt == "json":
+        return fn
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        result = await fn(*args, **kwargs)
+        with span("render", {"render.format": fmt}):
+            return render(result, fmt)
+
+    return wrapper
@@ -0,0 +1,153 @@
+"""
+Retry policy for transient Trello API failures.
+
+Idempotent requests are retried on rate limiting, gateway errors and connection
+failures with jittered exponential backoff, honouring `Retry-After`. All
+requests performed during one tool call share a deadline bounding rate limiter
+waits, the requests themselves and backoff, so that no call exceeds its latency
+budget.
+"""
+
+import functools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+import httpx
+from pydantic import BaseModel
+
+from server.utils.env import env_bool, env_float, env_int
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+_deadline: ContextVar[float | None] = ContextVar("trello_deadline", default=None)
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry settings for the Trello client.
+
+    Attributes:
+        max_attempts (int): Maximum attempts per request, including the first one.
+        backoff_base (float): Backoff in seconds before the first retry.
+        backoff_max (float): Upper bound in seconds for a single backoff.
+        deadline (float): Total seconds a tool call may spend on requests and retries.
+        retry_post (bool): Whether POST requests are retried without an explicit opt-in.
+    """
+
+    max_attempts: int = 4
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+    deadline: float = 30.0
+    retry_post: bool = False
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Builds a retry policy from `TRELLO_RETRY_*` environment variables.
+
+        Returns:
+            RetryPolicy: The policy, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            max_attempts=env_int("TRELLO_RETRY_MAX_ATTEMPTS", defaults.max_attempts),
+            backoff_base=env_float("TRELLO_RETRY_BACKOFF_BASE", defaults.backoff_base),
+            backoff_max=env_float("TRELLO_RETRY_BACKOFF_MAX", defaults.backoff_max),
+            deadline=env_float("TRELLO_RETRY_DEADLINE", defaults.deadline),
+            retry_post=env_bool("TRELLO_RETRY_POST", defaults.retry_post),
+        )
+
+    def allows(self, method: str, opt_in: bool | None = None) -> bool:
+        """Returns whether requests with the given method may be retried.
+
+        Args:
+            method (str): The HTTP method of the request.
+            opt_in (bool, optional): Explicit per-request override.
+        """
+        if opt_in is not None:
+            return opt_in
+        return method in IDEMPOTENT_METHODS or (method == "POST" and self.retry_post)
+
+    def backoff(self, attempt: int) -> float:
+        """Returns a full-jitter exponential backoff for the given retry number."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+class RetryStats:
+    """
+    Counters describing how much work and latency retries add.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.retry_wait = 0.0
+        self.exhausted = 0
+        self.reasons: Dict[str, int] = {}
+
+    def record_retry(self, reason: str, delay: float):
+        self.retries += 1
+        self.retry_wait += delay
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.retry_wait, 6),
+            "exhausted": self.exhausted,
+            "reasons": dict(self.reasons),
+        }
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """Parses the `Retry-After` header of a response into seconds, if present."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def deadline() -> float | None:
+    """Returns the monotonic deadline of the current tool call, if one is set."""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Bounds the time spent on requests and retries within the block.
+
+    Nested scopes never extend an enclosing deadline.
+    """
+    limit = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        limit = min(limit, current)
+    reset = _deadline.set(limit)
+    try:
+        yield limit
+    finally:
+        _deadline.reset(reset)
+
+
+def with_deadline(fn, seconds: float):
+    """Wraps an async tool function so all its Trello requests share one deadline."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with deadline_scope(seconds):
+            return await fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,299 @@
+"""
+In-process full-text index of the cards on a board.
+
+Each board is indexed from a snapshot into an inverted index over card names,
+labels, descriptions and checklist items, and ranked with BM25 using per-field
+weights. The index is updated in place by card and checklist mutations and
+rebuilt from a new snapshot once it is older than its TTL, which picks up
+changes made outside this server.
+"""
+
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from server.models import (
+    TrelloBoardSnapshot,
+    TrelloCard,
+    TrelloCardSearchHit,
+    TrelloCheckItem,
+    TrelloChecklist,
+)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Matches in a card's name count three times as much as matches in its description.
+FIELD_WEIGHTS = {"name": 3.0, "labels": 2.0, "checklists": 1.0, "desc": 1.0}
+
+# Query terms also match longer terms they are a prefix of, at a discount.
+PREFIX_WEIGHT = 0.5
+MIN_PREFIX_LENGTH = 2
+
+# BM25 parameters.
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str | None) -> List[str]:
+    """Splits text into lowercase word tokens."""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class BoardIndex:
+    """
+    Inverted index of the cards on one board.
+    """
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.cards: Dict[str, TrelloCard] = {}
+        # term -> card ID -> weighted term frequency
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        # card ID -> field -> terms, for removal and to report matched fields
+        self.fields: Dict[str, Dict[str, Set[str]]] = {}
+        self.lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        self._vocabulary: List[str] | None = None
+
+    def add(self, card: TrelloCard, checklist_text: Iterable[str] = ()):
+        """Indexes a card, replacing any previous version of it."""
+        self.remove(card.id)
+        texts = {
+            "name": tokenize(card.name),
+            "labels": [
+                token
+                for label in card.labels
+                for token in tokenize(f"{label.name} {label.color or ''}")
+            ],
+            "checklists": [
+                token for text in checklist_text for token in tokenize(text)
+            ],
+            "desc": tokenize(card.desc),
+        }
+        frequencies: Dict[str, float] = defaultdict(float)
+        for field, tokens in texts.items():
+            for token in tokens:
+                frequencies[token] += FIELD_WEIGHTS[field]
+        for term, frequency in frequencies.items():
+            if term not in self.postings:
+                self._vocabulary = None
+            self.postings[term][card.id] = frequency
+        self.cards[card.id] = card
+        self.fields[card.id] = {field: set(tokens) for field, tokens in texts.items()}
+        self.lengths[card.id] = sum(frequencies.values())
+        self.total_length += self.lengths[card.id]
+
+    def remove(self, card_id: str):
+        """Removes a card from the index, if present."""
+        fields = self.fields.pop(card_id, None)
+        if fields is None:
+            return
+        for term in set().union(*fields.values()):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(card_id, None)
+                if not postings:
+                    del self.postings[term]
+                    self._vocabulary = None
+        self.total_length -= self.lengths.pop(card_id)
+        del self.cards[card_id]
+
+    def expand(self, term: str) -> List[Tuple[str, float]]:
+        """Returns the indexed terms a query term matches, with their weights."""
+        matches = [(term, 1.0)] if term in self.postings else []
+        if len(term) < MIN_PREFIX_LENGTH:
+            return matches
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect_left(self._vocabulary, term)
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                matches.append((candidate, PREFIX_WEIGHT))
+        return matches
+
+    def search(
+        self, query: str, limit: int = 10, include_closed: bool = False
+    ) -> List[TrelloCardSearchHit]:
+        """Returns the cards best matching a query, ranked by BM25 score.
+
+        Args:
+            query (str): Free-text query; every word is matched, including as a prefix.
+            limit (int): Maximum number of hits to return.
+            include_closed (bool): Whether archived cards may be returned.
+
+        Returns:
+            List[TrelloCardSearchHit]: The hits, best first.
+        """
+        count = len(self.cards)
+        if not count:
+            return []
+        average_length = self.total_length / count or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        matched: Dict[str, Set[str]] = defaultdict(set)
+        for query_term in dict.fromkeys(tokenize(query)):
+            for term, weight in self.expand(query_term):
+                postings = self.postings[term]
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for card_id, frequency in postings.items():
+                    norm = K1 * (1 - B + B * self.lengths[card_id] / average_length)
+                    scores[card_id] += (
+                        weight * idf * frequency * (K1 + 1) / (frequency + norm)
+                    )
+                    matched[card_id].add(term)
+        ranked = sorted(
+            (
+                (score, card_id)
+                for card_id, score in scores.items()
+                if include_closed or not self.cards[card_id].closed
+            ),
+            reverse=True,
+        )
+        return [
+            TrelloCardSearchHit(
+                card=self.cards[card_id],
+                score=round(score, 4),
+                matched=[
+                    field
+                    for field, terms in self.fields[card_id].items()
+                    if terms & matched[card_id]
+                ],
+            )
+            for score, card_id in ranked[:limit]
+        ]
+
+
+class CardIndex:
+    """
+    Search indexes of the boards that have been searched, kept fresh by mutations.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.boards: Dict[str, BoardIndex] = {}
+        self.card_boards: Dict[str, str] = {}
+        self.checklists: Dict[str, TrelloChecklist] = {}
+        self.card_checklists: Dict[str, Set[str]] = defaultdict(set)
+        self.builds = 0
+        self.updates = 0
+
+    def fresh(self, board_id: str) -> bool:
+        """Returns whether a board's index exists and is younger than the TTL."""
+        index = self.boards.get(board_id)
+        return index is not None and time.monotonic() - index.built_at <= self.ttl
+
+    def load_snapshot(self, snapshot: TrelloBoardSnapshot):
+        """Rebuilds the index of a board from a snapshot including its checklists."""
+        old = self.boards.get(snapshot.id)
+        if old is not None:
+            for card_id in old.cards:
+                self._forget_card(card_id)
+        self.boards[snapshot.id] = BoardIndex()
+        for checklist in snapshot.checklists:
+            self._add_checklist(checklist)
+        for card in snapshot.cards:
+            self._index(card)
+        self.builds += 1
+
+    def clear(self):
+        """Drops every board's index, so each is rebuilt on its next search."""
+        self.boards.clear()
+        self.card_boards.clear()
+        self.checklists.clear()
+        self.card_checklists.clear()
+
+    def search(
+        self, board_id: str, query: str, limit: int = 10, include_closed: bool = False
+    ) -> List[TrelloCardSearchHit]:
+        index = self.boards.get(board_id)
+        if index is None:
+            return []
+        return index.search(query, limit, include_closed)
+
+    # Mutations
+
+    def upsert_card(self, card: TrelloCard):
+        """Reindexes a created or updated card, if its board is indexed."""
+        previous = self.card_boards.get(card.id)
+        if previous is not None and previous != card.idBoard:
+            self.boards[previous].remove(card.id)
+            del self.card_boards[card.id]
+        if card.idBoard in self.boards:
+            self._index(card)
+            self.updates += 1
+
+    def remove_card(self, card_id: str):
+        board_id = self.card_boards.get(card_id)
+        if board_id is not None:
+            self.boards[board_id].remove(card_id)
+            self._forget_card(card_id)
+            self.updates += 1
+
+    def upsert_checklist(self, checklist: TrelloChecklist):
+        """Reindexes the card of a created or updated checklist, if it is indexed."""
+        if checklist.idCard not in self.card_boards:
+            return
+        self._add_checklist(checklist)
+        self._reindex(checklist.idCard)
+
+    def remove_checklist(self, checklist_id: str):
+        checklist = self.checklists.pop(checklist_id, None)
+        if checklist is not None:
+            self.card_checklists[checklist.idCard].discard(checklist_id)
+            self._reindex(checklist.idCard)
+
+    def upsert_checkitem(self, checkitem: TrelloCheckItem):
+        checklist = self.checklists.get(checkitem.idChecklist)
+        if checklist is None:
+            return
+        items = [item for item in checklist.checkItems if item.id != checkitem.id]
+        self.upsert_checklist(
+            checklist.model_copy(update={"checkItems": [*items, checkitem]})
+        )
+
+    def remove_checkitem(self, checklist_id: str, checkitem_id: str):
+        checklist = self.checklists.get(checklist_id)
+        if checklist is None:
+            return
+        items = [item for item in checklist.checkItems if item.id != checkitem_id]
+        self.upsert_checklist(checklist.model_copy(update={"checkItems": items}))
+
+    def _add_checklist(self, checklist: TrelloChecklist):
+        self.checklists[checklist.id] = checklist
+        self.card_checklists[checklist.idCard].add(checklist.id)
+
+    def _index(self, card: TrelloCard):
+        texts = []
+        for checklist_id in self.card_checklists.get(card.id, ()):
+            checklist = self.checklists[checklist_id]
+            texts.append(checklist.name)
+            texts.extend(item.name for item in checklist.checkItems)
+        self.boards[card.idBoard].add(card, texts)
+        self.card_boards[card.id] = card.idBoard
+
+    def _reindex(self, card_id: str):
+        board_id = self.card_boards.get(card_id)
+        if board_id is not None:
+            self._index(self.boards[board_id].cards[card_id])
+            self.updates += 1
+
+    def _forget_card(self, card_id: str):
+        self.card_boards.pop(card_id, None)
+        for checklist_id in self.card_checklists.pop(card_id, ()):
+            self.checklists.pop(checklist_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the size of the index and how often it was built and updated."""
+        return {
+            "boards": len(self.boards),
+            "cards": len(self.card_boards),
+            "terms": sum(len(index.postings) for index in self.boards.values()),
+            "builds": self.builds,
+            "updates": self.updates,
+        }
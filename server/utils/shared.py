@@ -0,0 +1,494 @@
+"""
+State shared by the worker processes of a multi-worker SSE server.
+
+With `MCP_SERVER_WORKERS` above 1, uvicorn runs the SSE server in several
+processes, each with its own event loop and `TrelloClient`. Budgets and
+deduplication that must hold for the whole deployment are coordinated through
+a SQLite database in WAL mode that every worker opens
+(`TRELLO_SHARED_STATE_PATH`):
+
+- the rate limit token buckets, so the workers together stay within the
+  per-key and per-token budgets instead of each spending a full budget;
+- single-flight leases, so one worker fetches a response the others are about
+  to request and they read it from the shared response cache;
+- the SSE session registry and message relay used by `server.utils.sse_relay`;
+- worker roles, so one worker at a time keeps the board mirror in sync, and
+  the queue of webhook actions other workers received for it.
+
+The response cache itself is shared by switching it to the SQLite backend.
+
+SQLite is called from the event loop, so statements wait only briefly for
+another worker's write transaction. A busy database is treated like a lost
+race: the rate limiter retries after an asynchronous sleep, a lease that
+cannot be taken is not taken, and calibrations are skipped.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Tuple
+
+from pydantic import BaseModel
+
+from server.utils.env import env_float, env_int, env_str
+from server.utils.rate_limit import RateLimitConfig, RateLimiter, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARED_PATH = os.path.join("~", ".cache", "trello-mcp", "shared.db")
+
+
+class SharedConfig(BaseModel):
+    """
+    Settings for running the SSE server in several worker processes.
+
+    Attributes:
+        workers (int): Number of uvicorn worker processes; state is shared above 1.
+        backend (str): Where shared state is kept; only "sqlite" is supported.
+        path (str): Path of the SQLite file shared by the workers.
+        lease (float): Seconds a worker waits for another worker's identical read
+            before fetching the response itself.
+    """
+
+    workers: int = 1
+    backend: str = "sqlite"
+    path: str = DEFAULT_SHARED_PATH
+    lease: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "SharedConfig":
+        """Builds the configuration from `MCP_SERVER_WORKERS` and `TRELLO_SHARED_*`.
+
+        Returns:
+            SharedConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            workers=max(1, env_int("MCP_SERVER_WORKERS", defaults.workers)),
+            path=env_str("TRELLO_SHARED_STATE_PATH", defaults.path),
+            lease=env_float("TRELLO_SHARED_LEASE", defaults.lease),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1
+
+    def build(self) -> "SharedState":
+        """Opens the shared state backend selected by `backend`."""
+        if self.backend != "sqlite":
+            raise ValueError(f"Unknown shared state backend: {self.backend}")
+        return SharedState(os.path.expanduser(self.path), self.lease)
+
+
+class SharedState:
+    """
+    Cross-process state kept in a SQLite database.
+
+    Every worker opens its own connection. Writes that read state first run in
+    `BEGIN IMMEDIATE` transactions, which SQLite serializes across processes.
+    """
+
+    POLL_INTERVAL = 0.02
+
+    # Seconds a statement waits for another worker's write transaction before
+    # failing with "database is locked". Transactions here take microseconds,
+    # and every millisecond waited stalls the event loop.
+    BUSY_TIMEOUT = 0.01
+
+    # Seconds writes that must not be skipped are retried asynchronously.
+    RETRY_TIMEOUT = 5.0
+
+    # Sessions not refreshed by their worker for this long are considered gone.
+    SESSION_TTL = 30.0
+
+    def __init__(self, path: str, lease: float = 10.0):
+        self.path = path
+        self.lease = lease
+        # Identifies this worker as the owner of leases and SSE sessions.
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.leaders = 0
+        self.waited = 0
+        self.coalesced = 0
+        self.relayed = 0
+        self.busy = 0
+        self._depth = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Workers starting together create the schema, so wait longer until then.
+        self.db = sqlite3.connect(path, isolation_level=None, timeout=10.0)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, capacity INTEGER NOT NULL, "
+            "interval REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS flight_leases ("
+            "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sse_sessions ("
+            "session_id TEXT PRIMARY KEY, owner TEXT NOT NULL, seen_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sse_messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+            "body BLOB NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS worker_roles ("
+            "role TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_actions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, body BLOB NOT NULL)"
+        )
+        self.db.execute(f"PRAGMA busy_timeout = {int(self.BUSY_TIMEOUT * 1000)}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs the enclosed statements in one write transaction; nested uses join it."""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self.db
+            finally:
+                self._depth -= 1
+            return
+        self.db.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self.db
+        except BaseException:
+            self._depth = 0
+            self.db.execute("ROLLBACK")
+            raise
+        self._depth = 0
+        self.db.execute("COMMIT")
+
+    async def retry_busy(self, fn: Callable[..., Any], *args) -> Any:
+        """Runs a write that must not be skipped, retrying while the database is busy.
+
+        Raises:
+            sqlite3.OperationalError: If the database stays busy for `RETRY_TIMEOUT`.
+        """
+        deadline = time.monotonic() + self.RETRY_TIMEOUT
+        while True:
+            try:
+                return fn(*args)
+            except sqlite3.OperationalError:
+                self.busy += 1
+                if time.monotonic() >= deadline:
+                    raise
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    # Rate limiting
+
+    def rate_limiter(
+        self, api_key: str, token: str, config: RateLimitConfig
+    ) -> "SharedRateLimiter":
+        """Creates a limiter drawing from the buckets of both credentials in the database."""
+        return SharedRateLimiter(
+            {
+                "api-key": SharedBucket(
+                    self,
+                    bucket_key("api-key", api_key),
+                    config.key_max,
+                    config.interval,
+                ),
+                "api-token": SharedBucket(
+                    self,
+                    bucket_key("api-token", token),
+                    config.token_max,
+                    config.interval,
+                ),
+            },
+            self,
+        )
+
+    # Single-flight leases
+
+    def claim(self, key: str) -> bool:
+        """Takes the lease for fetching `key`, unless another worker holds it.
+
+        A busy database counts as a lease held elsewhere; `wait` then returns
+        at once if nobody holds it, and the caller fetches the response itself.
+        """
+        now = time.time()
+        try:
+            with self.transaction() as db:
+                db.execute(
+                    "DELETE FROM flight_leases WHERE key = ? AND expires_at < ?",
+                    (key, now),
+                )
+                claimed = db.execute(
+                    "INSERT OR IGNORE INTO flight_leases (key, owner, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, self.owner, now + self.lease),
+                ).rowcount
+        except sqlite3.OperationalError:
+            self.busy += 1
+            return False
+        if claimed:
+            self.leaders += 1
+        return bool(claimed)
+
+    async def release(self, key: str):
+        """Releases the lease for `key`, so workers waiting for it read the response."""
+        await self.retry_busy(
+            self.db.execute,
+            "DELETE FROM flight_leases WHERE key = ? AND owner = ?",
+            (key, self.owner),
+        )
+
+    async def wait(self, key: str) -> bool:
+        """Waits for another worker to release the lease for `key`.
+
+        Returns:
+            bool: True once the lease is released, False if it expired first.
+        """
+        self.waited += 1
+        while True:
+            row = self.db.execute(
+                "SELECT expires_at FROM flight_leases WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return True
+            if row[0] < time.time():
+                return False
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    # SSE sessions
+
+    def register_sessions(self, session_ids: Iterable[str]):
+        """Records the SSE sessions whose event streams this worker holds.
+
+        Messages queued for sessions no worker holds any more are deleted.
+        """
+        now = time.time()
+        with self.transaction() as db:
+            db.execute("DELETE FROM sse_sessions WHERE owner = ?", (self.owner,))
+            db.executemany(
+                "INSERT OR REPLACE INTO sse_sessions (session_id, owner, seen_at) "
+                "VALUES (?, ?, ?)",
+                [(session_id, self.owner, now) for session_id in session_ids],
+            )
+            db.execute(
+                "DELETE FROM sse_sessions WHERE seen_at < ?", (now - self.SESSION_TTL,)
+            )
+            db.execute(
+                "DELETE FROM sse_messages WHERE session_id NOT IN "
+                "(SELECT session_id FROM sse_sessions)"
+            )
+
+    def session_owner(self, session_id: str) -> str | None:
+        """Returns the worker holding an SSE session's event stream, if any."""
+        row = self.db.execute(
+            "SELECT owner FROM sse_sessions WHERE session_id = ? AND seen_at >= ?",
+            (session_id, time.time() - self.SESSION_TTL),
+        ).fetchone()
+        return row[0] if row else None
+
+    async def post_message(self, session_id: str, body: bytes):
+        """Queues a client message for the worker holding the session."""
+        await self.retry_busy(
+            self.db.execute,
+            "INSERT INTO sse_messages (session_id, body) VALUES (?, ?)",
+            (session_id, body),
+        )
+        self.relayed += 1
+
+    def take_messages(self) -> List[Tuple[str, bytes]]:
+        """Removes and returns the queued messages for this worker's sessions, oldest first."""
+        with self.transaction() as db:
+            rows = db.execute(
+                "SELECT m.id, m.session_id, m.body FROM sse_messages m "
+                "JOIN sse_sessions s ON s.session_id = m.session_id "
+                "WHERE s.owner = ? ORDER BY m.id",
+                (self.owner,),
+            ).fetchall()
+            if rows:
+                db.executemany(
+                    "DELETE FROM sse_messages WHERE id = ?", [(row[0],) for row in rows]
+                )
+        return [(session_id, body) for _, session_id, body in rows]
+
+    # Worker roles
+
+    def lead(self, role: str, ttl: float) -> bool:
+        """Takes or renews this worker's lease on `role`, unless another worker holds it.
+
+        Args:
+            role (str): The role, e.g. "mirror" for syncing the board mirror.
+            ttl (float): Seconds the lease lasts unless renewed.
+
+        Returns:
+            bool: Whether this worker holds the role for the next `ttl` seconds.
+        """
+        now = time.time()
+        with self.transaction() as db:
+            db.execute(
+                "DELETE FROM worker_roles WHERE role = ? AND expires_at < ?",
+                (role, now),
+            )
+            db.execute(
+                "INSERT OR IGNORE INTO worker_roles (role, owner, expires_at) "
+                "VALUES (?, ?, ?)",
+                (role, self.owner, now + ttl),
+            )
+            held = db.execute(
+                "UPDATE worker_roles SET expires_at = ? WHERE role = ? AND owner = ?",
+                (now + ttl, role, self.owner),
+            ).rowcount
+        return bool(held)
+
+    async def resign(self, role: str):
+        """Gives up this worker's lease on `role`, so another worker takes it over."""
+        await self.retry_busy(
+            self.db.execute,
+            "DELETE FROM worker_roles WHERE role = ? AND owner = ?",
+            (role, self.owner),
+        )
+
+    # Board mirror actions
+
+    async def post_action(self, body: bytes):
+        """Queues a webhook action for the worker keeping the board mirror in sync."""
+        await self.retry_busy(
+            self.db.execute, "INSERT INTO mirror_actions (body) VALUES (?)", (body,)
+        )
+
+    def take_actions(self) -> List[bytes]:
+        """Removes and returns the queued webhook actions, oldest first."""
+        with self.transaction() as db:
+            rows = db.execute(
+                "SELECT id, body FROM mirror_actions ORDER BY id"
+            ).fetchall()
+            if rows:
+                db.execute("DELETE FROM mirror_actions WHERE id <= ?", (rows[-1][0],))
+        return [body for _, body in rows]
+
+    def stats(self) -> dict:
+        """Returns how reads were coordinated with other workers."""
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "owner": self.owner,
+            "leaders": self.leaders,
+            "waited": self.waited,
+            "coalesced": self.coalesced,
+            "relayed": self.relayed,
+            "busy": self.busy,
+        }
+
+
+def bucket_key(scope: str, identity: str) -> str:
+    """Names a credential's bucket without storing the credential itself."""
+    return f"{scope}:{hashlib.sha256(identity.encode()).hexdigest()[:16]}"
+
+
+class SharedBucket(TokenBucket):
+    """
+    A token bucket whose level is kept in the shared database.
+
+    The level is loaded before and stored after every operation. Since worker
+    processes have unrelated monotonic clocks, refills are timed with the wall
+    clock.
+    """
+
+    def __init__(self, state: SharedState, key: str, capacity: int, interval: float):
+        super().__init__(capacity, interval)
+        self.state = state
+        self.key = key
+
+    def _refill(self, now: float):
+        row = self.state.db.execute(
+            "SELECT tokens, capacity, interval, updated_at FROM rate_buckets "
+            "WHERE key = ?",
+            (self.key,),
+        ).fetchone()
+        if row is None:
+            self.tokens, self.updated = float(self.capacity), time.time()
+        else:
+            self.tokens, self.capacity, self.interval, self.updated = row
+        super()._refill(time.time())
+
+    def _store(self):
+        self.state.db.execute(
+            "INSERT OR REPLACE INTO rate_buckets "
+            "(key, tokens, capacity, interval, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (self.key, self.tokens, self.capacity, self.interval, self.updated),
+        )
+
+    def delay(self, now: float) -> float:
+        with self.state.transaction():
+            delay = super().delay(now)
+            self._store()
+        return delay
+
+    def consume(self):
+        with self.state.transaction():
+            self._refill(time.time())
+            super().consume()
+            self._store()
+
+    def drain(self):
+        with self.state.transaction():
+            super().drain()
+            self._store()
+
+    def calibrate(
+        self,
+        remaining: int | None = None,
+        capacity: int | None = None,
+        interval: float | None = None,
+    ):
+        with self.state.transaction():
+            super().calibrate(remaining, capacity, interval)
+            self._store()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    A rate limiter whose buckets are shared by every worker process.
+
+    Checking and taking tokens happen in one transaction, so two workers can
+    never both take the last token of a bucket.
+    """
+
+    def __init__(self, buckets: dict, state: SharedState):
+        super().__init__(buckets)
+        self.state = state
+
+    def _reserve(self, now: float) -> float:
+        try:
+            with self.state.transaction():
+                return super()._reserve(now)
+        except sqlite3.OperationalError:
+            # Another worker is writing; `acquire` sleeps and tries again.
+            self.state.busy += 1
+            return self.state.POLL_INTERVAL
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        try:
+            super().update_from_headers(headers)
+        except sqlite3.OperationalError:
+            self.state.busy += 1
+            logger.debug("Skipped rate limit calibration, shared state is busy")
+
+    def throttled(self):
+        try:
+            super().throttled()
+        except sqlite3.OperationalError:
+            # The retry after the 429 backs off regardless.
+            self.state.busy += 1
+            logger.debug(
+                "Skipped draining the rate limit buckets, shared state is busy"
+            )
@@ -0,0 +1,146 @@
+"""
+SSE session relay between the worker processes of a multi-worker server.
+
+An MCP SSE client holds its event stream open on one worker and POSTs its
+messages to `/messages/?session_id=...`, which the load balancing of uvicorn's
+shared socket may hand to any worker. The relay records which worker holds
+each session in the shared state; a worker receiving a message for a session
+held elsewhere queues it there, and each worker delivers the messages queued
+for its own sessions. Messages for local sessions are handled directly.
+
+Routing sessions to one worker upstream (sticky sessions) avoids the relay
+hop, which adds up to `SharedState.POLL_INTERVAL` of latency.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from uuid import UUID
+
+import anyio
+from mcp.server.sse import SseServerTransport
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCMessage
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from server.utils.shared import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRelay:
+    """
+    Delivers client messages to the worker holding their SSE session.
+    """
+
+    # Seconds a message for an unknown session waits for the session to be
+    # registered, since the client may POST before its worker's next sync.
+    REGISTRATION_WAIT = 1.0
+
+    # Seconds between refreshes of this worker's sessions in the registry.
+    HEARTBEAT = 5.0
+
+    def __init__(self, mcp, state: SharedState):
+        self.mcp = mcp
+        self.state = state
+        self.sse = SseServerTransport(mcp.settings.message_path)
+
+    def _local_writers(self) -> dict:
+        # SseServerTransport keeps no public registry of its sessions.
+        return {
+            session_id.hex: writer
+            for session_id, writer in self.sse._read_stream_writers.items()
+        }
+
+    async def _owner(self, session_id: str) -> str | None:
+        deadline = time.monotonic() + self.REGISTRATION_WAIT
+        while True:
+            owner = self.state.session_owner(session_id)
+            if owner is not None or time.monotonic() >= deadline:
+                return owner
+            await asyncio.sleep(self.state.POLL_INTERVAL)
+
+    async def handle_post_message(self, scope, receive, send):
+        """Handles a client message locally, or queues it for the session's worker."""
+        request = Request(scope, receive)
+        session_id = request.query_params.get("session_id")
+        try:
+            local = UUID(hex=session_id or "") in self.sse._read_stream_writers
+        except ValueError:
+            local = True  # Let the transport reject the malformed ID.
+        if local:
+            return await self.sse.handle_post_message(scope, receive, send)
+        owner = await self._owner(UUID(hex=session_id).hex)
+        if owner is None or owner == self.state.owner:
+            return await self.sse.handle_post_message(scope, receive, send)
+        body = await request.body()
+        await self.state.post_message(UUID(hex=session_id).hex, body)
+        try:
+            JSONRPCMessage.model_validate_json(body)
+        except ValidationError:
+            response = Response("Could not parse message", status_code=400)
+        else:
+            response = Response("Accepted", status_code=202)
+        await response(scope, receive, send)
+
+    async def run(self):
+        """Keeps this worker's sessions registered and delivers messages queued for them."""
+        registered = None
+        refreshed = 0.0
+        while True:
+            writers = self._local_writers()
+            now = time.monotonic()
+            try:
+                if set(writers) != registered or now - refreshed >= self.HEARTBEAT:
+                    self.state.register_sessions(writers)
+                    registered = set(writers)
+                    refreshed = now
+                if writers:
+                    for session_id, body in self.state.take_messages():
+                        await self._deliver(writers.get(session_id), body)
+            except sqlite3.Error as e:
+                logger.warning(f"SSE session relay failed, retrying: {e}")
+            await asyncio.sleep(self.state.POLL_INTERVAL)
+
+    @staticmethod
+    async def _deliver(writer, body: bytes):
+        if writer is None:
+            return
+        try:
+            message = SessionMessage(JSONRPCMessage.model_validate_json(body))
+        except ValidationError as err:
+            message = err
+        try:
+            await writer.send(message)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            logger.debug("Dropped relayed message for a closed SSE session")
+
+    def sse_app(self) -> Starlette:
+        """Builds the SSE app of the FastMCP server with this relay handling messages.
+
+        Mirrors `FastMCP.sse_app`, which creates its transport internally.
+        """
+        mcp = self.mcp
+        server = mcp._mcp_server
+
+        async def handle_sse(request: Request) -> Response:
+            async with self.sse.connect_sse(
+                request.scope, request.receive, request._send
+            ) as streams:
+                await server.run(
+                    streams[0], streams[1], server.create_initialization_options()
+                )
+            return Response()
+
+        return Starlette(
+            debug=mcp.settings.debug,
+            routes=[
+                Route(mcp.settings.sse_path, endpoint=handle_sse),
+                Mount(mcp.settings.message_path, app=self.handle_post_message),
+            ],
+        )
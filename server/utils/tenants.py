@@ -0,0 +1,296 @@
+"""
+Per-request Trello credentials for serving several users from one HTTP server.
+
+With `TRELLO_MULTI_TENANT` enabled, each HTTP request may carry its own Trello
+credentials, either in Trello's `Authorization: OAuth oauth_consumer_key="...",
+oauth_token="..."` format or in `X-Trello-Api-Key` and `X-Trello-Token`
+headers. `CredentialsMiddleware` makes them current for the request, and so
+for the MCP session it opens, and every tool call resolves a `Tenant` for the
+current credentials through a `ClientPool`.
+
+Each tenant has its own `TrelloClient`, with rate limit buckets for its key and
+token, a response cache namespace and a card search index. The pool keeps at
+most `TRELLO_TENANT_MAX_CLIENTS` of them, evicting the least recently used, and
+closes the connection pools of clients idle for `TRELLO_TENANT_IDLE_TIMEOUT`
+seconds. Requests without credentials use the server's own client only if
+`TRELLO_TENANT_ALLOW_DEFAULT` is set.
+"""
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+
+from pydantic import BaseModel
+
+from server.mirror.store import MirrorStore
+from server.utils.env import env_bool, env_float, env_int
+from server.utils.search import CardIndex
+from server.utils.trello_api import TrelloClient
+
+logger = logging.getLogger(__name__)
+
+# An API key and token pair.
+Credentials = Tuple[str, str]
+
+_OAUTH_PARAM = re.compile(r'(oauth_consumer_key|oauth_token)="([^"]*)"')
+
+_credentials: contextvars.ContextVar[Credentials | None] = contextvars.ContextVar(
+    "trello_credentials", default=None
+)
+_tenant: contextvars.ContextVar["Tenant | None"] = contextvars.ContextVar(
+    "trello_tenant", default=None
+)
+
+
+class TenantConfig(BaseModel):
+    """
+    Settings for per-request credentials.
+
+    Attributes:
+        enabled (bool): Whether requests may carry their own Trello credentials.
+        max_clients (int): Maximum tenant clients kept before LRU eviction.
+        idle_timeout (float): Seconds after which an unused tenant client is closed.
+        allow_default (bool): Whether requests without credentials use the
+            server's own credentials instead of being rejected.
+    """
+
+    enabled: bool = False
+    max_clients: int = 32
+    idle_timeout: float = 600.0
+    allow_default: bool = False
+
+    @classmethod
+    def from_env(cls) -> "TenantConfig":
+        """Builds the configuration from `TRELLO_MULTI_TENANT` and `TRELLO_TENANT_*`.
+
+        Returns:
+            TenantConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            enabled=env_bool("TRELLO_MULTI_TENANT", defaults.enabled),
+            max_clients=max(
+                1, env_int("TRELLO_TENANT_MAX_CLIENTS", defaults.max_clients)
+            ),
+            idle_timeout=env_float("TRELLO_TENANT_IDLE_TIMEOUT", defaults.idle_timeout),
+            allow_default=env_bool(
+                "TRELLO_TENANT_ALLOW_DEFAULT", defaults.allow_default
+            ),
+        )
+
+
+def tenant_id(api_key: str, token: str) -> str:
+    """Derives a stable ID for a set of credentials that does not reveal them."""
+    return hashlib.sha256(f"{api_key}:{token}".encode()).hexdigest()[:16]
+
+
+def parse_credentials(headers: Dict[str, str]) -> Credentials | None:
+    """Reads Trello credentials from request headers, if complete.
+
+    Args:
+        headers (Dict[str, str]): Request headers with lowercase names.
+
+    Returns:
+        Credentials | None: The API key and token, or None if either is missing.
+    """
+    authorization = headers.get("authorization", "")
+    if authorization[:6].lower() == "oauth ":
+        params = dict(_OAUTH_PARAM.findall(authorization))
+        api_key, token = params.get("oauth_consumer_key"), params.get("oauth_token")
+    else:
+        api_key, token = headers.get("x-trello-api-key"), headers.get("x-trello-token")
+    if api_key and token:
+        return api_key, token
+    return None
+
+
+class CredentialsMiddleware:
+    """
+    ASGI middleware making the Trello credentials of each HTTP request current.
+
+    MCP sessions run in tasks started by the request that opens them, so they
+    inherit its credentials: the SSE connection for SSE sessions, and the
+    request itself for stateless streamable HTTP.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        token = _credentials.set(parse_credentials(headers))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _credentials.reset(token)
+
+
+class Tenant:
+    """
+    The client and per-client state serving one set of credentials.
+
+    Attributes:
+        id (str): Identifies the credentials, see `tenant_id`.
+        client (TrelloClient): The client using the credentials.
+        mirror (MirrorStore | None): The board mirror, only for the server's own client.
+        index (CardIndex): The card search index built with the client.
+        active (int): Tool calls currently using the tenant.
+        last_used (float): Monotonic time the tenant was last used.
+        evicted (bool): Whether the pool has dropped the tenant.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        client: TrelloClient,
+        index: CardIndex,
+        mirror: MirrorStore | None = None,
+    ):
+        self.id = id
+        self.client = client
+        self.index = index
+        self.mirror = mirror
+        self.active = 0
+        self.last_used = time.monotonic()
+        self.evicted = False
+
+
+class ClientPool:
+    """
+    A bounded LRU pool of tenants, creating one for new credentials on demand.
+
+    Evicted tenants' clients are closed once their last active tool call ends,
+    so a request is never cut off by the eviction it raced with.
+    """
+
+    def __init__(self, factory: Callable[[str, str], Tenant], config: TenantConfig):
+        self.factory = factory
+        self.config = config
+        self.tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+        self.created = 0
+        self.evictions = 0
+
+    def _get(self, api_key: str, token: str) -> Tuple[Tenant, list]:
+        """Returns the tenant for the credentials and the tenants evicted to make room."""
+        key = tenant_id(api_key, token)
+        tenant = self.tenants.get(key)
+        if tenant is not None:
+            self.tenants.move_to_end(key)
+            return tenant, []
+        tenant = self.tenants[key] = self.factory(api_key, token)
+        self.created += 1
+        logger.info(f"Created Trello client for tenant {key}")
+        evicted = []
+        while len(self.tenants) > self.config.max_clients:
+            _, oldest = self.tenants.popitem(last=False)
+            evicted.append(oldest)
+        return tenant, evicted
+
+    async def _evict(self, tenant: Tenant):
+        tenant.evicted = True
+        self.evictions += 1
+        logger.info(f"Evicting Trello client for tenant {tenant.id}")
+        if tenant.active == 0:
+            await tenant.client.close()
+
+    @asynccontextmanager
+    async def use(self, api_key: str, token: str) -> AsyncIterator[Tenant]:
+        """Holds the tenant for the credentials while a tool call uses it."""
+        tenant, evicted = self._get(api_key, token)
+        for old in evicted:
+            await self._evict(old)
+        tenant.active += 1
+        try:
+            yield tenant
+        finally:
+            tenant.active -= 1
+            tenant.last_used = time.monotonic()
+            if tenant.evicted and tenant.active == 0:
+                await tenant.client.close()
+
+    async def evict_idle(self) -> int:
+        """Evicts tenants unused for longer than the idle timeout, returning how many."""
+        cutoff = time.monotonic() - self.config.idle_timeout
+        idle = [
+            key
+            for key, tenant in self.tenants.items()
+            if tenant.active == 0 and tenant.last_used < cutoff
+        ]
+        for key in idle:
+            await self._evict(self.tenants.pop(key))
+        return len(idle)
+
+    async def run(self):
+        """Evicts idle tenants periodically, until cancelled."""
+        interval = max(1.0, min(self.config.idle_timeout / 4, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle()
+
+    async def close(self):
+        """Closes every tenant client."""
+        tenants = list(self.tenants.values())
+        self.tenants.clear()
+        for tenant in tenants:
+            await tenant.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how many tenants are pooled, created and evicted."""
+        return {
+            "clients": len(self.tenants),
+            "max_clients": self.config.max_clients,
+            "created": self.created,
+            "evictions": self.evictions,
+        }
+
+
+def current_tenant() -> Tenant | None:
+    """Returns the tenant of the current tool call, if one was resolved."""
+    return _tenant.get()
+
+
+def with_tenant(fn, resolve: Callable[[], Tuple[ClientPool | None, Tenant]]):
+    """Wraps an async tool function to run with the tenant of the current credentials.
+
+    Args:
+        fn: The tool function.
+        resolve: Returns the tenant pool, or None to always use the default
+            tenant, and the tenant of the server's own credentials. Called on
+            each tool call, so they are only created once a tool is used.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        pool, default = resolve()
+        credentials = _credentials.get() if pool is not None else None
+        if credentials is None:
+            if pool is not None and not pool.config.allow_default:
+                raise ValueError(
+                    "Trello credentials are required: send an Authorization: OAuth "
+                    "header or X-Trello-Api-Key and X-Trello-Token headers"
+                )
+            token = _tenant.set(default)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _tenant.reset(token)
+        async with pool.use(*credentials) as tenant:
+            token = _tenant.set(tenant)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _tenant.reset(token)
+
+    return wrapper
@@ -0,0 +1,250 @@
+"""
+Tracing of tool calls down to the Trello requests they make.
+
+Spans are opened for every tool call, every service method and every
+upstream Trello request, and for decoding responses into models, so the time
+of a slow call can be attributed to Trello, retries, validation or the tool
+itself. The backend is selected with `TRELLO_TRACING`:
+
+- `off` (default): spans are no-ops and cost almost nothing.
+- `otel`: spans are created with the OpenTelemetry API (the `tracing` extra)
+  and exported by whatever SDK the process configures, e.g. with
+  `opentelemetry-instrument`.
+- `memory`: finished spans are kept in memory, for tests and benchmarks.
+"""
+
+import contextvars
+import functools
+import importlib.util
+import inspect
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from server.utils.env import env_str
+
+logger = logging.getLogger(__name__)
+
+TRACING_BACKENDS = ("off", "otel", "memory")
+
+
+class NoopSpan:
+    """
+    A span that records nothing.
+    """
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class _NoopContext:
+    """A reusable context manager yielding `NOOP_SPAN`, so disabled spans allocate nothing."""
+
+    def __enter__(self) -> NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_CONTEXT = _NoopContext()
+
+
+class Tracer:
+    """
+    Creates spans; the base implementation is the no-op tracer.
+    """
+
+    enabled = False
+
+    def span(self, name: str, attributes: Dict[str, Any] | None = None):
+        """Returns a context manager for a span, yielding an object with `set_attribute`."""
+        return _NOOP_CONTEXT
+
+
+class RecordedSpan(NoopSpan):
+    """
+    A span kept by `MemoryTracer`.
+
+    Attributes:
+        name (str): The span name.
+        trace_id (int): Shared by all spans under the same root span.
+        span_id (int): Unique per span.
+        parent_id (int | None): The span ID of the enclosing span.
+        attributes (Dict[str, Any]): The span attributes.
+        start (float): Monotonic start time in seconds.
+        end (float | None): Monotonic end time, once finished.
+        error (str | None): The exception that ended the span, if any.
+    """
+
+    def __init__(self, name: str, trace_id: int, span_id: int, parent_id: int | None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, {self.duration * 1000:.2f} ms, {self.attributes})"
+
+
+class MemoryTracer(Tracer):
+    """
+    Keeps finished spans in memory, with their parent-child relations.
+    """
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self.spans: List[RecordedSpan] = []
+        self._ids = itertools.count(1)
+        self._current: contextvars.ContextVar[RecordedSpan | None] = (
+            contextvars.ContextVar("current_span", default=None)
+        )
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: Dict[str, Any] | None = None
+    ) -> Iterator[RecordedSpan]:
+        parent = self._current.get()
+        span_id = next(self._ids)
+        span = RecordedSpan(
+            name,
+            parent.trace_id if parent else span_id,
+            span_id,
+            parent.span_id if parent else None,
+        )
+        if attributes:
+            span.attributes.update(attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            self._current.reset(token)
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+
+    def children(self, span: RecordedSpan) -> List[RecordedSpan]:
+        return [child for child in self.spans if child.parent_id == span.span_id]
+
+    def clear(self):
+        self.spans.clear()
+
+
+class OTelTracer(Tracer):
+    """
+    Creates spans with the OpenTelemetry API.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        from opentelemetry import trace
+
+        self.tracer = trace.get_tracer("trello-mcp")
+
+    def span(self, name: str, attributes: Dict[str, Any] | None = None):
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+
+def build_tracer(backend: str) -> Tracer:
+    """Creates the tracer for a `TRELLO_TRACING` backend."""
+    if backend not in TRACING_BACKENDS:
+        raise ValueError(f"TRELLO_TRACING must be one of {', '.join(TRACING_BACKENDS)}")
+    if backend == "memory":
+        return MemoryTracer()
+    if backend == "otel":
+        if importlib.util.find_spec("opentelemetry") is None:
+            logger.warning(
+                "OpenTelemetry tracing requested but the 'opentelemetry-api' package "
+                "is not installed, tracing is disabled"
+            )
+            return Tracer()
+        return OTelTracer()
+    return Tracer()
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """Returns the process tracer, built from `TRELLO_TRACING` on first use.
+
+    Not built at import, so that the setting may be given in `.env`, which is
+    only loaded once the server modules are imported.
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = build_tracer(env_str("TRELLO_TRACING", "off").lower())
+    return _tracer
+
+
+def set_tracer(new_tracer: Tracer | None):
+    """Replaces the process tracer, e.g. with a `MemoryTracer` in a benchmark or
+    test; None rebuilds it from `TRELLO_TRACING` on next use."""
+    global _tracer
+    _tracer = new_tracer
+
+
+def span(name: str, attributes: Dict[str, Any] | None = None):
+    """Opens a span under the current one with the process tracer."""
+    return get_tracer().span(name, attributes)
+
+
+def traced(name: str):
+    """Wraps an async function so each call runs in a span called `name`."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return await fn(*args, **kwargs)
+            with tracer.span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(cls):
+    """Class decorator tracing each public coroutine method, e.g. as `CardService.get_card`.
+
+    Async generator methods are left as they are.
+    """
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+def trace_tool(fn):
+    """Wraps an async tool function in a span called `tool <name>`."""
+    return traced(f"tool {fn.__name__}")(fn)
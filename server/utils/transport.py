@@ -0,0 +1,96 @@
+"""
+HTTP transport configuration for the Trello API client.
+"""
+
+import importlib.util
+import logging
+
+import httpx
+from pydantic import BaseModel
+
+from server.utils.env import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+
+class TransportConfig(BaseModel):
+    """
+    Connection pool, timeout and protocol settings for the Trello HTTP client.
+
+    Attributes:
+        max_connections (int): Maximum number of open connections in the pool.
+        max_keepalive_connections (int): Maximum number of idle connections kept alive.
+        keepalive_expiry (float): Seconds an idle connection is kept before it is closed.
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for a chunk of the response.
+        write_timeout (float): Seconds to wait for a chunk of the request to be sent.
+        pool_timeout (float): Seconds to wait for a free connection from the pool.
+        http2 (bool): Whether to negotiate HTTP/2 (requires the `h2` package).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        """Builds a transport configuration from `TRELLO_HTTP_*` environment variables.
+
+        Returns:
+            TransportConfig: The configuration, with defaults for unset variables.
+        """
+        defaults = cls()
+        return cls(
+            max_connections=env_int(
+                "TRELLO_HTTP_MAX_CONNECTIONS", defaults.max_connections
+            ),
+            max_keepalive_connections=env_int(
+                "TRELLO_HTTP_MAX_KEEPALIVE", defaults.max_keepalive_connections
+            ),
+            keepalive_expiry=env_float(
+                "TRELLO_HTTP_KEEPALIVE_EXPIRY", defaults.keepalive_expiry
+            ),
+            connect_timeout=env_float(
+                "TRELLO_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout
+            ),
+            read_timeout=env_float("TRELLO_HTTP_READ_TIMEOUT", defaults.read_timeout),
+            write_timeout=env_float(
+                "TRELLO_HTTP_WRITE_TIMEOUT", defaults.write_timeout
+            ),
+            pool_timeout=env_float("TRELLO_HTTP_POOL_TIMEOUT", defaults.pool_timeout),
+            http2=env_bool("TRELLO_HTTP2", defaults.http2),
+        )
+
+    def limits(self) -> httpx.Limits:
+        """Returns the connection pool limits for `httpx`."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        """Returns the per-phase timeouts for `httpx`."""
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def http2_enabled(self) -> bool:
+        """Returns whether HTTP/2 is requested and the `h2` package is available."""
+        if not self.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed, "
+                "falling back to HTTP/1.1"
+            )
+            return False
+        return True
@@ -1,8 +1,35 @@
 # trello_api.py
+import asyncio
+import functools
 import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, List
+from urllib.parse import parse_qsl
 
 import httpx
 
+from server.utils.batch import MAX_BATCH_SIZE, BatchConfig, BatchDispatcher
+from server.utils.cache import CacheConfig, CacheEntry, ResponseCache, cache_key
+from server.utils.fastjson import loads
+from server.utils import tracing
+from server.utils.metrics import (
+    UPSTREAM_IN_FLIGHT,
+    endpoint_template,
+    observe_request,
+)
+from server.utils.rate_limit import RateLimitConfig, RateLimiter
+from server.utils.retry import (
+    RETRY_STATUSES,
+    RetryPolicy,
+    RetryStats,
+    retry_after,
+)
+from server.utils.retry import deadline as current_deadline
+from server.utils.shared import SharedState
+from server.utils.singleflight import SingleFlight
+from server.utils.transport import TransportConfig
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -12,85 +39,451 @@ TRELLO_API_BASE = "https://api.trello.com/1"
 class TrelloClient:
     """
     Client class for interacting with the Trello API over REST.
+
+    A single client owns one pooled `httpx.AsyncClient` that is shared by all
+    services. It is built on the first request, drained by `close()` and
+    rebuilt by the next request after that; use `session()` to tie its
+    lifetime to a server or MCP session.
     """
 
-    def __init__(self, api_key: str, token: str):
+    def __init__(
+        self,
+        api_key: str,
+        token: str,
+        config: TransportConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rate_limit: RateLimitConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        cache: CacheConfig | None = None,
+        coalesce: bool = True,
+        batch: BatchConfig | None = None,
+        shared: SharedState | None = None,
+    ):
         self.api_key = api_key
         self.token = token
         self.base_url = TRELLO_API_BASE
-        self.client = httpx.AsyncClient(base_url=self.base_url)
+        self.config = config or TransportConfig()
+        self.transport = transport
+        self.http2 = self.config.http2_enabled()
+        # Built on the first request, so creating a client opens no connection pool
+        self.client: httpx.AsyncClient | None = None
+        self._sessions = 0
+        self.shared = shared
+        rate_limit = rate_limit or RateLimitConfig()
+        if not rate_limit.enabled:
+            self.rate_limiter = None
+        elif shared is not None:
+            self.rate_limiter = shared.rate_limiter(api_key, token, rate_limit)
+        else:
+            self.rate_limiter = RateLimiter.for_credentials(api_key, token, rate_limit)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        cache = cache or CacheConfig()
+        self.cache = ResponseCache(cache) if cache.enabled else None
+        self.single_flight = SingleFlight() if coalesce else None
+        batch = batch or BatchConfig()
+        self.batcher = (
+            BatchDispatcher(self._dispatch_batch, batch.window)
+            if batch.enabled
+            else None
+        )
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=self.config.limits(),
+            timeout=self.config.timeout(),
+            http2=self.http2,
+            transport=self.transport,
+        )
 
     async def close(self):
-        await self.client.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+
+    @asynccontextmanager
+    async def session(self):
+        """Keeps the connection pool open while at least one session is active.
 
-    async def GET(self, endpoint: str, params: dict = None):
-        all_params = {"key": self.api_key, "token": self.token}
-        if params:
-            all_params.update(params)
+        Sessions are reference counted, so nested or concurrent holders (the
+        Starlette app and each MCP session) share one warm pool, which is
+        drained when the last holder exits.
+        """
+        self._sessions += 1
         try:
-            response = await self.client.get(endpoint, params=all_params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e}")
-            raise httpx.HTTPStatusError(
-                f"Failed to get {endpoint}: {str(e)}",
-                request=e.request,
-                response=e.response,
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise httpx.RequestError(f"Failed to get {endpoint}: {str(e)}")
+            yield self
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0:
+                logger.info("Draining Trello HTTP connection pool")
+                await self.close()
+
+    def stats(self) -> dict:
+        """Returns runtime metrics for the client's scheduling layers."""
+        stats = {"retries": self.retry_stats.as_dict()}
+        if self.rate_limiter:
+            stats["rate_limiter"] = self.rate_limiter.stats()
+        if self.cache:
+            stats["cache"] = self.cache.stats()
+        if self.single_flight:
+            stats["single_flight"] = self.single_flight.stats()
+        if self.batcher:
+            stats["batch"] = self.batcher.stats()
+        if self.shared:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+    def invalidate(self, *patterns: str) -> int:
+        """Evicts cached GET responses affected by a mutation.
+
+        Args:
+            *patterns (str): Endpoint patterns to evict, see `ResponseCache.invalidate`.
 
-    async def POST(self, endpoint: str, data: dict = None):
-        all_params = {"key": self.api_key, "token": self.token}
+        Returns:
+            int: The number of evicted responses.
+        """
+        if self.cache:
+            return self.cache.invalidate(*patterns)
+        return 0
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict,
+        data: dict = None,
+        headers: dict = None,
+    ) -> httpx.Response:
+        """Sends one attempt of a request through the rate limiter, recording its metrics."""
+        if self.client is None or self.client.is_closed:
+            self.client = self._build_client()
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        UPSTREAM_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status = "error"
         try:
-            response = await self.client.post(endpoint, params=all_params, json=data)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e}")
-            raise httpx.HTTPStatusError(
-                f"Failed to post to {endpoint}: {str(e)}",
-                request=e.request,
-                response=e.response,
+            response = await self.client.request(
+                method, endpoint, params=params, json=data, headers=headers
             )
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise httpx.RequestError(f"Failed to post to {endpoint}: {str(e)}")
+            status = str(response.status_code)
+        finally:
+            UPSTREAM_IN_FLIGHT.dec()
+            observe_request(method, endpoint, status, time.perf_counter() - started)
+        if self.rate_limiter:
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code == 429:
+                self.rate_limiter.throttled()
+        return response
 
-    async def PUT(self, endpoint: str, data: dict = None):
-        all_params = {"key": self.api_key, "token": self.token}
+    async def _attempt(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict,
+        data: dict | None,
+        headers: dict | None,
+        deadline: float,
+    ) -> httpx.Response:
+        """Sends one attempt, bounding the rate limiter wait and the request by the deadline."""
         try:
-            response = await self.client.put(endpoint, params=all_params, json=data)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e}")
-            raise httpx.HTTPStatusError(
-                f"Failed to put to {endpoint}: {str(e)}",
-                request=e.request,
-                response=e.response,
+            async with asyncio.timeout(deadline - time.monotonic()):
+                return await self._send(
+                    method, endpoint, params, data=data, headers=headers
+                )
+        except TimeoutError:
+            raise httpx.TimeoutException(
+                f"Deadline exceeded before {method} {endpoint} completed"
             )
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise httpx.RequestError(f"Failed to put to {endpoint}: {str(e)}")
 
-    async def DELETE(self, endpoint: str, params: dict = None):
-        all_params = {"key": self.api_key, "token": self.token}
-        if params:
-            all_params.update(params)
-        try:
-            response = await self.client.delete(endpoint, params=all_params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e}")
-            raise httpx.HTTPStatusError(
-                f"Failed to delete {endpoint}: {str(e)}",
-                request=e.request,
-                response=e.response,
+    def _retry_delay(
+        self,
+        retryable: bool,
+        attempt: int,
+        deadline: float,
+        hint: float | None = None,
+    ) -> float | None:
+        """Returns the backoff before the next attempt, or None to give up."""
+        if not retryable:
+            return None
+        delay = hint if hint is not None else self.retry_policy.backoff(attempt - 1)
+        if (
+            attempt >= self.retry_policy.max_attempts
+            or time.monotonic() + delay > deadline
+        ):
+            self.retry_stats.exhausted += 1
+            return None
+        return delay
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        action: str,
+        params: dict = None,
+        data: dict = None,
+        headers: dict = None,
+        retry: bool | None = None,
+        not_modified_ok: bool = False,
+    ) -> httpx.Response:
+        """Sends a request with retries, in a span carrying the endpoint template,
+        status code, body size and retry count."""
+        template = endpoint_template(endpoint)
+        with tracing.span(
+            f"{method} {template}",
+            {"http.request.method": method, "url.template": template},
+        ) as span:
+            all_params = {"key": self.api_key, "token": self.token}
+            if params:
+                all_params.update(params)
+            retryable = self.retry_policy.allows(method, retry)
+            deadline = (
+                current_deadline() or time.monotonic() + self.retry_policy.deadline
             )
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise httpx.RequestError(f"Failed to delete {endpoint}: {str(e)}")
+            self.retry_stats.requests += 1
+            attempt = 0
+            try:
+                while True:
+                    attempt += 1
+                    try:
+                        response = await self._attempt(
+                            method, endpoint, all_params, data, headers, deadline
+                        )
+                    except httpx.TransportError as e:
+                        delay = self._retry_delay(retryable, attempt, deadline)
+                        if delay is None:
+                            raise
+                        reason = type(e).__name__
+                    else:
+                        if response.status_code not in RETRY_STATUSES:
+                            if not (not_modified_ok and response.status_code == 304):
+                                response.raise_for_status()
+                            span.set_attributes(
+                                {
+                                    "http.response.status_code": response.status_code,
+                                    "http.response.body.size": len(response.content),
+                                }
+                            )
+                            return response
+                        delay = self._retry_delay(
+                            retryable, attempt, deadline, retry_after(response)
+                        )
+                        if delay is None:
+                            response.raise_for_status()
+                        reason = str(response.status_code)
+                    logger.warning(
+                        f"Retrying {method} {endpoint} in {delay:.2f}s "
+                        f"(attempt {attempt}/{self.retry_policy.max_attempts}, reason: {reason})"
+                    )
+                    self.retry_stats.record_retry(reason, delay)
+                    span.set_attribute("trello.retry_count", attempt)
+                    await asyncio.sleep(delay)
+            except httpx.HTTPStatusError as e:
+                span.set_attribute("http.response.status_code", e.response.status_code)
+                logger.error(f"HTTP error: {e}")
+                raise httpx.HTTPStatusError(
+                    f"Failed to {action} {endpoint}: {str(e)}",
+                    request=e.request,
+                    response=e.response,
+                )
+            except httpx.RequestError as e:
+                logger.error(f"Request error: {e}")
+                raise httpx.RequestError(f"Failed to {action} {endpoint}: {str(e)}")
+
+    async def GET(
+        self,
+        endpoint: str,
+        params: dict = None,
+        cache: bool = True,
+        batch: bool = False,
+        raw: bool = False,
+    ):
+        """Sends a GET request, serving it from the response cache when possible.
+
+        Expired cache entries with an `ETag` or `Last-Modified` validator are
+        revalidated with a conditional request; on 304 the cached body is reused.
+        Concurrent identical GETs share a single in-flight request, across all
+        worker processes when the client has shared state.
+
+        Args:
+            endpoint (str): The API endpoint, e.g. `/boards/{id}/lists`.
+            params (dict, optional): Query parameters for the request.
+            cache (bool): Whether the response may be served from or stored in the cache.
+            batch (bool): Whether the request may be aggregated with other reads
+                issued at the same time into a single `/batch` call.
+            raw (bool): Whether the body may be returned as undecoded JSON bytes,
+                for callers that validate it directly with `decode`/`decode_list`.
+                Bodies already decoded, e.g. by the cache, are returned as-is.
+        """
+        use_cache = cache and self.cache is not None
+        entry = None
+        if use_cache:
+            entry = self.cache.lookup(endpoint, params)
+            if entry is not None and entry.fresh(time.monotonic()):
+                return self._body(entry.value, raw)
+        fetch = functools.partial(
+            self._get, endpoint, params, use_cache, entry, batch, raw
+        )
+        if use_cache and self.shared is not None:
+            fetch = functools.partial(self._get_shared, endpoint, params, raw, fetch)
+        if self.single_flight is None:
+            return await fetch()
+        key = cache_key(endpoint, params)
+        return await self.single_flight.do(f"raw:{key}" if raw else key, fetch)
+
+    async def _get_shared(
+        self,
+        endpoint: str,
+        params: dict | None,
+        raw: bool,
+        fetch: Callable[[], Awaitable[Any]],
+    ):
+        """Fetches a response once across worker processes.
+
+        The worker holding the shared lease for a request fetches it; the others
+        wait for the lease to be released and read the response from the shared
+        cache, fetching it themselves only when it does not arrive in time.
+        """
+        # Clients with other credentials keep their responses in other namespaces.
+        key = self.cache.config.namespace + cache_key(endpoint, params)
+        if self.shared.claim(key):
+            try:
+                return await fetch()
+            finally:
+                await self.shared.release(key)
+        if await self.shared.wait(key):
+            entry = self.cache.lookup(endpoint, params)
+            if entry is not None and entry.fresh(time.monotonic()):
+                self.shared.coalesced += 1
+                return self._body(entry.value, raw)
+        return await fetch()
+
+    @staticmethod
+    def _body(value: Any, raw: bool) -> Any:
+        """Decodes a body held as raw JSON bytes unless the caller accepts them."""
+        if isinstance(value, bytes) and not raw:
+            return loads(value)
+        return value
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: dict | None,
+        use_cache: bool,
+        entry: CacheEntry | None,
+        batch: bool = False,
+        raw: bool = False,
+    ):
+        if batch and self.batcher is not None:
+            generation = self.cache.generation if use_cache else None
+            body = await self.batcher.submit(cache_key(endpoint, params))
+            if use_cache:
+                self.cache.set(endpoint, params, body, generation=generation)
+            return body
+        if not use_cache:
+            response = await self._request("GET", endpoint, "get", params=params)
+            return self._body(response.content, raw)
+        generation = self.cache.generation
+        response = await self._request(
+            "GET",
+            endpoint,
+            "get",
+            params=params,
+            headers=entry.conditional_headers() if entry else None,
+            not_modified_ok=entry is not None,
+        )
+        if response.status_code == 304:
+            self.cache.revalidated(endpoint, params, entry)
+            return self._body(entry.value, raw)
+        body = self._body(response.content, raw)
+        # Skip storing a response that raced with a mutation's invalidation,
+        # made by this or another worker sharing the cache.
+        self.cache.set(
+            endpoint,
+            params,
+            body,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            generation=generation,
+        )
+        return body
+
+    async def BATCH(self, routes: List[str]) -> List[Any]:
+        """Sends GET routes through Trello's `/batch` endpoint, ten routes per request.
+
+        Args:
+            routes (List[str]): API routes with optional query strings, e.g. `/cards/{id}`.
+
+        Returns:
+            List[Any]: One entry per route, in order: the decoded response body, or an
+            `httpx.HTTPStatusError` for routes that failed.
+        """
+        chunks = [
+            routes[i : i + MAX_BATCH_SIZE]
+            for i in range(0, len(routes), MAX_BATCH_SIZE)
+        ]
+        results = []
+        for chunk_results in await asyncio.gather(*map(self._send_batch, chunks)):
+            results.extend(chunk_results)
+        return results
+
+    async def _dispatch_batch(self, routes: List[str]) -> List[Any]:
+        # A lone read gains nothing from /batch, so send it directly.
+        if len(routes) == 1:
+            endpoint, _, query = routes[0].partition("?")
+            try:
+                response = await self._request(
+                    "GET", endpoint, "get", params=dict(parse_qsl(query))
+                )
+                return [loads(response.content)]
+            except httpx.HTTPStatusError as e:
+                return [e]
+        return await self._send_batch(routes)
+
+    async def _send_batch(self, routes: List[str]) -> List[Any]:
+        response = await self._request(
+            "GET", "/batch", "get", params={"urls": ",".join(routes)}
+        )
+        return [
+            self._batch_result(route, item)
+            for route, item in zip(routes, loads(response.content))
+        ]
+
+    def _batch_result(self, route: str, item: Any) -> Any:
+        """Unwraps one `/batch` entry: `{"200": body}` on success, an error object otherwise."""
+        status, body = 500, item
+        if isinstance(item, dict) and len(item) == 1:
+            key, value = next(iter(item.items()))
+            if key.isdigit():
+                status, body = int(key), value
+        elif isinstance(item, dict):
+            status = int(item.get("statusCode", 500))
+        if 200 <= status < 300:
+            return body
+        request = httpx.Request("GET", f"{self.base_url}{route}")
+        response = httpx.Response(status, json=body, request=request)
+        logger.error(f"HTTP error in batch: {route} returned {status}")
+        return httpx.HTTPStatusError(
+            f"Failed to get {route}: {status} {body}",
+            request=request,
+            response=response,
+        )
+
+    async def POST(self, endpoint: str, data: dict = None, retry: bool | None = None):
+        """Sends a POST request.
+
+        POSTs are not retried unless `retry` is set or the retry policy opts
+        all POSTs in, since Trello has no way to deduplicate a repeated POST.
+        """
+        response = await self._request(
+            "POST", endpoint, "post to", data=data, retry=retry
+        )
+        return loads(response.content)
+
+    async def PUT(self, endpoint: str, data: dict = None):
+        response = await self._request("PUT", endpoint, "put to", data=data)
+        return loads(response.content)
+
+    async def DELETE(self, endpoint: str, params: dict = None):
+        response = await self._request("DELETE", endpoint, "delete", params=params)
+        return loads(response.content)
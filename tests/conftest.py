@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.fake_trello import FakeTrello
+from server.utils.cache import CacheConfig
+from server.utils.rate_limit import RateLimitConfig
+from server.utils.trello_api import TrelloClient
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def fake() -> FakeTrello:
+    return FakeTrello(lists=2, cards=3)
+
+
+@pytest.fixture
+def make_client(fake):
+    """Returns a factory of clients talking to the fake Trello API."""
+
+    def make(**kwargs) -> TrelloClient:
+        kwargs.setdefault("rate_limit", RateLimitConfig(enabled=False))
+        kwargs.setdefault("cache", CacheConfig())
+        return TrelloClient("key", "token", transport=fake.transport, **kwargs)
+
+    return make
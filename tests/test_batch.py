@@ -0,0 +1,42 @@
+import asyncio
+
+import httpx
+import pytest
+
+from server.services.card import CardService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_identical_reads_share_one_request(fake, make_client):
+    fake.latency = 0.01
+    client = make_client()
+    board_id = next(iter(fake.boards))
+
+    boards = await asyncio.gather(
+        *[client.GET(f"/boards/{board_id}", cache=False) for _ in range(5)]
+    )
+
+    assert all(board["id"] == board_id for board in boards)
+    assert fake.requests["GET /boards/{id}"] == 1
+    assert client.single_flight.stats()["coalesced"] == 4
+
+
+async def test_concurrent_card_reads_are_batched_ten_routes_at_a_time(
+    fake, make_client
+):
+    list_id = next(iter(fake.lists))
+    while len(fake.cards) < 12:
+        fake.add_card(list_id)
+    card_ids = list(fake.cards)[:12] + ["f" * 24]
+    cards = CardService(make_client())
+
+    results = await asyncio.gather(
+        *[cards.get_card(card_id) for card_id in card_ids], return_exceptions=True
+    )
+
+    assert fake.requests["GET /batch"] == 2
+    assert fake.requests["GET /cards/{id}"] == 0
+    assert [card.id for card in results[:12]] == card_ids[:12]
+    assert isinstance(results[12], httpx.HTTPStatusError)
+    assert results[12].response.status_code == 404
@@ -0,0 +1,99 @@
+import sqlite3
+import time
+
+import pytest
+
+from server.services.board import BoardService
+from server.utils.cache import CacheConfig, CacheEntry, ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+def test_ttl_follows_resource_type():
+    cache = ResponseCache(CacheConfig())
+    assert cache.ttl_for("/boards/b1") == 300
+    assert cache.ttl_for("/boards/b1/lists") == 120
+    assert cache.ttl_for("/cards/c1") == 30
+
+
+def test_ttl_of_nested_response_is_shortest_embedded():
+    cache = ResponseCache(CacheConfig())
+    assert cache.ttl_for("/boards/b1", {"lists": "open"}) == 120
+    assert cache.ttl_for("/boards/b1", {"lists": "open", "cards": "open"}) == 30
+    assert cache.ttl_for("/boards/b1", {"cards": "none"}) == 300
+
+
+async def test_board_snapshot_expires_like_its_cards(fake, make_client):
+    client = make_client()
+    board_id = next(iter(fake.boards))
+
+    await BoardService(client).get_board_snapshot(board_id)
+
+    (key,) = [key for key in client.cache.store.entries if key.startswith("/boards")]
+    remaining = client.cache.store.get(key).expires_at - time.monotonic()
+    assert remaining <= CacheConfig().ttls["cards"]
+
+
+def test_namespaces_share_sqlite_file_without_clearing_each_other(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    stores = {
+        namespace: CacheConfig(
+            backend="sqlite", path=path, namespace=namespace
+        ).build_store()
+        for namespace in ("server", "tenant")
+    }
+    for namespace, store in stores.items():
+        store.set("/cards/c1", CacheEntry(b"{}", time.monotonic() + 30))
+
+    stores["server"].clear()
+
+    assert len(stores["server"]) == 0
+    assert len(stores["tenant"]) == 1
+    assert stores["tenant"].get("/cards/c1") is not None
+    assert stores["server"].stats()["bytes"] == 0
+    assert stores["server"].stats()["file_bytes"] > 0
+
+
+def test_response_invalidated_by_another_worker_is_not_stored(tmp_path):
+    config = CacheConfig(backend="sqlite", path=str(tmp_path / "cache.sqlite"))
+    worker, other_worker = ResponseCache(config), ResponseCache(config)
+
+    generation = worker.generation
+    other_worker.invalidate("/cards/c1")
+
+    assert not worker.set("/cards/c1", None, b"{}", generation=generation)
+    assert worker.get("/cards/c1") is None
+    assert worker.set("/cards/c1", None, b"{}", generation=worker.generation)
+    assert other_worker.get("/cards/c1") == b"{}"
+
+
+async def test_store_failure_falls_through_to_the_network(fake, make_client, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    client = make_client(cache=CacheConfig(backend="sqlite", path=path))
+    card_id = next(iter(fake.cards))
+    await client.GET(f"/cards/{card_id}")
+    client.cache.store.db.execute("UPDATE cache_entries SET value = x'00'")
+
+    card = await client.GET(f"/cards/{card_id}")
+
+    assert card["id"] == card_id
+    assert fake.requests["GET /cards/{id}"] == 2
+    assert client.cache.stats()["errors"] == 1
+
+
+def test_locked_sqlite_store_does_not_stall(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(CacheConfig(backend="sqlite", path=path))
+    cache.set("/cards/c1", None, b"{}")
+    cache.store.db.execute("UPDATE cache_entries SET accessed_at = 0")
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    started = time.monotonic()
+    assert cache.get("/cards/c1") == b"{}"
+    assert not cache.set("/cards/c2", None, b"{}")
+    assert time.monotonic() - started < 0.5
+    assert cache.stats()["errors"] == 1
+
+    other.execute("ROLLBACK")
+    assert cache.set("/cards/c2", None, b"{}")
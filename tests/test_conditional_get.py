@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from server.utils.cache import CacheConfig, cache_key
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache_config(request, tmp_path) -> CacheConfig:
+    return CacheConfig(backend=request.param, path=str(tmp_path / "cache.db"))
+
+
+def expire(client, endpoint: str, params: dict | None = None):
+    """Marks a cached response as expired, keeping its validators."""
+    key = cache_key(endpoint, params)
+    entry = client.cache.store.get(key)
+    entry.expires_at = time.monotonic() - 1
+    client.cache.store.set(key, entry)
+
+
+async def test_expired_entry_is_revalidated_with_304(fake, make_client, cache_config):
+    client = make_client(cache=cache_config)
+    card_id = next(iter(fake.cards))
+    endpoint = f"/cards/{card_id}"
+
+    first = await client.GET(endpoint)
+    expire(client, endpoint)
+    second = await client.GET(endpoint)
+
+    assert second == first
+    assert fake.requests["GET /cards/{id}"] == 2
+    assert fake.not_modified == 1
+    assert client.cache.stats()["not_modified"] == 1
+    # The renewed entry is served without another request.
+    assert await client.GET(endpoint) == first
+    assert fake.requests["GET /cards/{id}"] == 2
+
+
+async def test_changed_resource_is_refetched(fake, make_client, cache_config):
+    client = make_client(cache=cache_config)
+    card_id = next(iter(fake.cards))
+    endpoint = f"/cards/{card_id}"
+
+    await client.GET(endpoint)
+    fake.cards[card_id]["name"] = "Renamed"
+    expire(client, endpoint)
+
+    assert (await client.GET(endpoint))["name"] == "Renamed"
+    assert fake.not_modified == 0
+    assert client.cache.stats()["not_modified"] == 0
+
+
+async def test_conditional_get_sends_stored_etag(fake, make_client):
+    client = make_client()
+    list_id = next(iter(fake.lists))
+    endpoint = f"/lists/{list_id}/cards"
+
+    await client.GET(endpoint)
+    entry = client.cache.lookup(endpoint)
+
+    assert entry.etag
+    assert entry.conditional_headers() == {"If-None-Match": entry.etag}
@@ -0,0 +1,21 @@
+import pytest
+
+from server.utils import fastjson
+
+
+@pytest.fixture(autouse=True)
+def resolve_again():
+    fastjson._orjson.cache_clear()
+    yield
+    fastjson._orjson.cache_clear()
+
+
+def test_setting_is_read_on_first_use(monkeypatch):
+    # As when load_dotenv() sets it after the module was imported.
+    monkeypatch.setenv("TRELLO_FAST_JSON", "false")
+
+    assert fastjson.backend() == "json"
+    assert fastjson.loads(fastjson.dumps({"id": "a1", "pos": 1.5})) == {
+        "id": "a1",
+        "pos": 1.5,
+    }
@@ -0,0 +1,15 @@
+import os
+
+from server.utils.metrics import Counter, Registry
+
+
+def test_samples_of_workers_are_labelled_with_their_pid():
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Calls.", ["tool"]))
+    calls.inc(tool="get_card")
+
+    assert 'calls_total{tool="get_card"} 1' in registry.render()
+    registry.per_worker = True
+    assert f'calls_total{{tool="get_card",worker="{os.getpid()}"}} 1' in (
+        registry.render()
+    )
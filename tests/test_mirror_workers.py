@@ -0,0 +1,147 @@
+import asyncio
+import sqlite3
+import time
+from contextlib import AsyncExitStack
+
+import pytest
+
+from server.mirror.poller import ActionPoller
+from server.mirror.store import MirrorConfig, MirrorStore
+from server.mirror.sync import MirrorSync
+from server.models import TrelloCard
+from server.utils.shared import SharedState
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def fast_coordination(monkeypatch):
+    monkeypatch.setattr(MirrorSync, "COORDINATE_INTERVAL", 0.02)
+    monkeypatch.setattr(MirrorSync, "ROLE_TTL", 0.5)
+
+
+@pytest.fixture
+def make_worker(fake, make_client, tmp_path):
+    """Returns a factory of mirror syncs as built by separate worker processes."""
+    board_id = next(iter(fake.boards))
+    config = MirrorConfig(boards=[board_id], db_path=str(tmp_path / "mirror.db"))
+
+    def make() -> MirrorSync:
+        shared = SharedState(str(tmp_path / "shared.db"))
+        store = MirrorStore.from_config(config)
+        return MirrorSync(make_client(), store, config, shared)
+
+    return make
+
+
+async def eventually(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def card_named(sync: MirrorSync, card_id: str, name: str) -> bool:
+    card = sync.store.card(card_id)
+    return card is not None and card.name == name
+
+
+async def test_one_worker_syncs_and_others_read_its_mirror(fake, make_worker):
+    workers = [make_worker() for _ in range(3)]
+    card = next(iter(fake.cards.values()))
+
+    async with AsyncExitStack() as stack:
+        for worker in workers:
+            await stack.enter_async_context(worker.running())
+        await eventually(lambda: all(w.store.card(card["id"]) for w in workers))
+
+        assert sum(worker.leading for worker in workers) == 1
+        assert fake.requests["GET /boards/{id}"] == 1
+
+
+async def test_webhook_received_by_follower_is_applied_by_leader(fake, make_worker):
+    workers = [make_worker() for _ in range(2)]
+    card = next(iter(fake.cards.values()))
+    action = {
+        "id": "a" * 24,
+        "type": "updateCard",
+        "data": {
+            "board": {"id": card["idBoard"]},
+            "card": {"id": card["id"], "name": "Renamed elsewhere"},
+        },
+    }
+
+    async with AsyncExitStack() as stack:
+        for worker in workers:
+            await stack.enter_async_context(worker.running())
+        await eventually(lambda: all(w.store.card(card["id"]) for w in workers))
+        (follower,) = [worker for worker in workers if not worker.leading]
+
+        await follower.deliver(action)
+
+        await eventually(
+            lambda: all(card_named(w, card["id"], "Renamed elsewhere") for w in workers)
+        )
+
+
+async def test_another_worker_takes_over_when_leader_stops(make_worker):
+    first, second = make_worker(), make_worker()
+
+    async with AsyncExitStack() as stack:
+        async with AsyncExitStack() as stopping_first:
+            await stopping_first.enter_async_context(first.running())
+            await eventually(lambda: first.leading)
+            await stack.enter_async_context(second.running())
+            await asyncio.sleep(0.1)
+            assert not second.leading
+
+        await eventually(lambda: second.leading)
+
+
+async def test_polls_finding_nothing_new_do_not_reload_other_workers(fake, make_worker):
+    workers = [make_worker() for _ in range(2)]
+    board_id = next(iter(fake.boards))
+
+    async with AsyncExitStack() as stack:
+        for worker in workers:
+            await stack.enter_async_context(worker.running())
+        await eventually(lambda: all(w.store.fresh(board_id) for w in workers))
+        (leader,) = [worker for worker in workers if worker.leading]
+        (follower,) = [worker for worker in workers if not worker.leading]
+        leader.store.set_cursor(board_id, "a" * 24)
+        await eventually(lambda: follower.store.cursors.get(board_id) == "a" * 24)
+        reloads = follower.store.reloads
+
+        synced_at = leader.store.synced_at[board_id]
+
+        poller = ActionPoller(leader)
+        for _ in range(3):
+            await poller.poll_board(board_id)
+            await asyncio.sleep(0.05)
+
+        assert leader.store.synced_at[board_id] > synced_at
+        assert follower.store.reloads == reloads
+        assert follower.store.fresh(board_id)
+
+
+async def test_busy_mirror_file_does_not_stall_writes(fake, tmp_path):
+    path = str(tmp_path / "mirror.db")
+    store = MirrorStore(db_path=path)
+    card = TrelloCard(**next(iter(fake.cards.values())))
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    def persisted() -> bool:
+        query = "SELECT COUNT(*) FROM mirror_entities WHERE id = ?"
+        return other.execute(query, (card.id,)).fetchone()[0] == 1
+
+    started = time.monotonic()
+    store.upsert_card(card)
+    await asyncio.sleep(0.1)
+
+    assert time.monotonic() - started < 0.5
+    assert store.cards[card.id] == card
+    assert store.stats()["busy"] > 0
+    assert not persisted()
+    other.execute("ROLLBACK")
+    await eventually(persisted)
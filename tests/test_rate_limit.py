@@ -0,0 +1,100 @@
+import asyncio
+import types
+
+import httpx
+import pytest
+
+from server.utils import rate_limit
+from server.utils.rate_limit import RateLimitConfig, RateLimiter, TokenBucket
+from server.utils.trello_api import TrelloClient
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """Stands in for the limiter's clock; sleeping advances it instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(
+        rate_limit,
+        "asyncio",
+        types.SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep),
+    )
+    return clock
+
+
+def client_for(handler, credential: str) -> TrelloClient:
+    # Buckets are shared per credential, so each test uses credentials of its own.
+    return TrelloClient(
+        credential,
+        credential,
+        transport=httpx.MockTransport(handler),
+        rate_limit=RateLimitConfig(key_max=300, token_max=100, interval=10),
+    )
+
+
+async def test_waiting_requests_are_admitted_in_arrival_order(clock):
+    limiter = RateLimiter({"api-token": TokenBucket(1, 1.0)})
+    admitted = []
+
+    async def request(i: int):
+        await limiter.acquire()
+        admitted.append(i)
+
+    await asyncio.gather(*[request(i) for i in range(5)])
+
+    assert admitted == [0, 1, 2, 3, 4]
+    assert clock.now == pytest.approx(1004.0)
+    assert limiter.stats()["delayed"] == 4
+
+
+async def test_buckets_follow_the_rate_limit_headers(clock):
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={},
+            headers={
+                "x-rate-limit-api-token-remaining": "0",
+                "x-rate-limit-api-token-max": "50",
+                "x-rate-limit-api-token-interval-ms": "5000",
+            },
+        )
+
+    client = client_for(handler, "calibrated")
+    await client.GET("/cards/1", cache=False)
+
+    bucket = client.rate_limiter.buckets["api-token"]
+    assert (bucket.capacity, bucket.interval, bucket.tokens) == (50, 5.0, 0.0)
+    started = clock.now
+    await client.GET("/cards/2", cache=False)
+    assert clock.now - started == pytest.approx(0.1)
+
+
+async def test_rejected_request_drains_the_buckets(clock):
+    statuses = iter([429, 200])
+
+    def handler(request):
+        return httpx.Response(next(statuses), json={}, headers={"retry-after": "0"})
+
+    client = client_for(handler, "throttled")
+    started = clock.now
+    assert await client.GET("/cards/1", cache=False) == {}
+
+    assert client.retry_stats.reasons == {"429": 1}
+    # The retry waited for the token bucket to refill one request's worth.
+    assert clock.now - started == pytest.approx(0.1)
+    assert client.rate_limiter.stats()["delayed"] == 1
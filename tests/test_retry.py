@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from server.utils.rate_limit import RateLimitConfig
+from server.utils.retry import deadline_scope
+from server.utils.trello_api import TrelloClient
+
+pytestmark = pytest.mark.anyio
+
+
+def client_for(handler, **kwargs) -> TrelloClient:
+    kwargs.setdefault("rate_limit", RateLimitConfig(enabled=False))
+    return TrelloClient(
+        "key", "token", transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+async def test_deadline_bounds_a_slow_request():
+    async def slow(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    client = client_for(slow)
+    started = time.monotonic()
+    with deadline_scope(0.2):
+        with pytest.raises(httpx.RequestError, match="Deadline exceeded"):
+            await client.GET("/cards/1", cache=False)
+    assert time.monotonic() - started < 1
+    assert client.retry_stats.exhausted == 1
+
+
+async def test_deadline_bounds_the_rate_limiter_wait():
+    client = client_for(
+        lambda request: httpx.Response(200, json={}),
+        rate_limit=RateLimitConfig(key_max=1, token_max=1, interval=60),
+    )
+    await client.GET("/cards/1", cache=False)
+    started = time.monotonic()
+    with deadline_scope(0.2):
+        with pytest.raises(httpx.RequestError, match="Deadline exceeded"):
+            await client.GET("/cards/2", cache=False)
+    assert time.monotonic() - started < 1
+    assert client.rate_limiter.stats()["queue_depth"] == 0
+
+
+async def test_transient_failures_are_retried():
+    statuses = iter([503, 429, 200])
+
+    def flaky(request):
+        status = next(statuses)
+        return httpx.Response(
+            status, json={}, headers={"retry-after": "0"} if status == 429 else {}
+        )
+
+    client = client_for(flaky)
+    assert await client.GET("/cards/1", cache=False) == {}
+    assert client.retry_stats.retries == 2
+    assert client.retry_stats.reasons == {"503": 1, "429": 1}
+
+
+async def test_posts_are_not_retried_by_default():
+    requests = []
+
+    def failing(request):
+        requests.append(request)
+        return httpx.Response(503, json={})
+
+    client = client_for(failing)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.POST("/cards", data={"name": "New"})
+    assert len(requests) == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from server.mirror.store import MirrorConfig, MirrorStore
+from server.mirror.sync import MirrorSync
+from server.services.search import SearchService
+from server.utils.search import CardIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def rename_first_card(fake, name: str) -> dict:
+    """Renames a card on the fake API only, as another Trello client would."""
+    card = next(iter(fake.cards.values()))
+    card["name"] = name
+    return card
+
+
+async def test_refresh_bypasses_cached_snapshot(fake, make_client):
+    board_id = next(iter(fake.boards))
+    search = SearchService(make_client(), CardIndex())
+    await search.search_cards(board_id, "anything")
+    card = rename_first_card(fake, "Quarterly zeppelin review")
+
+    assert await search.search_cards(board_id, "zeppelin") == []
+    (hit,) = await search.search_cards(board_id, "zeppelin", refresh=True)
+    assert hit.card.id == card["id"]
+
+
+async def test_refresh_bypasses_mirror(fake, make_client):
+    board_id = next(iter(fake.boards))
+    client = make_client()
+    mirror = MirrorStore()
+    await MirrorSync(client, mirror, MirrorConfig(boards=[board_id])).sync_board(
+        board_id
+    )
+    search = SearchService(client, CardIndex(), mirror)
+    card = rename_first_card(fake, "Quarterly zeppelin review")
+
+    (hit,) = await search.search_cards(board_id, "zeppelin", refresh=True)
+    assert hit.card.id == card["id"]
@@ -0,0 +1,88 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from server.utils.rate_limit import RateLimitConfig
+from server.utils.shared import SharedState
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def state(tmp_path) -> SharedState:
+    return SharedState(str(tmp_path / "shared.db"))
+
+
+@pytest.fixture
+def other_worker(state):
+    """A connection to the shared database, standing in for another worker."""
+    db = sqlite3.connect(state.path, isolation_level=None)
+    yield db
+    if db.in_transaction:
+        db.execute("ROLLBACK")
+    db.close()
+
+
+async def commit_later(db: sqlite3.Connection, delay: float):
+    await asyncio.sleep(delay)
+    db.execute("COMMIT")
+
+
+async def test_claim_does_not_wait_for_busy_database(state, other_worker):
+    other_worker.execute("BEGIN IMMEDIATE")
+
+    started = time.monotonic()
+    assert not state.claim("/cards/c1")
+    assert time.monotonic() - started < 1.0
+    assert state.busy == 1
+    # Nobody holds the lease, so the caller goes on to fetch the response itself.
+    assert await state.wait("/cards/c1")
+
+
+async def test_rate_limiter_waits_for_busy_database_without_blocking(
+    state, other_worker
+):
+    limiter = state.rate_limiter("key", "token", RateLimitConfig())
+    other_worker.execute("BEGIN IMMEDIATE")
+    committing = asyncio.create_task(commit_later(other_worker, 0.5))
+
+    started = time.monotonic()
+    acquiring = asyncio.create_task(limiter.acquire())
+    # The event loop keeps serving other tasks while the limiter waits.
+    gaps = []
+    while not acquiring.done():
+        ticked = time.monotonic()
+        await asyncio.sleep(0.005)
+        gaps.append(time.monotonic() - ticked)
+    await committing
+
+    assert time.monotonic() - started >= 0.5
+    assert max(gaps) < 0.1
+    assert state.busy > 0
+    assert limiter.admitted == 1
+
+
+async def test_release_retries_until_database_is_free(state, other_worker):
+    assert state.claim("/cards/c1")
+    other_worker.execute("BEGIN IMMEDIATE")
+    committing = asyncio.create_task(commit_later(other_worker, 0.3))
+
+    await state.release("/cards/c1")
+    await committing
+
+    assert state.busy > 0
+    assert await state.wait("/cards/c1")
+
+
+async def test_messages_of_closed_sessions_are_deleted(state):
+    other = SharedState(state.path)
+    state.register_sessions(["open", "closed"])
+    await other.post_message("open", b"1")
+    await other.post_message("closed", b"2")
+
+    state.register_sessions(["open"])
+
+    assert state.db.execute("SELECT COUNT(*) FROM sse_messages").fetchone()[0] == 1
+    assert state.take_messages() == [("open", b"1")]
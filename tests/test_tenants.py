@@ -0,0 +1,77 @@
+import pytest
+
+from server.utils.search import CardIndex
+from server.utils.tenants import (
+    ClientPool,
+    Tenant,
+    TenantConfig,
+    current_tenant,
+    tenant_id,
+    with_tenant,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def closed() -> list:
+    """The tokens of the tenants whose clients were closed, in order."""
+    return []
+
+
+@pytest.fixture
+def make_pool(make_client, closed):
+    """Returns a factory of pools whose tenants record when their client is closed."""
+
+    def build_tenant(api_key: str, token: str) -> Tenant:
+        client = make_client()
+        close = client.close
+
+        async def recording_close():
+            closed.append(token)
+            await close()
+
+        client.close = recording_close
+        return Tenant(tenant_id(api_key, token), client, CardIndex())
+
+    def make(**kwargs) -> ClientPool:
+        return ClientPool(build_tenant, TenantConfig(enabled=True, **kwargs))
+
+    return make
+
+
+async def test_least_recently_used_tenant_is_evicted(make_pool, closed):
+    pool = make_pool(max_clients=2)
+    for token in ("a", "b", "a", "c"):
+        async with pool.use("key", token):
+            pass
+
+    assert list(pool.tenants) == [tenant_id("key", "a"), tenant_id("key", "c")]
+    assert closed == ["b"]
+    assert pool.stats()["evictions"] == 1
+
+
+async def test_evicted_tenant_is_closed_after_its_calls_finish(make_pool, closed):
+    pool = make_pool(max_clients=1)
+
+    async with pool.use("key", "a") as first:
+        async with pool.use("key", "b"):
+            assert first.evicted
+            assert closed == []
+        assert closed == []
+
+    assert closed == ["a"]
+
+
+async def test_calls_without_credentials_are_rejected(make_pool, make_client):
+    default = Tenant("default", make_client(), CardIndex())
+
+    async def tool():
+        return current_tenant()
+
+    pool = make_pool()
+    with pytest.raises(ValueError, match="credentials are required"):
+        await with_tenant(tool, lambda: (pool, default))()
+
+    pool = make_pool(allow_default=True)
+    assert await with_tenant(tool, lambda: (pool, default))() is default
@@ -0,0 +1,62 @@
+import pytest
+
+from server.tools import card
+from server.utils import tracing
+from server.utils.search import CardIndex
+from server.utils.tenants import Tenant, with_tenant
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def tracer():
+    """Records the spans of a test in memory."""
+    tracer = tracing.MemoryTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+def test_backend_is_read_on_first_use(monkeypatch):
+    # As when load_dotenv() sets it after the module was imported.
+    monkeypatch.setenv("TRELLO_TRACING", "memory")
+    tracing.set_tracer(None)
+    try:
+        assert isinstance(tracing.get_tracer(), tracing.MemoryTracer)
+    finally:
+        tracing.set_tracer(None)
+
+
+async def test_tool_call_spans_service_and_request(fake, make_client, tracer):
+    card_id = next(iter(fake.cards))
+    tenant = Tenant("test", make_client(), CardIndex())
+    get_card = tracing.trace_tool(with_tenant(card.get_card, lambda: (None, tenant)))
+
+    await get_card(None, card_id)
+
+    (root,) = [span for span in tracer.spans if span.parent_id is None]
+    assert root.name == "tool get_card"
+    (service,) = tracer.children(root)
+    assert service.name == "CardService.get_card"
+    (request,) = tracer.children(service)
+    assert request.name == "GET /cards/{id}"
+    assert request.attributes["http.response.status_code"] == 200
+    assert {span.trace_id for span in tracer.spans} == {root.trace_id}
+
+
+async def test_failed_request_marks_spans(fake, make_client, tracer):
+    tenant = Tenant("test", make_client(), CardIndex())
+    get_card = tracing.trace_tool(with_tenant(card.get_card, lambda: (None, tenant)))
+
+    class Context:
+        async def error(self, message):
+            pass
+
+    with pytest.raises(Exception):
+        await get_card(Context(), "missing")
+
+    assert {span.name: span.error for span in tracer.spans} == {
+        "tool get_card": "HTTPStatusError",
+        "CardService.get_card": "HTTPStatusError",
+        "GET /cards/{id}": "HTTPStatusError",
+    }
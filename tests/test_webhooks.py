@@ -0,0 +1,160 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+
+from server.mirror.store import MirrorConfig, MirrorStore
+from server.mirror.sync import MirrorSync
+from server.mirror.webhooks import WebhookReceiver
+
+pytestmark = pytest.mark.anyio
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+CALLBACK_URL = "https://example.com/webhooks/trello"
+SECRET = "webhook-secret"
+
+
+def recorded(name: str, **ids: str) -> dict:
+    """Loads a recorded webhook delivery, filling in the IDs of the fake board."""
+    text = (FIXTURES / f"{name}.json").read_text()
+    for placeholder, value in ids.items():
+        text = text.replace(f"__{placeholder.upper()}__", value)
+    return json.loads(text)
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    digest = hmac.new(
+        secret.encode(), body + CALLBACK_URL.encode(), hashlib.sha1
+    ).digest()
+    return base64.b64encode(digest).decode()
+
+
+@pytest.fixture
+async def sync(fake, make_client) -> MirrorSync:
+    board_id = next(iter(fake.boards))
+    config = MirrorConfig(
+        boards=[board_id], callback_url=CALLBACK_URL, api_secret=SECRET
+    )
+    sync = MirrorSync(make_client(), MirrorStore(), config)
+    await sync.sync_board(board_id)
+    return sync
+
+
+@pytest.fixture
+def deliver(sync):
+    """Returns a function POSTing a delivery to the receiver, signed unless told otherwise."""
+    app = Starlette(routes=WebhookReceiver(sync).routes())
+
+    async def post(payload: dict, signature: str | None = None) -> httpx.Response:
+        body = json.dumps(payload).encode()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="https://example.com"
+        ) as http:
+            return await http.post(
+                "/webhooks/trello",
+                content=body,
+                headers={"X-Trello-Webhook": signature or sign(body)},
+            )
+
+    return post
+
+
+def ids_of(fake) -> dict:
+    board_id = next(iter(fake.boards))
+    card = next(iter(fake.cards.values()))
+    return {"board_id": board_id, "card_id": card["id"], "list_id": card["idList"]}
+
+
+async def test_update_card_renames_mirrored_card(fake, sync, deliver):
+    ids = ids_of(fake)
+
+    response = await deliver(recorded("update_card", **ids))
+
+    assert response.status_code == 200
+    assert sync.store.card(ids["card_id"]).name == "Fix login redirect loop"
+
+
+async def test_create_card_fetches_new_card(fake, sync, deliver):
+    ids = ids_of(fake)
+    card = fake.add_card(ids["list_id"], name="Add audit log export")
+
+    response = await deliver(recorded("create_card", **{**ids, "card_id": card["id"]}))
+
+    assert response.status_code == 200
+    assert sync.store.card(card["id"]).name == "Add audit log export"
+    assert fake.requests["GET /cards/{id}"] == 1
+
+
+async def test_check_item_state_is_applied(fake, sync, deliver):
+    card = next(iter(fake.cards.values()))
+    checklist = fake.add_checklist(card["id"], name="Steps")
+    item = fake.add_checkitem(checklist["id"], name="Reproduce on staging")
+    await sync.sync_board(card["idBoard"])
+    item["state"] = "complete"
+
+    response = await deliver(
+        recorded(
+            "update_check_item_state",
+            **ids_of(fake),
+            checklist_id=checklist["id"],
+            checkitem_id=item["id"],
+        )
+    )
+
+    assert response.status_code == 200
+    (mirrored,) = sync.store.checklist(checklist["id"]).checkItems
+    assert mirrored.state == "complete"
+
+
+async def test_delete_card_removes_mirrored_card(fake, sync, deliver):
+    ids = ids_of(fake)
+
+    response = await deliver(recorded("delete_card", **ids))
+
+    assert response.status_code == 200
+    assert ids["card_id"] not in sync.store.cards
+
+
+async def test_invalid_signature_is_rejected(fake, sync, deliver):
+    ids = ids_of(fake)
+    name = sync.store.card(ids["card_id"]).name
+
+    response = await deliver(recorded("update_card", **ids), signature="forged")
+
+    assert response.status_code == 401
+    assert sync.store.card(ids["card_id"]).name == name
+
+
+async def test_malformed_action_is_skipped(fake, sync, deliver):
+    payload = recorded("create_card", **ids_of(fake))
+    del payload["action"]["data"]["card"]["id"]
+
+    response = await deliver(payload)
+
+    assert response.status_code == 200
+    assert sync.malformed == 1
+
+
+async def test_delivery_waits_for_running_full_sync(fake, sync, deliver):
+    ids = ids_of(fake)
+
+    async with sync.lock:
+        delivery = asyncio.create_task(deliver(recorded("update_card", **ids)))
+        await asyncio.sleep(0.05)
+        assert sync.store.card(ids["card_id"]).name != "Fix login redirect loop"
+    assert (await delivery).status_code == 200
+    assert sync.store.card(ids["card_id"]).name == "Fix login redirect loop"
+
+
+def test_receiver_requires_api_secret(fake, make_client):
+    config = MirrorConfig(boards=["b1"], callback_url=CALLBACK_URL)
+    sync = MirrorSync(make_client(), MirrorStore(), config)
+
+    with pytest.raises(ValueError):
+        WebhookReceiver(sync)